@@ -0,0 +1,72 @@
+"""Benchmark filter rentang tanggal: mask boolean vs. irisan pencarian biner.
+
+Data sintetis terurut menurut tanggal (bulanan, beberapa tahun); rentang yang
+diuji tiga bulan di tengah data::
+
+    python benchmarks/bench_dateslice.py
+    python benchmarks/bench_dateslice.py --sizes 100000 1000000 10000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from transjakarta.timeindex import date_slice  # noqa: E402
+
+
+def make_frame(n: int, years: int = 5, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    months = np.sort(rng.integers(0, years * 12, n))
+    dates = pd.to_datetime({"year": 2019 + months // 12, "month": months % 12 + 1, "day": 1})
+    return pd.DataFrame(
+        {
+            "date": dates.astype("datetime64[us]"),
+            "jumlah_penumpang": rng.integers(0, 50_000, n).astype(np.int32),
+        }
+    )
+
+
+def filter_mask(df: pd.DataFrame, start, end) -> pd.DataFrame:
+    """Cara lama di ``main()``."""
+    return df[(df["date"] >= start) & (df["date"] <= end)]
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    header = f"{'baris':>12} {'hasil':>10} {'mask (ms)':>11} {'irisan (ms)':>12} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for n in args.sizes:
+        df = make_frame(n)
+        start, end = pd.Timestamp("2021-03-01"), pd.Timestamp("2021-05-01")
+        assert filter_mask(df, start, end).equals(date_slice(df, start, end))
+        t_mask = best_of(lambda: filter_mask(df, start, end), args.repeat)
+        t_slice = best_of(lambda: date_slice(df, start, end), args.repeat)
+        print(
+            f"{n:>12,} {len(date_slice(df, start, end)):>10,} {t_mask * 1e3:>11.2f} "
+            f"{t_slice * 1e3:>12.3f} {t_mask / t_slice:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
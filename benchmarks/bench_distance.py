@@ -0,0 +1,110 @@
+"""Micro-benchmark: ``df.apply(haversine_km)`` skalar vs. ``transjakarta.geo``.
+
+Jalankan dari root repo::
+
+    python benchmarks/bench_distance.py
+    python benchmarks/bench_distance.py --sizes 1000 100000 --scalar-max 100000
+
+Jalur skalar sangat lambat pada 10 juta baris, sehingga hanya diukur sampai
+``--scalar-max`` baris; untuk ukuran di atasnya waktunya diekstrapolasi linear
+(ditandai ``*``).
+"""
+
+import argparse
+import os
+import sys
+import time
+from math import asin, cos, radians, sin, sqrt
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transjakarta.geo import equirectangular_km, frame_distance_km, haversine_km, vincenty_km  # noqa: E402
+
+
+def haversine_km_scalar(lat1, lon1, lat2, lon2):
+    """Salinan implementasi lama di ``dashboard.py`` (acuan)."""
+    R = 6371
+    if any(pd.isna(v) for v in [lat1, lon1, lat2, lon2]):
+        return np.nan
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    dlon, dlat = lon2 - lon1, lat2 - lat1
+    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    return R * 2 * asin(sqrt(a))
+
+
+def make_frame(n: int, seed: int = 42, nan_frac: float = 0.01) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "latitude_awal": rng.uniform(-6.4, -6.0, n),
+            "longitude_awal": rng.uniform(106.6, 107.0, n),
+            "latitude_tujuan": rng.uniform(-6.4, -6.0, n),
+            "longitude_tujuan": rng.uniform(106.6, 107.0, n),
+        }
+    )
+    nan_rows = rng.random(n) < nan_frac
+    df.loc[nan_rows, "latitude_awal"] = np.nan
+    return df
+
+
+def run_scalar(df: pd.DataFrame) -> pd.Series:
+    return df.apply(
+        lambda r: haversine_km_scalar(
+            r.get("latitude_awal"),
+            r.get("longitude_awal"),
+            r.get("latitude_tujuan"),
+            r.get("longitude_tujuan"),
+        ),
+        axis=1,
+    )
+
+
+def timeit(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 10_000_000])
+    parser.add_argument("--scalar-max", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    header = f"{'baris':>12} {'skalar (s)':>12} {'haversine':>11} {'equirect':>11} {'vincenty':>11} {'speedup':>9}"
+    print(header)
+    print("-" * len(header))
+
+    for n in args.sizes:
+        df = make_frame(n)
+        lat1, lon1, lat2, lon2 = (df[c].to_numpy() for c in df.columns)
+
+        n_scalar = min(n, args.scalar_max)
+        sub = df.iloc[:n_scalar]
+        t_scalar = timeit(lambda: run_scalar(sub), repeat=1) * (n / n_scalar)
+        mark = "*" if n_scalar < n else " "
+
+        expected = run_scalar(sub).to_numpy()
+        got = frame_distance_km(sub)
+        np.testing.assert_allclose(got, expected, rtol=1e-9, equal_nan=True)
+
+        t_hav = timeit(lambda: haversine_km(lat1, lon1, lat2, lon2))
+        t_eq = timeit(lambda: equirectangular_km(lat1, lon1, lat2, lon2))
+        t_vin = timeit(lambda: vincenty_km(lat1, lon1, lat2, lon2), repeat=1)
+
+        print(
+            f"{n:>12,} {t_scalar:>11.3f}{mark} {t_hav:>11.4f} {t_eq:>11.4f} {t_vin:>11.4f} "
+            f"{t_scalar / t_hav:>8.0f}x"
+        )
+
+    print("\n* waktu skalar diekstrapolasi dari --scalar-max baris")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Benchmark jalur panas dashboard pada data sintetis berskema ``df_final.csv``
+(``transjakarta.synth``).
+
+Tiap tahap diukur terpisah (waktu terbaik dari ``--repeat`` putaran, lalu satu
+putaran tambahan di bawah ``tracemalloc`` untuk memori puncak): muat CSV, muat
+cache Parquet, bangun kubus/bin heatmap/ringkasan, filter, agregasi rute &
+halte, korelasi, figur Plotly, dan peta folium. Hasil bisa disimpan sebagai
+JSON lalu dibandingkan antar commit::
+
+    python benchmarks/bench_hotpaths.py --json bench-main.json
+    python benchmarks/bench_hotpaths.py --sizes 10000 1000000 --json bench-fitur.json --compare bench-main.json
+
+Parsing CSV hanya diukur sampai ``--csv-max`` baris; di atasnya data bersih
+dibangun langsung dari frame sintetis.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from transjakarta import analytics  # noqa: E402
+from transjakarta.cube import AggregateCube  # noqa: E402
+from transjakarta.heatgrid import HeatBins  # noqa: E402
+from transjakarta.ingest import clean_chunk, load_csv  # noqa: E402
+from transjakarta.schema import apply_schema  # noqa: E402
+from transjakarta.summary import DatasetSummary  # noqa: E402
+from transjakarta.synth import SyntheticModel  # noqa: E402
+from transjakarta.timeindex import sort_by_date  # noqa: E402
+
+REFERENCE_CSV = os.path.join(ROOT, "df_final.csv")
+
+
+def make_raw_frame(n: int, seed: int = 42) -> pd.DataFrame:
+    """Frame mentah berskema ``df_final.csv`` (3 tahun) dari ``SyntheticModel``
+    yang dilatih pada CSV tersebut."""
+    model = SyntheticModel.from_frame(load_csv(REFERENCE_CSV))
+    return model.frame(n, years=3, seed=seed)
+
+
+def clean_frame(raw: pd.DataFrame) -> pd.DataFrame:
+    """Setara ``load_csv`` tanpa parsing CSV."""
+    return apply_schema(sort_by_date(clean_chunk(raw.copy())))
+
+
+def measure(fn, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"best_s": min(times), "mean_s": sum(times) / len(times), "repeat": repeat, "peak_mb": peak / 2**20}
+
+
+def stages(n: int, args, workdir: str):
+    """``(nama, fungsi)`` per tahap; data turunan disiapkan sekali di luar pengukuran."""
+    import streamlit.logger
+
+    streamlit.logger.set_log_level("error")  # peringatan mode bare (tanpa `streamlit run`)
+    import dashboard
+
+    raw = make_raw_frame(n, seed=args.seed)
+    csv_path = os.path.join(workdir, f"synthetic-{n}.csv")
+    if n <= args.csv_max:
+        raw.to_csv(csv_path, index=False)
+        yield "load_csv", lambda: load_csv(csv_path)
+    df = clean_frame(raw)
+    del raw
+    parquet_path = os.path.join(workdir, f"synthetic-{n}.parquet")
+    df.to_parquet(parquet_path, index=False)
+    yield "load_parquet", lambda: pd.read_parquet(parquet_path)
+
+    yield "build_cube", lambda: AggregateCube.from_frame(df)
+    yield "build_heat", lambda: HeatBins.from_frame(df)
+    cube, heat = AggregateCube.from_frame(df), HeatBins.from_frame(df)
+    yield "summary", lambda: DatasetSummary.from_frame(df, cube)
+
+    routes = cube.by_trayek()["trayek"].head(5).tolist()
+    start, end = df["date"].iloc[len(df) // 3], df["date"].iloc[2 * len(df) // 3]
+    yield "filter", lambda: analytics.filter_data(df, cube, heat, start, end, routes)
+    rows, cube_q, heat_q, kpis = analytics.filter_data(df, cube, heat, start, end, None)
+
+    yield "aggregate", lambda: (analytics.top_routes(cube_q), analytics.top_halte(cube_q),
+                                analytics.rolling_trend(kpis["monthly"]))
+    yield "stats", lambda: analytics.distance_correlation(rows, n_resamples=args.resamples)
+
+    yield "fig_distribusi", lambda: dashboard.build_distribusi_penumpang(rows, False)
+    yield "fig_tren", lambda: dashboard.build_tren_penumpang(kpis["monthly"], False)
+    yield "fig_top_rute", lambda: dashboard.build_top_routes_dan_halte(cube_q, False)
+    # fkey None: cache statistik dashboard dilewati agar tiap putaran menghitung ulang
+    # (termasuk bootstrap, yang dibatasi TJ_BOOTSTRAP_BUDGET_S)
+    yield "fig_korelasi", lambda: dashboard.build_korelasi_jarak_penumpang(rows, False)
+    yield "map_build", lambda: dashboard.build_peta_interaktif(rows, heat_q, False)
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(results: list, baseline_path: str):
+    with open(baseline_path, encoding="utf-8") as fh:
+        base = {(r["rows"], r["stage"]): r for r in json.load(fh)["results"]}
+    print(f"\nvs. {baseline_path}")
+    header = f"{'baris':>12} {'tahap':<16} {'dasar (ms)':>11} {'kini (ms)':>10} {'rasio':>7}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        old = base.get((r["rows"], r["stage"]))
+        if old is None:
+            continue
+        ratio = r["best_s"] / old["best_s"] if old["best_s"] else float("nan")
+        print(f"{r['rows']:>12,} {r['stage']:<16} {old['best_s'] * 1e3:>11.1f} {r['best_s'] * 1e3:>10.1f} {ratio:>6.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stages", nargs="+", help="hanya tahap ini (default: semua)")
+    parser.add_argument("--csv-max", type=int, default=1_000_000, help="batas baris untuk tahap load_csv")
+    parser.add_argument("--resamples", type=int, default=0, help="resampel bootstrap/permutasi di tahap stats")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="simpan hasil sebagai JSON di path ini")
+    parser.add_argument("--compare", help="JSON hasil sebelumnya sebagai pembanding")
+    args = parser.parse_args(argv)
+
+    results = []
+    header = f"{'baris':>12} {'tahap':<16} {'terbaik (ms)':>13} {'rata2 (ms)':>11} {'puncak (MB)':>12}"
+    print(header)
+    print("-" * len(header))
+    with tempfile.TemporaryDirectory(prefix="tj-bench-") as workdir:
+        for n in args.sizes:
+            for stage, fn in stages(n, args, workdir):
+                if args.stages and stage not in args.stages:
+                    continue
+                r = {"rows": n, "stage": stage, **measure(fn, args.repeat)}
+                results.append(r)
+                print(
+                    f"{n:>12,} {stage:<16} {r['best_s'] * 1e3:>13.1f} {r['mean_s'] * 1e3:>11.1f} "
+                    f"{r['peak_mb']:>12.1f}"
+                )
+
+    if args.json:
+        meta = {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        }
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"meta": meta, "results": results}, fh, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
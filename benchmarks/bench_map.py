@@ -0,0 +1,110 @@
+"""Benchmark layer peta: ``iterrows`` + objek per titik vs. layer batch.
+
+Mengukur waktu bangun + render HTML dan ukuran HTML yang dikirim ke browser::
+
+    python benchmarks/bench_map.py
+    python benchmarks/bench_map.py --samples 300 1200 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import folium
+import numpy as np
+import pandas as pd
+from folium.plugins import MarkerCluster
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from transjakarta.maplayers import circle_cluster_layer, segment_layer, tooltip_series  # noqa: E402
+
+
+def make_geo_frame(n: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "trayek": [f"Trayek {i}" for i in rng.integers(0, 150, n)],
+            "halte_awal": [f"Halte {i}" for i in rng.integers(0, 400, n)],
+            "halte_tujuan": [f"Halte {i}" for i in rng.integers(0, 400, n)],
+            "latitude_awal": rng.uniform(-6.4, -6.0, n),
+            "longitude_awal": rng.uniform(106.6, 107.0, n),
+            "latitude_tujuan": rng.uniform(-6.4, -6.0, n),
+            "longitude_tujuan": rng.uniform(106.6, 107.0, n),
+        }
+    )
+
+
+def build_legacy(geo_smpl: pd.DataFrame) -> folium.Map:
+    """Salinan cara lama di ``plot_peta_interaktif``."""
+    m = folium.Map(location=[-6.2, 106.8], zoom_start=11, tiles=None)
+    mc_awal = MarkerCluster(name="Halte Awal (Sampel)").add_to(m)
+    mc_tuju = MarkerCluster(name="Halte Tujuan (Sampel)").add_to(m)
+    for _, r in geo_smpl.iterrows():
+        folium.CircleMarker(
+            [r["latitude_awal"], r["longitude_awal"]],
+            radius=3, color="#f97316", fill=True, fill_opacity=0.85,
+            tooltip=f"Awal: {r.get('halte_awal','-')} | Trayek: {r.get('trayek','-')}",
+        ).add_to(mc_awal)
+        folium.CircleMarker(
+            [r["latitude_tujuan"], r["longitude_tujuan"]],
+            radius=3, color="#22c55e", fill=True, fill_opacity=0.85,
+            tooltip=f"Tujuan: {r.get('halte_tujuan','-')} | Trayek: {r.get('trayek','-')}",
+        ).add_to(mc_tuju)
+    for _, r in geo_smpl.head(min(400, len(geo_smpl))).iterrows():
+        folium.PolyLine(
+            [(r["latitude_awal"], r["longitude_awal"]), (r["latitude_tujuan"], r["longitude_tujuan"])],
+            weight=0.7, opacity=0.25, color="#64748b",
+        ).add_to(m)
+    return m
+
+
+def build_batched(geo_smpl: pd.DataFrame) -> folium.Map:
+    m = folium.Map(location=[-6.2, 106.8], zoom_start=11, tiles=None)
+    circle_cluster_layer(
+        geo_smpl["latitude_awal"], geo_smpl["longitude_awal"],
+        tooltip_series("Awal", geo_smpl["halte_awal"], geo_smpl["trayek"]),
+        name="Halte Awal (Sampel)", color="#f97316",
+    ).add_to(m)
+    circle_cluster_layer(
+        geo_smpl["latitude_tujuan"], geo_smpl["longitude_tujuan"],
+        tooltip_series("Tujuan", geo_smpl["halte_tujuan"], geo_smpl["trayek"]),
+        name="Halte Tujuan (Sampel)", color="#22c55e",
+    ).add_to(m)
+    seg = geo_smpl.head(min(400, len(geo_smpl)))
+    segment_layer(
+        seg["latitude_awal"], seg["longitude_awal"], seg["latitude_tujuan"], seg["longitude_tujuan"],
+        weight=0.7, opacity=0.25, color="#64748b",
+    ).add_to(m)
+    return m
+
+
+def measure(build, df: pd.DataFrame):
+    t0 = time.perf_counter()
+    m = build(df)
+    html = m.get_root().render()
+    return time.perf_counter() - t0, len(html.encode("utf-8"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, nargs="+", default=[300, 1200, 5000])
+    args = parser.parse_args(argv)
+
+    header = f"{'sampel':>8} {'lama (s)':>10} {'batch (s)':>10} {'lama (KB)':>11} {'batch (KB)':>11} {'waktu':>7} {'ukuran':>7}"
+    print(header)
+    print("-" * len(header))
+    for n in args.samples:
+        df = make_geo_frame(n)
+        t_old, b_old = measure(build_legacy, df)
+        t_new, b_new = measure(build_batched, df)
+        print(
+            f"{n:>8,} {t_old:>10.3f} {t_new:>10.3f} {b_old / 1024:>11.0f} {b_new / 1024:>11.0f} "
+            f"{t_old / t_new:>6.1f}x {b_old / b_new:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
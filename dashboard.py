@@ -1,13 +1,65 @@
+import logging
+import os
+import time
+from datetime import datetime
+
+# awal eksekusi skrip; dasar pengukuran mode profil startup
+_T_MULAI = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from scipy.stats import pearsonr, spearmanr
-import folium
-from folium.plugins import MarkerCluster, HeatMap, MiniMap, Fullscreen
-from math import radians, sin, cos, asin, sqrt
-from streamlit_folium import folium_static
+
+# plotly & folium (impor terberat) dimuat di dalam fungsi pembangun grafik/peta,
+# sehingga sesi yang tidak membuka tab terkait tidak menanggung biayanya
+
+from transjakarta import analytics
+from transjakarta.cube import AggregateCube
+from transjakarta.export import EXPORT_FORMATS, cached_export, export_payload
+from transjakarta.heatgrid import HeatBins
+from transjakarta.ingest import default_store_dir
+from transjakarta.memo import LRUCache, filter_key, object_nbytes, payload_nbytes
+from transjakarta.profiling import (
+    RerunTrace,
+    StageTimer,
+    activate,
+    active_trace,
+    append_jsonl,
+    loaded_modules,
+    trace_stage,
+    traced,
+)
+from transjakarta.refresh import refresh_store
+from transjakarta.registry import Registry
+from transjakarta.stats import correlation_summary, resampling_summary
+from transjakarta.summary import DatasetSummary
+
+logger = logging.getLogger("dashboard")
+
+# sumber data: satu CSV, direktori berisi CSV, atau pola glob (mis. "data/*.csv")
+DATA_SOURCE = os.environ.get("TJ_DATA_SOURCE", "df_final.csv")
+
+# ukuran sel grid heatmap (derajat)
+HEAT_CELL_DEG = 0.01
+
+# ketidakpastian korelasi: jumlah resampel bootstrap/permutasi & batas waktu (detik)
+KORELASI_RESAMPLES = int(os.environ.get("TJ_BOOTSTRAP_RESAMPLES", "2000"))
+KORELASI_TIME_BUDGET_S = float(os.environ.get("TJ_BOOTSTRAP_BUDGET_S", "1.5"))
+# di bawah jumlah resampel ini (anggaran waktu habis) IK & p-value tidak ditampilkan
+KORELASI_MIN_RESAMPLES = 200
+
+# TJ_PROFILE_STARTUP=1: tampilkan durasi tiap tahap hingga KPI pertama dirender
+PROFILE_STARTUP = os.environ.get("TJ_PROFILE_STARTUP") == "1"
+
+# anggaran titik per grafik (pencilan box plot, titik scatter) yang dikirim ke
+# browser; scatter yang lebih padat diringkas menjadi kepadatan 2D
+MAX_POINTS = int(os.environ.get("TJ_MAX_POINTS", str(analytics.MAX_POINTS)))
+
+# TJ_INSTRUMENT: instrumentasi per rerun (tahap, hit cache, ukuran payload) —
+# "log" = satu record JSON per rerun ke log, "panel" = log + panel debug di
+# sidebar; TJ_INSTRUMENT_LOG = berkas JSONL tambahan untuk agregasi
+INSTRUMENT = os.environ.get("TJ_INSTRUMENT", "").lower()
+INSTRUMENT_LOG = os.environ.get("TJ_INSTRUMENT_LOG")
 
 # ------------------------------------------------------
 # PAGE CONFIG
@@ -513,61 +565,135 @@ h1, h2, h3, h4, h5, h6 { color: #111827; font-weight: 600; }
 # ======================================================
 # DATA UTILS
 # ======================================================
-@st.cache_data(show_spinner=False)
-def load_data(file_path: str) -> pd.DataFrame:
+@st.cache_data(ttl=60, show_spinner=False)
+def sync_source(file_path: str) -> dict | None:
+    """Cek perubahan sumber data (paling sering sekali per menit).
+
+    Mengembalikan ``{"version", "refreshed_at", "store_dir"}``; ``version``
+    berubah hanya bila isi data berubah sehingga cache di bawahnya tetap
+    terpakai selama data sama.
+    """
     try:
-        df = pd.read_csv(file_path)
+        if os.path.isfile(file_path):
+            stat = os.stat(file_path)
+            return {
+                "version": f"{stat.st_size}-{stat.st_mtime_ns}",
+                "refreshed_at": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds"),
+                "store_dir": None,
+            }
+        # direktori / glob banyak berkas: hanya partisi yang berubah diproses ulang
+        store_dir = default_store_dir(file_path)
+        manifest = refresh_store(file_path, store_dir, cell_deg=HEAT_CELL_DEG)
+        return {
+            "version": manifest["version"],
+            "refreshed_at": manifest["refreshed_at"],
+            "store_dir": store_dir,
+        }
     except FileNotFoundError:
         st.error(f"File data '{file_path}' tidak ditemukan. Pastikan file ada di folder yang sama.")
+        return None
+    except ValueError as exc:
+        st.error(str(exc))
+        return None
+
+
+# ``version`` hanya bagian dari kunci cache: versi baru memicu muat ulang,
+# versi lama tersingkir karena max_entries
+@st.cache_data(max_entries=2, show_spinner=False)
+def load_data(file_path: str, version: str) -> pd.DataFrame:
+    try:
+        # CSV: cache Parquet di disk (lintas proses), kunci = hash berkas + versi skema
+        return analytics.load_frame(file_path)
+    except FileNotFoundError:
+        st.error(f"File data '{file_path}' tidak ditemukan. Pastikan file ada di folder yang sama.")
+        return pd.DataFrame()
+    except ValueError as exc:
+        st.error(str(exc))
         return pd.DataFrame()
 
-    df["jumlah_penumpang"] = pd.to_numeric(df["jumlah_penumpang"], errors="coerce").fillna(0).astype(int)
-
-    if "date" not in df.columns:
-        if {"year", "month"}.issubset(df.columns):
-            df["date"] = pd.to_datetime(
-                dict(
-                    year=pd.to_numeric(df["year"], errors="coerce").fillna(0).astype(int),
-                    month=pd.to_numeric(df["month"], errors="coerce").fillna(1).astype(int),
-                    day=1,
-                ),
-                errors="coerce",
-            )
 
-    cols_geo = ["latitude_awal", "longitude_awal", "latitude_tujuan", "longitude_tujuan"]
-    for c in cols_geo:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-
-    if "distance_km" not in df.columns and set(cols_geo).issubset(df.columns):
-        df["distance_km"] = df.apply(
-            lambda r: haversine_km(
-                r.get("latitude_awal"),
-                r.get("longitude_awal"),
-                r.get("latitude_tujuan"),
-                r.get("longitude_tujuan"),
-            ),
-            axis=1,
-        )
+@st.cache_resource(max_entries=2, show_spinner=False)
+def load_registry(file_path: str, version: str) -> Registry:
+    # kamus trayek/halte -> ID integer; juga sumber opsi multiselect trayek
+    return Registry.from_frame(load_data(file_path, version))
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def load_cube(file_path: str, version: str) -> AggregateCube:
+    # kubus agregat dibangun sekali per dataset; filter cukup roll-up di atasnya.
+    # store: gabungan kubus per partisi yang dipelihara refresh_store,
+    # dikodekan ulang dengan kamus registri agar filter memakai ID integer
+    return analytics.load_cube(file_path, load_data(file_path, version), load_registry(file_path, version))
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def load_heat_bins(file_path: str, version: str) -> HeatBins:
+    # bin heatmap per bulan × trayek; filter tanggal/trayek cukup penjumlahan
+    return analytics.load_heat_bins(
+        file_path, load_data(file_path, version), load_registry(file_path, version), HEAT_CELL_DEG
+    )
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def load_summary(file_path: str, version: str) -> DatasetSummary:
+    # baseline global (tanpa filter) dihitung sekali per versi data
+    return DatasetSummary.from_frame(load_data(file_path, version), load_cube(file_path, version))
+
+
+@st.cache_resource(show_spinner=False)
+def filter_cache() -> LRUCache:
+    # tiap entri memuat salinan baris terfilter: batasi juga total byte
+    return LRUCache(maxsize=32, maxbytes=256 * 1024 * 1024, sizeof=object_nbytes)
+
+
+def apply_filter(df: pd.DataFrame, cube: AggregateCube, heat: HeatBins, start_date, end_date, selected_trayek):
+    # (baris, kubus, bin heatmap, KPI); irisan tanggal lewat pencarian biner dan
+    # seluruh KPI sidebar/grid/tren dalam satu agregasi, ikut dimemo per filter
+    return analytics.filter_data(df, cube, heat, start_date, end_date, selected_trayek)
+
+
+def lazy_tabs(labels, key: str):
+    try:
+        return st.tabs(labels, key=key, on_change="rerun")
+    except TypeError:
+        # Streamlit lama belum mendukung eksekusi tab lazy: render semua
+        return st.tabs(labels)
+
+
+def tab_aktif(tab) -> bool:
+    # ``open`` bernilai None bila status tab tidak dilacak -> anggap aktif
+    return getattr(tab, "open", None) is not False
 
-    if "date" in df.columns:
-        df = df.dropna(subset=["date"])
-        df["date"] = pd.to_datetime(df["date"])
-    else:
-        st.error("Kolom 'date' / ('year','month') tidak ditemukan di dataset.")
-        return pd.DataFrame()
 
-    return df
+@st.cache_resource(show_spinner=False)
+def export_cache() -> LRUCache:
+    return LRUCache(maxsize=32, maxbytes=128 * 1024 * 1024)
 
 
-def haversine_km(lat1, lon1, lat2, lon2):
-    R = 6371
-    if any(pd.isna(v) for v in [lat1, lon1, lat2, lon2]):
-        return np.nan
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-    dlon, dlat = lon2 - lon1, lat2 - lat1
-    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-    return R * 2 * asin(sqrt(a))
+FORMAT_LABEL = {"csv": "CSV", "csv.gz": "CSV gzip", "parquet": "Parquet"}
+
+
+def download_button(target, label: str, data, file_stem: str, key: str, fkey=None):
+    """Tombol unduh lazy: data baru diserialisasi saat tombol diklik, lalu
+    dicache per (tombol, filter, format). ``data`` boleh berupa fungsi yang
+    mengembalikan DataFrame, agar frame besar tidak perlu disimpan di cache figur."""
+    fmt = st.session_state.get("format_unduh", "csv")
+    ext, mime = EXPORT_FORMATS[fmt]
+    cache = export_cache()
+
+    def payload():
+        frame = data() if callable(data) else data
+        if fkey is None:
+            return export_payload(frame, fmt)
+        return cached_export(cache, (key, fkey, fmt), frame, fmt)
+
+    target.download_button(
+        f"{label} ({FORMAT_LABEL[fmt]})",
+        payload,
+        file_name=f"{file_stem}{ext}",
+        mime=mime,
+        key=key,
+    )
 
 
 def fmt_id(n):
@@ -582,40 +708,87 @@ def fmt_id(n):
 # ======================================================
 # VISUAL FUNCTIONS
 # ======================================================
-def plot_distribusi_penumpang(df: pd.DataFrame, dark: bool, key_suffix: str = ""):
-    if df.empty:
-        st.warning("Data kosong setelah filter. Atur ulang filter di sidebar.")
+# Setiap grafik dipisah menjadi build_* (olah data + bangun figure, tanpa st.*)
+# dan plot_* (render). Hasil build_* dicache per (grafik, filter, tema).
+@st.cache_resource(show_spinner=False)
+def figure_cache() -> LRUCache:
+    # figur menyimpan array trace (≤ MAX_POINTS titik / grid kepadatan): batasi total byte
+    return LRUCache(maxsize=64, maxbytes=64 * 1024 * 1024, sizeof=object_nbytes)
+
+
+def cached_figure(name: str, fkey, dark: bool, build):
+    def timed_build():
+        with trace_stage(f"build:{name}"):
+            return build()
+
+    if fkey is None:
+        return timed_build()
+    return figure_cache().get_or_compute((name, fkey, dark), timed_build)
+
+
+def catat_payload(name: str, fig=None, html: str | None = None):
+    """Ukuran payload ke browser (JSON figur / HTML peta) pada trace aktif.
+    JSON figur diserialisasi ulang, jadi hanya dihitung bila instrumentasi aktif."""
+    trace = active_trace()
+    if trace is None:
         return
+    trace.payload(name, payload_nbytes(fig.to_json() if fig is not None else html))
+
+
+def build_distribusi_penumpang(df: pd.DataFrame, dark: bool) -> dict:
+    import plotly.graph_objects as go
 
-    desc = df["jumlah_penumpang"].describe()
-    median_val = desc["50%"]
-    q3_val = desc["75%"]
+    # kuartil, whisker & pencilan dihitung di server: figur hanya memuat
+    # ringkasan + pencilan (paling banyak MAX_POINTS), bukan seluruh baris
+    box = analytics.box_summary(df["jumlah_penumpang"], max_points=MAX_POINTS)
+    median_val = box["median"]
+    q3_val = box["q3"]
 
     template = "plotly_dark" if dark else "plotly_white"
     bg_color = "rgba(15,23,42,1)" if dark else "white"
 
     # === BOX PLOT ===
-    fig = px.box(
-        df,
-        x="jumlah_penumpang",
-        template=template,
-        title="Distribusi Jumlah Penumpang per Trayek (Boxplot)",
-        color_discrete_sequence=["#f97316"],
-        points="suspectedoutliers"
+    fig = go.Figure(
+        go.Box(
+            orientation="h",
+            y=[0],
+            q1=[box["q1"]],
+            median=[median_val],
+            q3=[q3_val],
+            lowerfence=[box["lowerfence"]],
+            upperfence=[box["upperfence"]],
+            mean=[box["mean"]],
+            marker_color="#f97316",
+            name="",
+            showlegend=False,
+        )
+    )
+    fig.add_trace(
+        go.Scattergl(
+            x=box["outliers"],
+            y=np.zeros(len(box["outliers"])),
+            mode="markers",
+            marker=dict(color="#f97316", opacity=0.7, size=6),
+            hovertemplate="Penumpang: %{x:,}<extra></extra>",
+            showlegend=False,
+        )
     )
 
     fig.update_layout(
+        template=template,
+        title="Distribusi Jumlah Penumpang per Trayek (Boxplot)",
         xaxis_title="Jumlah Penumpang",
-        yaxis_title="",
+        yaxis=dict(title="", showticklabels=False),
         margin=dict(t=40, b=25, l=30, r=20),
         plot_bgcolor=bg_color,
         paper_bgcolor="rgba(0,0,0,0)"
     )
-
-    fig.update_traces(
-        hovertemplate="Penumpang: %{x:,}<extra></extra>",
-        marker=dict(opacity=0.7)
-    )
+    if box["n_outliers"] > len(box["outliers"]):
+        fig.add_annotation(
+            xref="paper", yref="paper", x=1, y=1.02, xanchor="right", yanchor="bottom", showarrow=False,
+            text=f"{fmt_id(len(box['outliers']))} dari {fmt_id(box['n_outliers'])} pencilan ditampilkan",
+            font=dict(size=11),
+        )
 
     # === GARIS MEDIAN & Q3 (MANUAL) ===
     # Median
@@ -638,39 +811,50 @@ def plot_distribusi_penumpang(df: pd.DataFrame, dark: bool, key_suffix: str = ""
         line_color="#f97316"
     )
 
-    st.plotly_chart(fig, use_container_width=True)
-
-    # Unduh CSV
-    csv = df[["jumlah_penumpang"]].to_csv(index=False).encode("utf-8")
-    st.download_button(
-        "⬇ Unduh data grafik ini (CSV)",
-        csv,
-        file_name=f"distribusi_penumpang{key_suffix}.csv",
-        mime="text/csv",
-        key=f"dl_distribusi{key_suffix}",
-    )
-
     # === INSIGHT ===
     try:
-        st.markdown(
+        insight = (
             f"**Insight:** Median jumlah penumpang berada di sekitar **{fmt_id(int(median_val))}**. "
             f"Sedangkan nilai Q3 menunjukkan bahwa 25% trayek teratas memiliki lebih dari **{fmt_id(int(q3_val))}** penumpang. "
             f"Hal ini menandakan sebagian rute memiliki permintaan jauh lebih tinggi dibanding mayoritas."
         )
     except:
-        st.markdown("**Insight:** Ringkasan distribusi tidak dapat dihitung untuk periode ini.")
+        insight = "**Insight:** Ringkasan distribusi tidak dapat dihitung untuk periode ini."
 
+    return {"fig": fig, "insight": insight}
 
-def plot_tren_penumpang(df: pd.DataFrame, dark: bool, key_suffix: str = ""):
+
+@traced
+def plot_distribusi_penumpang(df: pd.DataFrame, dark: bool, key_suffix: str = "", fkey=None):
     if df.empty:
         st.warning("Data kosong setelah filter. Atur ulang filter di sidebar.")
         return
 
+    spec = cached_figure("distribusi", fkey, dark, lambda: build_distribusi_penumpang(df, dark))
+    st.plotly_chart(spec["fig"], use_container_width=True)
+    catat_payload("distribusi", spec["fig"])
+
+    # Unduh data (payload dibuat saat diklik)
+    download_button(
+        st,
+        "⬇ Unduh data grafik ini",
+        lambda: df[["jumlah_penumpang"]],
+        file_stem=f"distribusi_penumpang{key_suffix}",
+        key=f"dl_distribusi{key_suffix}",
+        fkey=fkey,
+    )
+
+    st.markdown(spec["insight"])
+
+
+def build_tren_penumpang(monthly: pd.DataFrame, dark: bool) -> dict:
+    import plotly.graph_objects as go
+
     template = "plotly_dark" if dark else "plotly_white"
     bg_color = "rgba(15,23,42,1)" if dark else "white"
 
-    monthly = df.groupby("date", as_index=False)["jumlah_penumpang"].sum().sort_values("date")
-    monthly["rolling_3m"] = monthly["jumlah_penumpang"].rolling(3, min_periods=1).mean()
+    # ``monthly`` dari mesin KPI (dipakai bersama grid KPI); rolling_trend membuat salinan
+    monthly = analytics.rolling_trend(monthly)
 
     fig = go.Figure()
     fig.add_trace(
@@ -717,197 +901,241 @@ def plot_tren_penumpang(df: pd.DataFrame, dark: bool, key_suffix: str = ""):
         paper_bgcolor="rgba(0,0,0,0)",
     )
 
-    st.plotly_chart(fig, use_container_width=True)
-
-    csv = monthly[["date", "jumlah_penumpang", "rolling_3m"]].to_csv(index=False).encode("utf-8")
-    st.download_button(
-        "⬇ Unduh data grafik ini (CSV)",
-        csv,
-        file_name=f"tren_penumpang_bulanan{key_suffix}.csv",
-        mime="text/csv",
-        key=f"dl_tren{key_suffix}",
-    )
-
     # === INSIGHT SIMPLE ===
     try:
-        if len(monthly) >= 2:
-            growth = (monthly["jumlah_penumpang"].iloc[-1] - monthly["jumlah_penumpang"].iloc[0]) / max(1, monthly["jumlah_penumpang"].iloc[0]) * 100
+        growth = analytics.trend_growth(monthly)
+        if growth is not None:
             trend_text = f"Naik {growth:.1f}%" if growth > 0 else f"Turun {abs(growth):.1f}%"
         else:
             trend_text = "Data tidak cukup untuk menghitung perubahan."
     except Exception:
         trend_text = "Pola tren tidak dapat dihitung."
 
-    st.markdown(
+    insight = (
         f"**Insight:** Jumlah penumpang pada periode terpilih menunjukkan tren **{trend_text}** dari awal hingga akhir periode."
     )
+    return {"fig": fig, "data": monthly[["date", "jumlah_penumpang", "rolling_3m"]], "insight": insight}
 
 
-def plot_top_routes_dan_halte(df: pd.DataFrame, dark: bool, key_suffix: str = ""):
-    if df.empty:
+@traced
+def plot_tren_penumpang(monthly: pd.DataFrame, dark: bool, key_suffix: str = "", fkey=None):
+    if monthly.empty:
         st.warning("Data kosong setelah filter. Atur ulang filter di sidebar.")
         return
 
+    spec = cached_figure("tren", fkey, dark, lambda: build_tren_penumpang(monthly, dark))
+    st.plotly_chart(spec["fig"], use_container_width=True)
+    catat_payload("tren", spec["fig"])
+
+    download_button(
+        st,
+        "⬇ Unduh data grafik ini",
+        spec["data"],
+        file_stem=f"tren_penumpang_bulanan{key_suffix}",
+        key=f"dl_tren{key_suffix}",
+        fkey=fkey,
+    )
+
+    st.markdown(spec["insight"])
+
+
+def build_top_routes_dan_halte(cube: AggregateCube, dark: bool) -> dict:
+    import plotly.express as px
+
     template = "plotly_dark" if dark else "plotly_white"
     bg_color = "rgba(15,23,42,1)" if dark else "white"
 
-    total_all = df["jumlah_penumpang"].sum()
-
-    top_routes = (
-        df.groupby("trayek", as_index=False)["jumlah_penumpang"]
-        .sum()
-        .sort_values("jumlah_penumpang", ascending=False)
-        .head(10)
-    )
-    top_routes["share"] = top_routes["jumlah_penumpang"] / total_all * 100
+    top_routes = analytics.top_routes(cube)
     top_routes["label"] = top_routes["jumlah_penumpang"].apply(fmt_id) + top_routes["share"].map(
         lambda x: f" ({x:.1f}%)"
     )
+    combined_vc = analytics.top_halte(cube)
 
-    vc_awal = df["halte_awal"].value_counts().head(10).reset_index()
-    vc_awal.columns = ["Halte", "Frekuensi"]
-    vc_awal["Tipe"] = "Awal"
-
-    vc_tuju = df["halte_tujuan"].value_counts().head(10).reset_index()
-    vc_tuju.columns = ["Halte", "Frekuensi"]
-    vc_tuju["Tipe"] = "Tujuan"
+    fig = px.bar(
+        top_routes,
+        x="jumlah_penumpang",
+        y="trayek",
+        orientation="h",
+        text="label",
+        template=template,
+        color="jumlah_penumpang",
+        color_continuous_scale=px.colors.sequential.OrRd,
+    )
+    fig.update_layout(
+        yaxis={"categoryorder": "total ascending", "title": ""},
+        xaxis_title="Total Penumpang",
+        height=420,
+        coloraxis_colorbar=dict(title="Penumpang"),
+        margin=dict(t=20, b=25, l=30, r=20),
+        plot_bgcolor=bg_color,
+        paper_bgcolor="rgba(0,0,0,0)",
+    )
+    fig.update_traces(
+        textposition="outside",
+        cliponaxis=False,
+        hovertemplate="Rute: %{y}<br>Penumpang: %{x:,}<br>Pangsa: %{customdata:.1f}%<extra></extra>",
+        customdata=np.round(top_routes["share"], 1),
+    )
 
-    combined_vc = (
-        pd.concat([vc_awal, vc_tuju])
-        .sort_values("Frekuensi", ascending=False)
-        .drop_duplicates(subset="Halte")
-        .head(10)
+    fig_halte = px.bar(
+        combined_vc,
+        x="Frekuensi",
+        y="Halte",
+        color="Tipe",
+        orientation="h",
+        template=template,
+        color_discrete_map={"Awal": "#f97316", "Tujuan": "#22c55e"},
+        text=combined_vc["Frekuensi"].apply(fmt_id),
     )
+    fig_halte.update_layout(
+        yaxis={"categoryorder": "total ascending", "title": ""},
+        xaxis_title="Frekuensi Penggunaan",
+        height=420,
+        legend_title_text="Tipe Halte",
+        margin=dict(t=20, b=25, l=30, r=20),
+        plot_bgcolor=bg_color,
+        paper_bgcolor="rgba(0,0,0,0)",
+    )
+    fig_halte.update_traces(textposition="outside")
+
+    # === INSIGHT SIMPLE ===
+    try:
+        top_route_name = top_routes.iloc[0]['trayek']
+        top_route_share = top_routes.iloc[0]['share']
+        top_halte_name = combined_vc.iloc[0]['Halte']
+        insight = (
+            f"**Insight:** Rute dengan permintaan tertinggi adalah **{top_route_name}** "
+            f"yang menyumbang sekitar **{top_route_share:.1f}%** dari total penumpang. "
+            f"Halte tersibuk dalam periode ini adalah **{top_halte_name}**."
+        )
+    except Exception:
+        insight = "**Insight:** Tidak cukup data untuk menentukan top rute/halte."
+
+    return {
+        "fig": fig,
+        "fig_halte": fig_halte,
+        "data": top_routes[["trayek", "jumlah_penumpang", "share"]],
+        "data_halte": combined_vc,
+        "insight": insight,
+    }
+
+
+@traced
+def plot_top_routes_dan_halte(cube: AggregateCube, dark: bool, key_suffix: str = "", fkey=None):
+    if cube.empty:
+        st.warning("Data kosong setelah filter. Atur ulang filter di sidebar.")
+        return
+
+    spec = cached_figure("top_rute_halte", fkey, dark, lambda: build_top_routes_dan_halte(cube, dark))
 
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown("#### Rute Terpadat (Top 10)")
-        fig = px.bar(
-            top_routes,
-            x="jumlah_penumpang",
-            y="trayek",
-            orientation="h",
-            text="label",
-            template=template,
-            color="jumlah_penumpang",
-            color_continuous_scale=px.colors.sequential.OrRd,
-        )
-        fig.update_layout(
-            yaxis={"categoryorder": "total ascending", "title": ""},
-            xaxis_title="Total Penumpang",
-            height=420,
-            coloraxis_colorbar=dict(title="Penumpang"),
-            margin=dict(t=20, b=25, l=30, r=20),
-            plot_bgcolor=bg_color,
-            paper_bgcolor="rgba(0,0,0,0)",
-        )
-        fig.update_traces(
-            textposition="outside",
-            cliponaxis=False,
-            hovertemplate="Rute: %{y}<br>Penumpang: %{x:,}<br>Pangsa: %{customdata:.1f}%<extra></extra>",
-            customdata=np.round(top_routes["share"], 1),
-        )
-        st.plotly_chart(fig, use_container_width=True)
-
-        csv_routes = top_routes[["trayek", "jumlah_penumpang", "share"]].to_csv(index=False).encode("utf-8")
-        st.download_button(
-            "⬇ Unduh data Top 10 rute (CSV)",
-            csv_routes,
-            file_name=f"top10_rute{key_suffix}.csv",
-            mime="text/csv",
+        st.plotly_chart(spec["fig"], use_container_width=True)
+        catat_payload("top_rute", spec["fig"])
+
+        download_button(
+            st,
+            "⬇ Unduh data Top 10 rute",
+            spec["data"],
+            file_stem=f"top10_rute{key_suffix}",
             key=f"dl_toprute{key_suffix}",
+            fkey=fkey,
         )
 
     with col2:
         st.markdown("#### Halte Awal/Tujuan Terpopuler")
-        fig_halte = px.bar(
-            combined_vc,
-            x="Frekuensi",
-            y="Halte",
-            color="Tipe",
-            orientation="h",
-            template=template,
-            color_discrete_map={"Awal": "#f97316", "Tujuan": "#22c55e"},
-            text=combined_vc["Frekuensi"].apply(fmt_id),
-        )
-        fig_halte.update_layout(
-            yaxis={"categoryorder": "total ascending", "title": ""},
-            xaxis_title="Frekuensi Penggunaan",
-            height=420,
-            legend_title_text="Tipe Halte",
-            margin=dict(t=20, b=25, l=30, r=20),
-            plot_bgcolor=bg_color,
-            paper_bgcolor="rgba(0,0,0,0)",
-        )
-        fig_halte.update_traces(textposition="outside")
-        st.plotly_chart(fig_halte, use_container_width=True)
-
-        csv_halte = combined_vc.to_csv(index=False).encode("utf-8")
-        st.download_button(
-            "⬇ Unduh data halte terpopuler (CSV)",
-            csv_halte,
-            file_name=f"halte_populer{key_suffix}.csv",
-            mime="text/csv",
+        st.plotly_chart(spec["fig_halte"], use_container_width=True)
+        catat_payload("top_halte", spec["fig_halte"])
+
+        download_button(
+            st,
+            "⬇ Unduh data halte terpopuler",
+            spec["data_halte"],
+            file_stem=f"halte_populer{key_suffix}",
             key=f"dl_haltes{key_suffix}",
+            fkey=fkey,
         )
 
     st.markdown("")
 
-    # === INSIGHT SIMPLE ===
-    try:
-        top_route_name = top_routes.iloc[0]['trayek']
-        top_route_share = top_routes.iloc[0]['share']
-        top_halte_name = combined_vc.iloc[0]['Halte']
-        st.markdown(
-            f"**Insight:** Rute dengan permintaan tertinggi adalah **{top_route_name}** "
-            f"yang menyumbang sekitar **{top_route_share:.1f}%** dari total penumpang. "
-            f"Halte tersibuk dalam periode ini adalah **{top_halte_name}**."
-        )
-    except Exception:
-        st.markdown("**Insight:** Tidak cukup data untuk menentukan top rute/halte.")
-def plot_korelasi_jarak_penumpang(df: pd.DataFrame, dark: bool, key_suffix: str = ""):
-    if df.empty or "distance_km" not in df.columns:
-        st.warning("Data jarak tidak tersedia atau kosong.")
-        return
+    st.markdown(spec["insight"])
+
+
+@st.cache_resource(show_spinner=False)
+def stats_cache() -> LRUCache:
+    # entri berupa dict ringkasan statistik (kecil), tetap dibatasi total byte
+    return LRUCache(maxsize=64, maxbytes=16 * 1024 * 1024, sizeof=object_nbytes)
+
+
+def build_korelasi_jarak_penumpang(df: pd.DataFrame, dark: bool, fkey=None):
+    """None bila data valid kurang dari dua baris."""
+    import plotly.graph_objects as go
 
     template = "plotly_dark" if dark else "plotly_white"
     bg_color = "rgba(15,23,42,1)" if dark else "white"
 
-    cols = ["distance_km", "jumlah_penumpang"]
-    clean = df[cols].apply(pd.to_numeric, errors="coerce").replace([np.inf, -np.inf], np.nan).dropna()
+    clean = analytics.correlation_frame(df)
     N = len(clean)
     if N < 2:
-        st.warning("Tidak cukup data valid untuk menghitung korelasi.")
-        return
+        return None
+
+    # r, ρ, slope/intercept & R² rumus tertutup; dimemo per filter (lintas tema)
+    def hitung():
+        return correlation_summary(clean["distance_km"], clean["jumlah_penumpang"])
+
+    def hitung_ketidakpastian():
+        return resampling_summary(
+            clean["distance_km"],
+            clean["jumlah_penumpang"],
+            n_resamples=KORELASI_RESAMPLES,
+            time_budget_s=KORELASI_TIME_BUDGET_S,
+        )
 
-    r, _ = pearsonr(clean["distance_km"], clean["jumlah_penumpang"])
-    rho, _ = spearmanr(clean["distance_km"], clean["jumlah_penumpang"], nan_policy="omit")
-    r2 = r**2
+    stats = hitung() if fkey is None else stats_cache().get_or_compute(("korelasi", fkey), hitung)
+    r, rho, r2 = stats["r"], stats["rho"], stats["r2"]
 
     # === SCATTER PLOT SAJA (tanpa marginal histogram) ===
-    fig = px.scatter(
-        clean,
-        x="distance_km",
-        y="jumlah_penumpang",
-        trendline="ols",
-        opacity=0.75,
-        template=template,
-        title="Korelasi Jarak Rute vs. Jumlah Penumpang",
-        labels={"distance_km": "Jarak Rute (km)", "jumlah_penumpang": "Jumlah Penumpang"},
-    )
-
-    # warna marker
-    fig.data[0].marker.color = "#e5e7eb" if dark else "#111827"
-
-    # warna trendline
-    for trace in fig.data:
-        if isinstance(trace, go.Scatter) and "lines" in trace.mode:
-            trace.line.color = "#f97316"
-            trace.line.width = 3
-            break
+    # titik WebGL selama ≤ MAX_POINTS; di atasnya kepadatan 2D hasil binning
+    # di server sehingga ukuran figur tidak tumbuh bersama data
+    pts = analytics.scatter_payload(clean["distance_km"], clean["jumlah_penumpang"], max_points=MAX_POINTS)
+    fig = go.Figure()
+    if pts["mode"] == "points":
+        fig.add_trace(
+            go.Scattergl(
+                x=pts["x"],
+                y=pts["y"],
+                mode="markers",
+                marker=dict(color="#e5e7eb" if dark else "#111827", opacity=0.75),
+                hovertemplate="Jarak: %{x:.2f} km<br>Penumpang: %{y:,}<extra></extra>",
+                showlegend=False,
+            )
+        )
+    else:
+        fig.add_trace(
+            go.Heatmap(
+                x=pts["x"],
+                y=pts["y"],
+                z=pts["z"],
+                colorscale="OrRd",
+                colorbar=dict(title="Baris"),
+                hovertemplate="Jarak: %{x:.2f} km<br>Penumpang: %{y:,.0f}<br>Baris: %{z:,}<extra></extra>",
+            )
+        )
 
-    fig.update_traces(hovertemplate="Jarak: %{x:.2f} km<br>Penumpang: %{y:,}<extra></extra>")
+    # garis tren kuadrat terkecil (cukup dua titik ujung)
+    x_line = np.array([clean["distance_km"].min(), clean["distance_km"].max()], dtype=np.float64)
+    fig.add_trace(
+        go.Scatter(
+            x=x_line,
+            y=stats["slope"] * x_line + stats["intercept"],
+            mode="lines",
+            line=dict(color="#f97316", width=3),
+            hovertemplate="Jarak: %{x:.2f} km<br>Penumpang: %{y:,}<extra></extra>",
+            showlegend=False,
+        )
+    )
 
     # anotasi statistik
     fig.add_annotation(
@@ -927,61 +1155,134 @@ def plot_korelasi_jarak_penumpang(df: pd.DataFrame, dark: bool, key_suffix: str
     )
 
     fig.update_layout(
+        template=template,
+        title="Korelasi Jarak Rute vs. Jumlah Penumpang",
+        xaxis_title="Jarak Rute (km)",
+        yaxis_title="Jumlah Penumpang",
         margin=dict(t=40, b=25, l=30, r=20),
         plot_bgcolor=bg_color,
         paper_bgcolor="rgba(0,0,0,0)",
     )
 
-    st.plotly_chart(fig, use_container_width=True)
-
-    csv = clean.to_csv(index=False).encode("utf-8")
-    st.download_button(
-        "⬇ Unduh data grafik ini (CSV)",
-        csv,
-        file_name=f"korelasi_jarak_penumpang{key_suffix}.csv",
-        mime="text/csv",
-        key=f"dl_korelasi{key_suffix}",
-    )
-
     # === INSIGHT DINAMIS ===
-    if abs(r) < 0.2:
-        interpret = "hubungan sangat lemah"
-    elif abs(r) < 0.4:
-        interpret = "hubungan lemah"
+    if pd.isna(r):
+        # jarak atau penumpang konstan (mis. satu trayek): korelasi tidak terdefinisi
+        return {
+            "fig": fig,
+            "insight": "**Insight:** Korelasi tidak dapat dihitung karena jarak rute atau jumlah penumpang "
+            "pada data terfilter bernilai konstan.",
+        }
+    # bootstrap & permutasi hanya bila r terdefinisi; dimemo terpisah karena mahal
+    if fkey is None:
+        uji = hitung_ketidakpastian()
+    else:
+        uji = stats_cache().get_or_compute(("korelasi_resampel", fkey, KORELASI_RESAMPLES), hitung_ketidakpastian)
+    interpret = analytics.correlation_strength(r)
+
+    ci_r = uji["r"]
+    n_resampel = min(uji["n_bootstrap"], uji["n_permutation"])
+    arah = "lebih banyak" if r > 0 else "lebih sedikit"
+    if abs(r) < 0.4:
+        kekuatan = (
+            f"jarak hanya menjelaskan sekitar {r2:.0%} variasi penumpang, sehingga bukan faktor dominan."
+        )
     elif abs(r) < 0.6:
-        interpret = "hubungan sedang"
+        kekuatan = (
+            f"rute yang lebih jauh cenderung memiliki penumpang {arah}, "
+            f"meski jarak baru menjelaskan sekitar {r2:.0%} variasinya."
+        )
     else:
-        interpret = "hubungan kuat"
+        kekuatan = (
+            f"jarak merupakan faktor penting, rute yang lebih jauh cenderung memiliki penumpang {arah} "
+            f"(sekitar {r2:.0%} variasi dijelaskan jarak)."
+        )
 
-    st.markdown(
+    if n_resampel < KORELASI_MIN_RESAMPLES:
+        # terlalu sedikit resampel (anggaran waktu habis): IK & p-value tidak bermakna
+        uji_text = f"Pearson r = {r:.2f}"
+        kesimpulan = (
+            f"Interval kepercayaan dan uji permutasi tidak ditampilkan karena batas waktu hanya cukup untuk "
+            f"{fmt_id(n_resampel)} resampel. Secara deskriptif, {kekuatan}"
+        )
+    else:
+        ci_pct = int(round(uji["ci"] * 100))
+        p_min = 1 / (uji["n_permutation"] + 1)
+        p_text = f"p < {p_min:.3g}" if ci_r["p_value"] <= p_min else f"p = {ci_r['p_value']:.3f}"
+        uji_text = (
+            f"Pearson r = {r:.2f}; IK {ci_pct}% bootstrap {ci_r['ci_low']:.2f} s.d. {ci_r['ci_high']:.2f}; "
+            f"{p_text}, uji permutasi"
+        )
+        if uji["truncated"]:
+            uji_text += (
+                f"; berdasarkan {fmt_id(uji['n_bootstrap'])} resampel bootstrap dan "
+                f"{fmt_id(uji['n_permutation'])} permutasi karena batas waktu"
+            )
+        if uji.get("n_sample", uji["n"]) < uji["n"]:
+            uji_text += f"; dari sampel acak {fmt_id(uji['n_sample'])} baris"
+        if ci_r["ci_low"] <= 0 <= ci_r["ci_high"]:
+            kesimpulan = (
+                "Interval kepercayaannya mencakup nol, jadi hubungan ini belum dapat dipastikan ada; "
+                "pada data ini jarak tidak terbukti memengaruhi banyaknya penumpang."
+            )
+        elif abs(r) < 0.4:
+            kesimpulan = f"Interval kepercayaannya tidak mencakup nol, jadi hubungannya nyata tetapi lemah: {kekuatan}"
+        else:
+            kesimpulan = f"Interval kepercayaannya tidak mencakup nol: {kekuatan}"
+
+    insight = (
         f"**Insight:** Korelasi antara jarak rute dan jumlah penumpang tergolong **{interpret}** "
-        f"(Pearson r = {r:.2f}). Ini menunjukkan jarak bukan faktor dominan terhadap banyaknya penumpang."
+        f"({uji_text}). {kesimpulan}"
     )
+    return {"fig": fig, "insight": insight}
 
 
-def plot_peta_interaktif(df: pd.DataFrame, dark: bool):
-    """Peta hotspot halte. Tile mengikuti tema: gelap / terang."""
-    if df.empty:
-        st.warning("Data kosong setelah filter. Atur ulang filter di sidebar.")
+@traced
+def plot_korelasi_jarak_penumpang(df: pd.DataFrame, dark: bool, key_suffix: str = "", fkey=None):
+    if df.empty or "distance_km" not in df.columns:
+        st.warning("Data jarak tidak tersedia atau kosong.")
         return
 
-    LAT_MIN, LAT_MAX = -7.8, -5.5
-    LON_MIN, LON_MAX = 106.3, 107.3
+    spec = cached_figure("korelasi", fkey, dark, lambda: build_korelasi_jarak_penumpang(df, dark, fkey))
+    if spec is None:
+        st.warning("Tidak cukup data valid untuk menghitung korelasi.")
+        return
 
-    mask_awal = df["latitude_awal"].between(LAT_MIN, LAT_MAX) & df["longitude_awal"].between(LON_MIN, LON_MAX)
-    mask_tuju = df["latitude_tujuan"].between(LAT_MIN, LAT_MAX) & df["longitude_tujuan"].between(LON_MIN, LON_MAX)
+    st.plotly_chart(spec["fig"], use_container_width=True)
+    catat_payload("korelasi", spec["fig"])
 
-    geo_ok = df[mask_awal & mask_tuju].dropna(
-        subset=["latitude_awal", "longitude_awal", "latitude_tujuan", "longitude_tujuan"]
+    download_button(
+        st,
+        "⬇ Unduh data grafik ini",
+        lambda: analytics.correlation_frame(df),
+        file_stem=f"korelasi_jarak_penumpang{key_suffix}",
+        key=f"dl_korelasi{key_suffix}",
+        fkey=fkey,
     )
 
-    if geo_ok.empty:
-        st.warning("Data koordinat tidak tersedia atau di luar area Jabodetabek yang valid.")
-        return
+    st.markdown(spec["insight"])
 
-    # filter jarak
-    if "distance_km" in geo_ok.columns:
-        geo_ok = geo_ok[geo_ok["distance_km"] <= 60]
+
+@st.cache_resource(show_spinner=False)
+def map_cache() -> LRUCache:
+    # HTML peta bisa ratusan KB per entri: batasi jumlah entri dan total byte
+    return LRUCache(
+        maxsize=16,
+        maxbytes=64 * 1024 * 1024,
+        sizeof=lambda spec: payload_nbytes(spec["html"]) if spec else 0,
+    )
+
+
+def build_peta_interaktif(df: pd.DataFrame, heat: HeatBins, dark: bool):
+    """HTML peta + insight; None bila tidak ada koordinat valid di Jabodetabek."""
+    import folium
+    from folium.plugins import Fullscreen, HeatMap, MiniMap
+
+    from transjakarta.maplayers import circle_cluster_layer, segment_layer, tooltip_series
+
+    # koordinat valid di Jabodetabek, jarak rute ≤ 60 km
+    geo_ok = analytics.map_points(df)
+    if geo_ok.empty:
+        return None
 
     # center map
     center_lat = np.median(pd.concat([geo_ok["latitude_awal"], geo_ok["latitude_tujuan"]]))
@@ -1004,31 +1305,25 @@ def plot_peta_interaktif(df: pd.DataFrame, dark: bool):
     n_sample = min(1200, len(geo_ok))
     geo_smpl = geo_ok.sample(n_sample, random_state=42)
 
-    mc_awal = MarkerCluster(name="Halte Awal (Sampel)").add_to(m)
-    mc_tuju = MarkerCluster(name="Halte Tujuan (Sampel)").add_to(m)
-
-    for _, r in geo_smpl.iterrows():
-        folium.CircleMarker(
-            [r["latitude_awal"], r["longitude_awal"]],
-            radius=3,
-            color="#f97316",
-            fill=True,
-            fill_opacity=0.85,
-            tooltip=f"Awal: {r.get('halte_awal','-')} | Trayek: {r.get('trayek','-')}",
-        ).add_to(mc_awal)
-
-        folium.CircleMarker(
-            [r["latitude_tujuan"], r["longitude_tujuan"]],
-            radius=3,
-            color="#22c55e",
-            fill=True,
-            fill_opacity=0.85,
-            tooltip=f"Tujuan: {r.get('halte_tujuan','-')} | Trayek: {r.get('trayek','-')}",
-        ).add_to(mc_tuju)
-
-    # heatmap halte awal
+    # marker sampel: satu layer batch per jenis halte (bukan satu objek per baris)
+    circle_cluster_layer(
+        geo_smpl["latitude_awal"],
+        geo_smpl["longitude_awal"],
+        tooltip_series("Awal", geo_smpl["halte_awal"], geo_smpl["trayek"]),
+        name="Halte Awal (Sampel)",
+        color="#f97316",
+    ).add_to(m)
+    circle_cluster_layer(
+        geo_smpl["latitude_tujuan"],
+        geo_smpl["longitude_tujuan"],
+        tooltip_series("Tujuan", geo_smpl["halte_tujuan"], geo_smpl["trayek"]),
+        name="Halte Tujuan (Sampel)",
+        color="#22c55e",
+    ).add_to(m)
+
+    # heatmap halte awal (centroid sel grid, bobot = penumpang)
     HeatMap(
-        geo_ok[["latitude_awal", "longitude_awal"]].values.tolist(),
+        heat.heat_points("awal"),
         name="Kepadatan Halte Awal",
         radius=16,
         blur=22,
@@ -1037,82 +1332,171 @@ def plot_peta_interaktif(df: pd.DataFrame, dark: bool):
 
     # heatmap halte tujuan
     HeatMap(
-        geo_ok[["latitude_tujuan", "longitude_tujuan"]].values.tolist(),
+        heat.heat_points("tujuan"),
         name="Kepadatan Halte Tujuan",
         radius=16,
         blur=22,
         min_opacity=0.35,
     ).add_to(m)
 
-    # garis lintasan sampel
-    for _, r in geo_smpl.head(min(400, len(geo_smpl))).iterrows():
-        folium.PolyLine(
-            [(r["latitude_awal"], r["longitude_awal"]), (r["latitude_tujuan"], r["longitude_tujuan"])],
-            weight=0.7,
-            opacity=0.25,
-            color="#64748b",
-        ).add_to(m)
+    # garis lintasan sampel (satu multi-polyline)
+    seg = geo_smpl.head(min(400, len(geo_smpl)))
+    segment_layer(
+        seg["latitude_awal"],
+        seg["longitude_awal"],
+        seg["latitude_tujuan"],
+        seg["longitude_tujuan"],
+        weight=0.7,
+        opacity=0.25,
+        color="#64748b",
+    ).add_to(m)
 
     folium.LayerControl(collapsed=False).add_to(m)
 
-    st.info("Peta menunjukkan konsentrasi Halte Awal (oranye) dan Halte Tujuan (hijau) serta contoh lintasan rute.")
-    folium_static(m, width=1000, height=540)
+    # render sekali ke HTML (setara folium_static) agar bisa dicache
+    html = folium.Figure().add_child(m).render()
 
     # === INSIGHT DINAMIS ===
-    # jumlah titik
-    n_awal = geo_ok[["halte_awal", "latitude_awal", "longitude_awal"]].dropna().drop_duplicates().shape[0]
-    n_tuju = geo_ok[["halte_tujuan", "latitude_tujuan", "longitude_tujuan"]].dropna().drop_duplicates().shape[0]
-
-
-    # cari daerah paling padat (kelompokkan per 0.01 derajat)
-    geo_ok["grid_lat"] = (geo_ok["latitude_awal"] * 100).astype(int)
-    geo_ok["grid_lon"] = (geo_ok["longitude_awal"] * 100).astype(int)
-    hotspot = (
-        geo_ok.groupby(["grid_lat", "grid_lon"])
-        .size()
-        .reset_index(name="count")
-        .sort_values("count", ascending=False)
-    )
-
-    top_density = int(hotspot.iloc[0]["count"]) if len(hotspot) else 0
-
-    # kategori kepadatan
-    if top_density > 800:
-        dens_text = "sangat tinggi"
-    elif top_density > 400:
-        dens_text = "tinggi"
-    elif top_density > 150:
-        dens_text = "moderat"
-    else:
-        dens_text = "rendah"
+    # jumlah titik halte unik & kategori kepadatan sel grid terpadat
+    info = analytics.map_summary(geo_ok, heat)
 
     # generate insight akhir
     insight_text = (
-        f"**Insight Dinamis:** Terdapat {fmt_id(n_awal)} titik halte awal dan "
-        f"{fmt_id(n_tuju)} titik halte tujuan pada periode ini. "
-        f"Kepadatan hotspot berada pada kategori **{dens_text}**, "
+        f"**Insight Dinamis:** Terdapat {fmt_id(info['n_halte_awal'])} titik halte awal dan "
+        f"{fmt_id(info['n_halte_tujuan'])} titik halte tujuan pada periode ini. "
+        f"Kepadatan hotspot berada pada kategori **{info['density_level']}**, "
         f"menandakan adanya konsentrasi aktivitas perjalanan pada beberapa simpul utama. "
         f"Area dengan cluster terbesar mencerminkan lokasi yang paling sering "
         f"menjadi titik keberangkatan maupun tujuan, sehingga berpotensi menjadi prioritas "
         f"peningkatan layanan atau integrasi moda."
     )
 
-    st.markdown(insight_text)
+    return {"html": html, "insight": insight_text}
+
+
+@traced
+def plot_peta_interaktif(df: pd.DataFrame, heat: HeatBins, dark: bool, fkey=None):
+    """Peta hotspot halte. Tile mengikuti tema: gelap / terang."""
+    if df.empty:
+        st.warning("Data kosong setelah filter. Atur ulang filter di sidebar.")
+        return
+
+    def build():
+        with trace_stage("build:peta"):
+            return build_peta_interaktif(df, heat, dark)
+
+    spec = build() if fkey is None else map_cache().get_or_compute((fkey, dark), build)
+    if spec is None:
+        st.warning("Data koordinat tidak tersedia atau di luar area Jabodetabek yang valid.")
+        return
+
+    st.info("Peta menunjukkan konsentrasi Halte Awal (oranye) dan Halte Tujuan (hijau) serta contoh lintasan rute.")
+    if hasattr(st, "iframe"):
+        st.iframe(spec["html"], width=1000, height=540 + 10)
+    else:
+        # Streamlit lama belum punya st.iframe
+        import streamlit.components.v1 as components
+
+        components.html(spec["html"], width=1000, height=540 + 10)
+    catat_payload("peta", html=spec["html"])
+
+    st.markdown(spec["insight"])
 
 
 
 # ======================================================
 # MAIN APP
 # ======================================================
+def tampilkan_profil_startup(timer: StageTimer):
+    """Panel sidebar + log: durasi tiap tahap dan modul berat yang sudah termuat."""
+    profil = timer.as_dict()
+    profil["modul_termuat"] = loaded_modules()
+    logger.info("profil startup: %s", profil)
+    with st.sidebar.expander("Profil startup", expanded=True):
+        st.dataframe(
+            pd.DataFrame(timer.stages, columns=["tahap", "detik"]).round(3),
+            hide_index=True,
+            width="stretch",
+        )
+        st.caption(f"Waktu hingga KPI pertama: {timer.total:.2f} s")
+        st.caption(
+            "Modul termuat: " + ", ".join(m for m, ok in profil["modul_termuat"].items() if ok)
+        )
+
+
+def cache_stats() -> dict:
+    return {
+        "filter": filter_cache().stats(),
+        "grafik": figure_cache().stats(),
+        "statistik": stats_cache().stats(),
+        "peta": map_cache().stats(),
+        "unduhan": export_cache().stats(),
+    }
+
+
+def laporkan_instrumentasi(trace: RerunTrace, cache_awal: dict):
+    """Record JSON rerun ke log (dan ``TJ_INSTRUMENT_LOG``), plus panel debug
+    bila ``TJ_INSTRUMENT=panel``."""
+    # cache dipakai bersama antarsesi: selisihnya bisa ikut memuat rerun sesi lain
+    trace.cache_delta(cache_awal, cache_stats())
+    record = trace.to_json()
+    logger.info("rerun %s", record)
+    if INSTRUMENT_LOG:
+        try:
+            append_jsonl(INSTRUMENT_LOG, record)
+        except OSError as exc:
+            logger.warning("Gagal menulis log instrumentasi %s: %s", INSTRUMENT_LOG, exc)
+    if INSTRUMENT != "panel":
+        return
+
+    with st.sidebar.expander("Instrumentasi rerun", expanded=False):
+        st.caption(f"Rerun {trace.rerun_id} · total {trace.total:.2f} s")
+        tahap = pd.DataFrame(trace.stages, columns=["tahap", "ms"])
+        tahap["ms"] = (tahap["ms"] * 1e3).round(1)
+        st.dataframe(tahap, hide_index=True, width="stretch")
+        st.caption("`build:*` (hanya saat cache miss) termasuk dalam `plot_*` yang memanggilnya.")
+        st.dataframe(
+            pd.DataFrame.from_dict(trace.caches, orient="index").rename_axis("cache"),
+            width="stretch",
+        )
+        if trace.payloads:
+            payload = pd.DataFrame(trace.payloads, columns=["payload", "KB"])
+            payload["KB"] = (payload["KB"] / 1024).round(1)
+            st.dataframe(payload, hide_index=True, width="stretch")
+        st.download_button(
+            "⬇ Unduh record JSON",
+            record,
+            file_name=f"rerun-{trace.rerun_id}.json",
+            mime="application/json",
+            key="dl_instrumentasi",
+        )
+
+
 def main():
-    df = load_data("df_final.csv")
+    timer = RerunTrace(_T_MULAI)
+    activate(timer if INSTRUMENT else None)
+    cache_awal = cache_stats() if INSTRUMENT else None
+    timer.mark("impor & setup")
+
+    sumber = sync_source(DATA_SOURCE)
+    if sumber is None:
+        return
+    version = sumber["version"]
+    df = load_data(DATA_SOURCE, version)
     if df.empty:
         return
+    registry = load_registry(DATA_SOURCE, version)
+    cube = load_cube(DATA_SOURCE, version)
+    heat = load_heat_bins(DATA_SOURCE, version)
+    summary = load_summary(DATA_SOURCE, version)
+    timer.mark("muat data")
 
     # --- Sidebar filter & tema ---
     st.sidebar.markdown('<div class="sidebar-title">Saring Data</div>', unsafe_allow_html=True)
 
-    date_min, date_max = df["date"].min(), df["date"].max()
+    date_min, date_max = summary.date_min, summary.date_max
+    # label periode dataset, mis. "2021" atau "2019–2023" untuk data multi-tahun
+    periode_data = summary.periode
     date_range = st.sidebar.date_input(
         "Rentang Tanggal",
         value=[date_min, date_max],
@@ -1120,13 +1504,13 @@ def main():
         max_value=date_max,
         format="DD/MM/YYYY",
     )
-    if isinstance(date_range, list) and len(date_range) == 2:
+    # date_input mengembalikan tuple (bukan list) untuk rentang tanggal
+    if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
         start_date, end_date = pd.to_datetime(date_range[0]), pd.to_datetime(date_range[1])
     else:
         start_date, end_date = date_min, date_max
 
-    trayek_all = sorted(df["trayek"].dropna().unique().tolist())
-    selected_trayek = st.sidebar.multiselect("Filter Trayek", trayek_all, default=[])
+    selected_trayek = st.sidebar.multiselect("Filter Trayek", registry.route_names, default=[])
 
     st.sidebar.markdown("---")
     st.sidebar.markdown('<div class="sidebar-title">Tema</div>', unsafe_allow_html=True)
@@ -1145,13 +1529,13 @@ def main():
 
     # TOP NAV
     st.markdown(
-        """
+        f"""
 <div class="top-nav">
     <div class="top-left">
         <div class="logo-badge">TJ</div>
         <div class="app-title">
             <span>Analisis Transportasi</span>
-            <span>Dashboard TransJakarta 2021</span>
+            <span>Dashboard TransJakarta {periode_data}</span>
         </div>
     </div>
     <div class="user-pill">
@@ -1166,10 +1550,14 @@ def main():
         unsafe_allow_html=True,
     )
 
-   # Aplikasikan filter
-    df_filtered = df[(df["date"] >= start_date) & (df["date"] <= end_date)]
-    if selected_trayek:
-        df_filtered = df_filtered[df_filtered["trayek"].isin(selected_trayek)]
+    # Aplikasikan filter (hasil dimemo per status filter, lintas sesi)
+    # versi data ikut dalam kunci agar cache filter/grafik/peta/unduhan tidak basi
+    fkey = (version,) + filter_key(start_date, end_date, selected_trayek)
+    df_filtered, cube_filtered, heat_filtered, kpis_filtered = filter_cache().get_or_compute(
+        (DATA_SOURCE, fkey),
+        lambda: apply_filter(df, cube, heat, start_date, end_date, selected_trayek),
+    )
+    timer.mark("sidebar & filter")
 
     has_filter = not (
         start_date == date_min
@@ -1177,62 +1565,45 @@ def main():
         and (not selected_trayek)
     )
 
-    # GLOBAL baseline (tanpa filter)
-    global_top_route = (
-        df.groupby("trayek")["jumlah_penumpang"].sum().sort_values(ascending=False).idxmax()
-        if "trayek" in df.columns and not df.empty
-        else "-"
-    )
-    global_top_halte_awal = (
-        df["halte_awal"].mode()[0]
-        if "halte_awal" in df.columns and not df["halte_awal"].dropna().empty
-        else "-"
-    )
+    # GLOBAL baseline (tanpa filter), dari ringkasan dataset
+    global_top_route = summary.top_route
+    global_top_halte_awal = summary.top_stop("halte_awal")
 
     # Sidebar ringkasan + unduh data
     st.sidebar.markdown("---")
     st.sidebar.markdown('<div class="sidebar-title">Ringkasan</div>', unsafe_allow_html=True)
 
-    total_penumpang = int(df_filtered["jumlah_penumpang"].sum()) if not df_filtered.empty else 0
-    n_trayek = int(df_filtered["trayek"].nunique()) if not df_filtered.empty else 0
-    halte_unik = int(
-        (df_filtered["halte_awal"].nunique() if "halte_awal" in df_filtered.columns else 0)
-        + (df_filtered["halte_tujuan"].nunique() if "halte_tujuan" in df_filtered.columns else 0)
-    ) if not df_filtered.empty else 0
-
-    st.sidebar.metric("Total Penumpang (Filter)", fmt_id(total_penumpang))
-    st.sidebar.metric("Jumlah Trayek Aktif", fmt_id(n_trayek))
-    st.sidebar.metric("Total Halte Terpakai", fmt_id(halte_unik))
-
-    csv_all = df_filtered.to_csv(index=False).encode("utf-8")
-    st.sidebar.download_button(
-        "⬇ Unduh data terfilter (CSV)",
-        csv_all,
-        file_name="transjakarta_filter.csv",
-        mime="text/csv",
-        key="dl_all_filtered",
+    # tanpa filter: KPI langsung dari ringkasan dataset
+    kpis = kpis_filtered if has_filter else summary.kpis
+
+    st.sidebar.metric("Total Penumpang (Filter)", fmt_id(kpis["total"]))
+    st.sidebar.metric("Jumlah Trayek Aktif", fmt_id(kpis["n_trayek"]))
+    st.sidebar.metric("Total Halte Terpakai", fmt_id(kpis["n_halte"]))
+    st.sidebar.caption(
+        f"Terakhir diperbarui: {pd.Timestamp(sumber['refreshed_at']):%d/%m/%Y %H:%M}"
     )
 
-    # KPI GRID
-    monthly = (
-        df_filtered.groupby("date", as_index=False)["jumlah_penumpang"].sum().sort_values("date")
-        if not df_filtered.empty
-        else pd.DataFrame(columns=["date", "jumlah_penumpang"])
+    st.sidebar.selectbox(
+        "Format unduhan",
+        list(FORMAT_LABEL),
+        format_func=FORMAT_LABEL.get,
+        key="format_unduh",
     )
 
-    if monthly.empty:
-        mx_date = mn_date = None
-        mx_val = mn_val = 0
-        recovery_text = "—"
-        median_passenger = 0
-    else:
-        mx_idx = monthly["jumlah_penumpang"].idxmax()
-        mn_idx = monthly["jumlah_penumpang"].idxmin()
-        mx_date, mn_date = monthly.loc[mx_idx, "date"], monthly.loc[mn_idx, "date"]
-        mx_val, mn_val = monthly.loc[mx_idx, "jumlah_penumpang"], monthly.loc[mn_idx, "jumlah_penumpang"]
-        recovery = (mx_val - mn_val) / mn_val * 100.0 if mn_val > 0 else np.nan
-        recovery_text = f"{recovery:.1f}%" if pd.notna(recovery) else "—"
-        median_passenger = df_filtered["jumlah_penumpang"].median()
+    download_button(
+        st.sidebar,
+        "⬇ Unduh data terfilter",
+        df_filtered,
+        file_stem="transjakarta_filter",
+        key="dl_all_filtered",
+        fkey=fkey,
+    )
+
+    # KPI GRID
+    mx_date, mn_date = kpis["peak_date"], kpis["low_date"]
+    mx_val, mn_val = kpis["peak_value"], kpis["low_value"]
+    recovery_text = f"{kpis['recovery_pct']:.1f}%" if pd.notna(kpis["recovery_pct"]) else "—"
+    median_passenger = kpis["median"]
 
     peak_month_text = mx_date.strftime("%B %Y") if mx_date is not None else "N/A"
     low_month_text = mn_date.strftime("%B %Y") if mn_date is not None else "N/A"
@@ -1277,79 +1648,70 @@ def main():
 </div>
 """
     st.markdown(kpi_html, unsafe_allow_html=True)
+    timer.mark("render KPI")
+    if PROFILE_STARTUP:
+        tampilkan_profil_startup(timer)
 
     # Tabs
-    tab1, tab2, tab3, tab4 = st.tabs(["KPI Utama", "Tren & Distribusi", "Rute & Spasial", "Rekomendasi"])
+    # hanya tab yang sedang dibuka yang dihitung & dirender
+    tab1, tab2, tab3, tab4 = lazy_tabs(["KPI Utama", "Tren & Distribusi", "Rute & Spasial", "Rekomendasi"], key="tab_aktif")
 
     # TAB 1 – Ringkasan Insight Utama
     with tab1:
-        with st.container(border=True):
-            # nilai terfilter
-            if not df_filtered.empty:
-                filtered_top_route = (
-                    df_filtered.groupby("trayek")["jumlah_penumpang"]
-                    .sum()
-                    .sort_values(ascending=False)
-                    .idxmax()
-                    if "trayek" in df_filtered.columns
-                    else "-"
-                )
-                filtered_top_halte_awal = (
-                    df_filtered["halte_awal"].mode()[0]
-                    if "halte_awal" in df_filtered.columns
-                    and not df_filtered["halte_awal"].dropna().empty
-                    else "-"
-                )
-            else:
-                filtered_top_route = "-"
-                filtered_top_halte_awal = "-"
-
-            pill_class = "insight-pill-active" if has_filter else "insight-pill-off"
-            pill_text = "Filter aktif" if has_filter else "Tanpa filter"
-
-            # --- Kolom Rute Terpadat ---
-            route_cell = f"""
+        if tab_aktif(tab1):
+            with st.container(border=True):
+                # nilai terfilter
+                filtered_routes = cube_filtered.by_trayek()
+                filtered_top_route = filtered_routes["trayek"].iloc[0] if not filtered_routes.empty else "-"
+                filtered_halte_awal = cube_filtered.halte_counts("halte_awal")
+                filtered_top_halte_awal = filtered_halte_awal.index[0] if not filtered_halte_awal.empty else "-"
+
+                pill_class = "insight-pill-active" if has_filter else "insight-pill-off"
+                pill_text = "Filter aktif" if has_filter else "Tanpa filter"
+
+                # --- Kolom Rute Terpadat ---
+                route_cell = f"""
 <div>
-  <div style="font-size:0.8rem; color:#6b7280;">2021 (tanpa filter)</div>
+  <div style="font-size:0.8rem; color:#6b7280;">{periode_data} (tanpa filter)</div>
   <div style="font-weight:600;">{global_top_route}</div>
 """
 
-            if has_filter:
-                route_cell += """
+                if has_filter:
+                    route_cell += """
   <div style="margin:6px 0; border-bottom:1px solid rgba(148,163,184,0.6);"></div>
   <div style="font-size:0.8rem; color:#16a34a;">Filter saat ini</div>
 """
-                if selected_trayek:
-                    route_cell += '<ol style="padding-left:1.1rem; margin:2px 0 0 0; font-size:0.82rem;">'
-                    for t in selected_trayek:
-                        route_cell += f"<li>{t}</li>"
-                    route_cell += "</ol>"
-                else:
-                    route_cell += f'<div style="font-weight:600;">{filtered_top_route}</div>'
-            route_cell += "</div>"
-
-            # --- Kolom Halte Awal Tersibuk ---
-            halte_cell = f"""
+                    if selected_trayek:
+                        route_cell += '<ol style="padding-left:1.1rem; margin:2px 0 0 0; font-size:0.82rem;">'
+                        for t in selected_trayek:
+                            route_cell += f"<li>{t}</li>"
+                        route_cell += "</ol>"
+                    else:
+                        route_cell += f'<div style="font-weight:600;">{filtered_top_route}</div>'
+                route_cell += "</div>"
+
+                # --- Kolom Halte Awal Tersibuk ---
+                halte_cell = f"""
 <div>
-  <div style="font-size:0.8rem; color:#6b7280;">2021 (tanpa filter)</div>
+  <div style="font-size:0.8rem; color:#6b7280;">{periode_data} (tanpa filter)</div>
   <div style="font-weight:600;">{global_top_halte_awal}</div>
 """
 
-            if has_filter and filtered_top_halte_awal != "-":
-                halte_cell += f"""
+                if has_filter and filtered_top_halte_awal != "-":
+                    halte_cell += f"""
   <div style="margin:6px 0; border-bottom:1px solid rgba(148,163,184,0.6);"></div>
   <div style="font-size:0.8rem; color:#16a34a;">Filter saat ini</div>
   <div style="font-weight:600;">{filtered_top_halte_awal}</div>
 """
-            halte_cell += "</div>"
+                halte_cell += "</div>"
 
-            # ====== render tabel utama ======
-            st.markdown(
-                f"""
+                # ====== render tabel utama ======
+                st.markdown(
+                    f"""
 <div class="insight-header-row">
   <div>
     <div class="insight-title">Ringkasan Insight Utama</div>
-    <div class="insight-caption">📌 Perbandingan data 2021 vs data terfilter</div>
+    <div class="insight-caption">📌 Perbandingan data {periode_data} vs data terfilter</div>
   </div>
   <div class="{pill_class}">{pill_text}</div>
 </div>
@@ -1368,98 +1730,107 @@ def main():
       <td class="value-cell">{halte_cell}</td>
     </tr>
 """,
-                unsafe_allow_html=True,
-            )
+                    unsafe_allow_html=True,
+                )
 
-            # ====== baris chip trayek (opsional, di bawah kotak) ======
-            if selected_trayek:
-                chips_row = '<tr><td colspan="3"><div class="filter-chips-row">'
-                chips_row += '<span class="filter-chip filter-chip-label">Trayek difilter</span>'
-                for t in selected_trayek:
-                    chips_row += f'<span class="filter-chip">{t}</span>'
-                chips_row += '</div></td></tr>'
-                st.markdown(chips_row, unsafe_allow_html=True)
-
-            st.markdown(
-                """
+                # ====== baris chip trayek (opsional, di bawah kotak) ======
+                if selected_trayek:
+                    chips_row = '<tr><td colspan="3"><div class="filter-chips-row">'
+                    chips_row += '<span class="filter-chip filter-chip-label">Trayek difilter</span>'
+                    for t in selected_trayek:
+                        chips_row += f'<span class="filter-chip">{t}</span>'
+                    chips_row += '</div></td></tr>'
+                    st.markdown(chips_row, unsafe_allow_html=True)
+
+                st.markdown(
+                    """
   </tbody>
 </table>
 """,
-                unsafe_allow_html=True,
-            )
+                    unsafe_allow_html=True,
+                )
 
     # TAB 2 – Tren & Distribusi
     with tab2:
-        with st.container(border=True):
-            st.subheader("Tren & Distribusi Penumpang")
-            st.markdown("---")
+        if tab_aktif(tab2):
+            with st.container(border=True):
+                st.subheader("Tren & Distribusi Penumpang")
+                st.markdown("---")
 
-            st.markdown("#### Tren Jumlah Penumpang Bulanan")
-            plot_tren_penumpang(df_filtered, dark_mode, key_suffix="_tren")
+                st.markdown("#### Tren Jumlah Penumpang Bulanan")
+                plot_tren_penumpang(kpis["monthly"], dark_mode, key_suffix="_tren", fkey=fkey)
 
-            st.markdown("<br>", unsafe_allow_html=True)
+                st.markdown("<br>", unsafe_allow_html=True)
 
-            st.markdown("#### Distribusi Jumlah Penumpang per Trayek")
-            plot_distribusi_penumpang(df_filtered, dark_mode, key_suffix="_distribusi")
+                st.markdown("#### Distribusi Jumlah Penumpang per Trayek")
+                plot_distribusi_penumpang(df_filtered, dark_mode, key_suffix="_distribusi", fkey=fkey)
 
     # TAB 3 – Rute & Spasial
     with tab3:
-        with st.container(border=True):
-            st.subheader("Rute, Halte, dan Dimensi Spasial")
-            st.markdown("---")
-            plot_top_routes_dan_halte(df_filtered, dark_mode, key_suffix="_rute_halte")
+        if tab_aktif(tab3):
+            with st.container(border=True):
+                st.subheader("Rute, Halte, dan Dimensi Spasial")
+                st.markdown("---")
+                plot_top_routes_dan_halte(cube_filtered, dark_mode, key_suffix="_rute_halte", fkey=fkey)
 
-        st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown("<br>", unsafe_allow_html=True)
 
-        with st.container(border=True):
-            st.subheader("Hubungan Jarak dan Permintaan")
-            st.markdown("---")
-            plot_korelasi_jarak_penumpang(df_filtered, dark_mode, key_suffix="_korelasi")
+            with st.container(border=True):
+                st.subheader("Hubungan Jarak dan Permintaan")
+                st.markdown("---")
+                plot_korelasi_jarak_penumpang(df_filtered, dark_mode, key_suffix="_korelasi", fkey=fkey)
 
-        st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown("<br>", unsafe_allow_html=True)
 
-        with st.container(border=True):
-            st.subheader("Peta Hotspot Halte (Interaktif)")
-            st.markdown("---")
-            plot_peta_interaktif(df_filtered, dark_mode)
+            with st.container(border=True):
+                st.subheader("Peta Hotspot Halte (Interaktif)")
+                st.markdown("---")
+                plot_peta_interaktif(df_filtered, heat_filtered, dark_mode, fkey=fkey)
 
     # TAB 4 – Rekomendasi
     with tab4:
-        with st.container(border=True):
-            st.subheader("Kesimpulan & Rekomendasi Strategi")
-            st.markdown("---")
-
-            col_temuan, col_rekom = st.columns(2)
-            periode_text = "periode terpilih" if has_filter else "tahun 2021"
-
-            with col_temuan:
-                st.markdown("#### Temuan Utama")
-                st.markdown(
-                    f"""
+        if tab_aktif(tab4):
+            with st.container(border=True):
+                st.subheader("Kesimpulan & Rekomendasi Strategi")
+                st.markdown("---")
+
+                col_temuan, col_rekom = st.columns(2)
+                periode_text = "periode terpilih" if has_filter else f"tahun {periode_data}"
+
+                with col_temuan:
+                    st.markdown("#### Temuan Utama")
+                    st.markdown(
+                        f"""
 * *Efek Pareto:* Sebagian kecil rute menyerap porsi sangat besar permintaan penumpang pada {periode_text}.
 * *Ketahanan Jaringan:* Pemulihan volume penumpang yang kuat setelah fase pembatasan.
 * *Node Kritis:* Beberapa halte bekerja sebagai super hub yang sangat menentukan kualitas perjalanan.
 * *Permintaan Non-Linear:* Jarak trayek tidak selalu berbanding lurus dengan banyaknya penumpang.
 """
-                )
+                    )
 
-            with col_rekom:
-                st.markdown("#### Rekomendasi Prioritas Aksi")
-                st.markdown(
-                    f"""
+                with col_rekom:
+                    st.markdown("#### Rekomendasi Prioritas Aksi")
+                    st.markdown(
+                        f"""
 1. *Perkuat Top Rute* – tambah armada & kurangi headway pada rute dengan kontribusi penumpang terbesar di {periode_text}.
 2. *Tata Ulang Hub Utama* – tingkatkan kapasitas antrian, informasi real-time, dan integrasi moda di halte tersibuk.
 3. *Right-Sizing Rute Panjang* – tinjau kembali rute jauh dengan load factor rendah (hasil korelasi jarak).
 4. *Pemantauan Berkala* – gunakan dashboard ini sebagai early warning jika ada pergeseran pola permintaan per rute/halte.
 """
-                )
+                    )
 
-        st.markdown("---")
-        st.caption("Dashboard dibangun dengan Python, Streamlit, Plotly, dan Folium. Data: TransJakarta 2021.")
+            st.markdown("---")
+            st.caption(f"Dashboard dibangun dengan Python, Streamlit, Plotly, dan Folium. Data: TransJakarta {periode_data}.")
 
     # FOOTER KELOMPOK
     st.markdown('<div class="footer-kelompok">KELOMPOK HAHAHA</div>', unsafe_allow_html=True)
 
+    timer.mark("render tab")
+    if INSTRUMENT:
+        laporkan_instrumentasi(timer, cache_awal)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("cache: %s", cache_stats())
+
 
 if __name__ == "__main__":
     main()
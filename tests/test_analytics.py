@@ -0,0 +1,139 @@
+"""Analitik headless vs. perhitungan baris-per-baris dashboard lama (pandas)
+pada ``df_final.csv``, tanpa filter dan dengan filter."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import REFERENCE_CSV
+from transjakarta import analytics
+
+FILTERS = {
+    "semua": (None, None, None),
+    "tanggal": ("2021-03-01", "2021-06-01", None),
+    "trayek": (None, None, ["Bintara - Cipinang Indah", "Terminal Tanjung Priok - Ancol Barat", "Rusun Pesakih - Kalideres"]),
+    "tanggal+trayek": ("2021-05-01", "2021-10-01", ["Bintara - Cipinang Indah", "Kampung Melayu - Duren Sawit"]),
+}
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("TJ_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+        yield analytics.load_dataset(REFERENCE_CSV)
+
+
+@pytest.fixture(params=list(FILTERS))
+def case(request, dataset):
+    start, end, trayek = FILTERS[request.param]
+    df = dataset["df"]
+    # dashboard lama: kolom teks biasa + mask boolean
+    base = df.astype({c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+    mask = pd.Series(True, index=base.index)
+    if start is not None:
+        mask &= (base["date"] >= pd.Timestamp(start)) & (base["date"] <= pd.Timestamp(end))
+    if trayek:
+        mask &= base["trayek"].isin(trayek)
+    result = analytics.filter_data(df, dataset["cube"], dataset["heat"], start, end, trayek)
+    return base[mask], result
+
+
+def test_filter_rows_and_kpis(case):
+    base, (rows, cube_q, _, kpis) = case
+    assert len(base) > 0
+    pd.testing.assert_index_equal(rows.index, base.index)
+    assert kpis["total"] == base["jumlah_penumpang"].sum()
+    assert kpis["n_trayek"] == base["trayek"].nunique()
+    assert kpis["n_halte"] == base["halte_awal"].nunique() + base["halte_tujuan"].nunique()
+    assert kpis["median"] == base["jumlah_penumpang"].median()
+
+    monthly = base.groupby("date", as_index=False)["jumlah_penumpang"].sum().sort_values("date")
+    np.testing.assert_array_equal(kpis["monthly"]["date"].to_numpy(), monthly["date"].to_numpy())
+    np.testing.assert_array_equal(kpis["monthly"]["jumlah_penumpang"].to_numpy(), monthly["jumlah_penumpang"].to_numpy())
+    peak = monthly.loc[monthly["jumlah_penumpang"].idxmax()]
+    low = monthly.loc[monthly["jumlah_penumpang"].idxmin()]
+    assert (kpis["peak_date"], kpis["peak_value"]) == (peak["date"], peak["jumlah_penumpang"])
+    assert (kpis["low_date"], kpis["low_value"]) == (low["date"], low["jumlah_penumpang"])
+
+
+def test_rolling_trend(case):
+    base, (_, _, _, kpis) = case
+    monthly = base.groupby("date", as_index=False)["jumlah_penumpang"].sum().sort_values("date")
+    expected = monthly["jumlah_penumpang"].rolling(3, min_periods=1).mean().to_numpy()
+    np.testing.assert_allclose(analytics.rolling_trend(kpis["monthly"])["rolling_3m"].to_numpy(), expected)
+
+
+def test_top_routes(case):
+    base, (_, cube_q, _, _) = case
+    expected = (
+        base.groupby("trayek", as_index=False)["jumlah_penumpang"]
+        .sum()
+        .sort_values("jumlah_penumpang", ascending=False)
+        .head(10)
+    )
+    got = analytics.top_routes(cube_q)
+    assert got["trayek"].astype(str).tolist() == expected["trayek"].tolist()
+    np.testing.assert_array_equal(got["jumlah_penumpang"].to_numpy(), expected["jumlah_penumpang"].to_numpy())
+    np.testing.assert_allclose(
+        got["share"].to_numpy(), expected["jumlah_penumpang"].to_numpy() / base["jumlah_penumpang"].sum() * 100
+    )
+
+
+def test_top_halte(case):
+    base, (_, cube_q, _, _) = case
+    parts = []
+    for col, tipe in (("halte_awal", "Awal"), ("halte_tujuan", "Tujuan")):
+        vc = base[col].value_counts().head(10).reset_index()
+        vc.columns = ["Halte", "Frekuensi"]
+        vc["Tipe"] = tipe
+        parts.append(vc)
+    expected = pd.concat(parts).sort_values("Frekuensi", ascending=False).drop_duplicates(subset="Halte").head(10)
+    got = analytics.top_halte(cube_q)
+    np.testing.assert_array_equal(got["Frekuensi"].to_numpy(), expected["Frekuensi"].to_numpy())
+    # urutan di antara frekuensi yang sama tidak ditentukan dashboard lama
+    key = lambda t: sorted(zip(t["Frekuensi"], t["Halte"].astype(str), t["Tipe"]))  # noqa: E731
+    assert key(got) == key(expected)
+
+
+def test_map_points(case):
+    base, (rows, _, _, _) = case
+    in_box = (
+        base["latitude_awal"].between(-7.8, -5.5)
+        & base["longitude_awal"].between(106.3, 107.3)
+        & base["latitude_tujuan"].between(-7.8, -5.5)
+        & base["longitude_tujuan"].between(106.3, 107.3)
+    )
+    expected = base[in_box].dropna(subset=["latitude_awal", "longitude_awal", "latitude_tujuan", "longitude_tujuan"])
+    expected = expected[expected["distance_km"] <= 60]
+    pd.testing.assert_index_equal(analytics.map_points(rows).index, expected.index)
+
+
+@pytest.fixture(scope="module")
+def store_dataset(tmp_path_factory, dataset):
+    src = tmp_path_factory.mktemp("src")
+    raw = pd.read_csv(REFERENCE_CSV)
+    raw[raw["month"] <= 6].to_csv(src / "h1.csv", index=False)
+    raw[raw["month"] > 6].to_csv(src / "h2.csv", index=False)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("TJ_CACHE_DIR", str(tmp_path_factory.mktemp("store-cache")))
+        yield str(src), analytics.load_dataset(str(src))
+
+
+def test_load_pieces_match_load_dataset(dataset):
+    df, registry = dataset["df"], dataset["registry"]
+    assert len(analytics.load_frame(REFERENCE_CSV)) == len(df)
+    pd.testing.assert_frame_equal(analytics.load_cube(REFERENCE_CSV, df, registry).cube, dataset["cube"].cube)
+    pd.testing.assert_frame_equal(analytics.load_heat_bins(REFERENCE_CSV, df, registry).bins, dataset["heat"].bins)
+
+
+def test_store_source_matches_csv(dataset, store_dataset):
+    src, store = store_dataset
+    # store: agregat per partisi dari refresh_store, dikodekan dengan kamus registri
+    assert len(store["df"]) == len(dataset["df"])
+    assert store["cube"].total() == dataset["cube"].total()
+    pd.testing.assert_frame_equal(
+        store["cube"].by_trayek().sort_values("trayek", ignore_index=True).astype({"trayek": str}),
+        dataset["cube"].by_trayek().sort_values("trayek", ignore_index=True).astype({"trayek": str}),
+    )
+    assert store["heat"].bins["n"].sum() == dataset["heat"].bins["n"].sum()
+    assert store["cube"].cube["trayek"].cat.categories.tolist() == store["registry"].route_names
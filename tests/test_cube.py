@@ -0,0 +1,81 @@
+"""Roll-up ``AggregateCube`` vs. ``groupby`` pandas di atas baris."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from transjakarta.cube import AggregateCube
+from transjakarta.schema import apply_schema
+
+FILTERS = [
+    (None, None, None),
+    ("2021-02-01", "2021-03-01", None),
+    (None, None, ["B", "C"]),
+    ("2021-01-01", "2021-02-01", ["A", "C", "D"]),
+]
+
+
+@pytest.fixture(params=["object", "kategori"])
+def rows(request):
+    # nilai seri disengaja: total trayek A = B, frekuensi halte X = Y = Z
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2021-01-01", "2021-01-01", "2021-02-01", "2021-02-01", "2021-03-01", "2021-03-01",
+                                    "2021-01-01", "2021-03-01"]),
+            "jenis": ["BRT"] * 4 + ["Mikrotrans"] * 4,
+            "trayek": ["B", "A", "B", "A", "C", "D", "C", "D"],
+            "halte_awal": ["Y", "X", "Z", "X", "Y", "Z", "W", "W"],
+            "halte_tujuan": ["P", "Q", "P", "Q", "R", "R", "Q", "P"],
+            "jumlah_penumpang": [10, 15, 20, 15, 5, 2, 7, 1],
+        }
+    )
+    return apply_schema(df) if request.param == "kategori" else df
+
+
+def filtered(df, start, end, trayek):
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= (df["date"] >= pd.Timestamp(start)) & (df["date"] <= pd.Timestamp(end))
+    if trayek:
+        mask &= df["trayek"].astype(str).isin(trayek)
+    return df[mask]
+
+
+@pytest.mark.parametrize("start,end,trayek", FILTERS)
+def test_cube_matches_row_groupby(rows, start, end, trayek):
+    cube = AggregateCube.from_frame(rows).query(start, end, trayek)
+    base = filtered(rows, start, end, trayek).astype({c: str for c in ("trayek", "halte_awal", "halte_tujuan")})
+
+    assert cube.total() == base["jumlah_penumpang"].sum()
+    for col in ("trayek", "halte_awal", "halte_tujuan"):
+        assert cube.nunique(col) == base[col].nunique()
+
+    monthly = base.groupby("date", as_index=False)["jumlah_penumpang"].sum()
+    np.testing.assert_array_equal(cube.monthly()["jumlah_penumpang"].to_numpy(), monthly["jumlah_penumpang"].to_numpy())
+
+    # urutan turun, seri menurut nama (idxmax / nlargest di atas groupby terurut)
+    expected = base.groupby("trayek")["jumlah_penumpang"].sum().nlargest(len(base), keep="first")
+    got = cube.by_trayek()
+    assert got["trayek"].astype(str).tolist() == expected.index.tolist()
+    assert got["jumlah_penumpang"].tolist() == expected.tolist()
+    assert got["trayek"].iloc[0] == base.groupby("trayek")["jumlah_penumpang"].sum().idxmax()
+
+    for col in ("halte_awal", "halte_tujuan"):
+        counts = cube.halte_counts(col)
+        vc = base[col].value_counts()
+        expected = vc.sort_index().sort_values(ascending=False, kind="stable")
+        assert [str(i) for i in counts.index] == expected.index.tolist()
+        assert counts.tolist() == expected.tolist()
+        assert counts.index[0] == base[col].mode()[0]
+
+
+def test_by_trayek_tie_order_is_stable(rows):
+    # A dan B sama-sama 30 penumpang: A (nama lebih awal) selalu di depan
+    order = AggregateCube.from_frame(rows).by_trayek()["trayek"].astype(str).tolist()
+    assert order[:2] == ["A", "B"]
+
+
+def test_empty_query(rows):
+    cube = AggregateCube.from_frame(rows).query("2022-01-01", "2022-12-01")
+    assert cube.empty and cube.total() == 0
+    assert cube.by_trayek().empty and cube.halte_counts("halte_awal").empty
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from conftest import REFERENCE_CSV
+
+st_logger = pytest.importorskip("streamlit.logger")
+st_logger.set_log_level("error")  # peringatan mode bare (tanpa `streamlit run`)
+
+import dashboard  # noqa: E402
+from transjakarta import analytics, stats  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def df(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("TJ_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+        return analytics.load_dataset(REFERENCE_CSV)["df"]
+
+
+def test_korelasi_insight_with_full_resampling(df, monkeypatch):
+    monkeypatch.setattr(dashboard, "KORELASI_RESAMPLES", 300)
+    monkeypatch.setattr(dashboard, "KORELASI_TIME_BUDGET_S", 60.0)
+    insight = dashboard.build_korelasi_jarak_penumpang(df, False)["insight"]
+    assert "IK 95% bootstrap" in insight and "uji permutasi" in insight
+    assert "batas waktu" not in insight
+
+
+def test_korelasi_insight_truncated_but_enough_resamples(df, monkeypatch):
+    # anggaran ≈ 0: hanya batch pertama (≥ KORELASI_MIN_RESAMPLES resampel pada data kecil)
+    monkeypatch.setattr(dashboard, "KORELASI_RESAMPLES", 100_000)
+    monkeypatch.setattr(dashboard, "KORELASI_TIME_BUDGET_S", 0.0)
+    insight = dashboard.build_korelasi_jarak_penumpang(df, False)["insight"]
+    assert "IK 95% bootstrap" in insight
+    assert "permutasi karena batas waktu" in insight
+
+
+def test_korelasi_insight_without_time_budget(df, monkeypatch):
+    # batch kecil + anggaran ≈ 0: hanya beberapa resampel, IK & p-value tidak boleh diklaim
+    monkeypatch.setattr(stats, "MAX_BATCH_ELEMENTS", 3 * len(df))
+    monkeypatch.setattr(dashboard, "KORELASI_RESAMPLES", 100_000)
+    monkeypatch.setattr(dashboard, "KORELASI_TIME_BUDGET_S", 0.0)
+    insight = dashboard.build_korelasi_jarak_penumpang(df, False)["insight"]
+    assert "IK 95%" not in insight and "p =" not in insight and "p <" not in insight
+    assert "mencakup nol" not in insight
+    assert "tidak ditampilkan karena batas waktu hanya cukup untuk 3 resampel" in insight
+
+
+def test_laporkan_instrumentasi_appends_record(tmp_path, monkeypatch):
+    log = tmp_path / "rerun.jsonl"
+    monkeypatch.setattr(dashboard, "INSTRUMENT", "log")
+    monkeypatch.setattr(dashboard, "INSTRUMENT_LOG", str(log))
+    trace = dashboard.RerunTrace()
+    cache_awal = dashboard.cache_stats()
+    trace.mark("render")
+    dashboard.laporkan_instrumentasi(trace, cache_awal)
+    record = json.loads(log.read_text(encoding="utf-8"))
+    assert record["rerun_id"] == trace.rerun_id
+    assert set(record["caches"]) == {"filter", "grafik", "statistik", "peta", "unduhan"}
+    assert record["stages"][0]["stage"] == "render"
+
+
+def test_stats_cache_counts_bytes(df, monkeypatch):
+    monkeypatch.setattr(dashboard, "KORELASI_RESAMPLES", 300)
+    cache = dashboard.stats_cache()
+    cache.clear()
+    dashboard.build_korelasi_jarak_penumpang(df, False, fkey=("uji",))
+    info = cache.stats()
+    assert info["maxbytes"] > 0
+    assert info["size"] == 2 and info["nbytes"] > 0
+    assert info["nbytes"] <= info["maxbytes"]
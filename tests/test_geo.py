@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import REFERENCE_CSV
+from transjakarta.geo import haversine_km, repair_coordinates, vincenty_km
+
+
+def dms(d, m, s):
+    return np.sign(d) * (abs(d) + m / 60 + s / 3600)
+
+
+def test_vincenty_flinders_peak_buninyong():
+    # contoh baku rumus invers Vincenty (Geoscience Australia): 54 972,271 m
+    km = vincenty_km(
+        dms(-37, 57, 3.72030), dms(144, 25, 29.52440), dms(-37, 39, 10.15610), dms(143, 55, 35.38390)
+    )
+    assert km == pytest.approx(54.972271, abs=1e-6)
+
+
+def test_vincenty_equator_degree():
+    # satu derajat bujur di ekuator = a·π/180 pada WGS-84
+    assert vincenty_km(0, 0, 0, 1) == pytest.approx(6378.137 * np.pi / 180, rel=1e-12)
+
+
+def test_vincenty_vectorized_and_edge_cases():
+    lat1 = np.array([-6.1754, 0.0, 1.0])
+    lon1 = np.array([106.8272, 0.0, 1.0])
+    lat2 = np.array([-6.2615, 0.0, 1.0])
+    lon2 = np.array([106.8106, 180.0, 1.0])
+    km = vincenty_km(lat1, lon1, lat2, lon2)
+    assert km.shape == (3,)
+    # jarak dalam kota: selisih dengan haversine (bola) < 1%
+    assert km[0] == pytest.approx(haversine_km(lat1[0], lon1[0], lat2[0], lon2[0]), rel=1e-2)
+    assert np.isnan(km[1])  # antipodal: tidak konvergen
+    assert km[2] == 0.0
+
+
+def coords_frame(*rows):
+    cols = ["latitude_awal", "longitude_awal", "latitude_tujuan", "longitude_tujuan"]
+    return pd.DataFrame(list(rows), columns=cols)
+
+
+def test_repair_coordinates_swaps_in_box_pair():
+    # awal tertukar (lon, lat), tujuan sudah benar
+    df, report = repair_coordinates(coords_frame((106.84, -6.20, -6.13, 106.85)))
+    assert df.loc[0, ["latitude_awal", "longitude_awal"]].tolist() == [-6.20, 106.84]
+    assert df.loc[0, ["latitude_tujuan", "longitude_tujuan"]].tolist() == [-6.13, 106.85]
+    assert bool(df.loc[0, "geo_valid"])
+    assert report == {
+        "swapped_awal": 1, "impossible_awal": 0, "swapped_tujuan": 0, "impossible_tujuan": 0, "invalid_rows": 0,
+    }
+
+
+def test_repair_coordinates_impossible_pair_becomes_nan():
+    df, report = repair_coordinates(coords_frame((-6.20, 106.84, 95.0, 106.85), (-6.20, 200.0, -6.13, 106.85)))
+    assert np.isnan(df.loc[0, ["latitude_tujuan", "longitude_tujuan"]].to_numpy(dtype=float)).all()
+    assert np.isnan(df.loc[1, ["latitude_awal", "longitude_awal"]].to_numpy(dtype=float)).all()
+    assert not df["geo_valid"].any()
+    assert (report["impossible_awal"], report["impossible_tujuan"], report["invalid_rows"]) == (1, 1, 2)
+    assert report["swapped_awal"] == report["swapped_tujuan"] == 0
+
+
+def test_repair_coordinates_leaves_valid_and_out_of_area_pairs():
+    rows = (
+        (-6.20, 106.84, -6.13, 106.85),  # valid
+        (-6.90, 107.60, -6.13, 106.85),  # Bandung: di bumi tapi di luar Jabodetabek, tidak ditukar
+        (np.nan, np.nan, -6.13, 106.85),  # koordinat kosong
+    )
+    src = coords_frame(*rows)
+    df, report = repair_coordinates(src)
+    pd.testing.assert_frame_equal(df.drop(columns="geo_valid"), src)
+    assert df["geo_valid"].tolist() == [True, False, False]
+    assert report["swapped_awal"] == report["swapped_tujuan"] == 0
+    assert report["invalid_rows"] == 2
+
+
+def test_repair_coordinates_counts_on_reference_csv():
+    # sebagian besar titik di df_final.csv tersimpan sebagai (lon, lat)
+    _, report = repair_coordinates(pd.read_csv(REFERENCE_CSV))
+    assert report == {
+        "swapped_awal": 756, "impossible_awal": 0, "swapped_tujuan": 686, "impossible_tujuan": 0, "invalid_rows": 0,
+    }
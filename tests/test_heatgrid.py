@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import REFERENCE_CSV
+from transjakarta.heatgrid import KINDS, HeatBins, grid_index, map_rows
+from transjakarta.ingest import load_csv
+
+
+@pytest.fixture(scope="module")
+def df():
+    return load_csv(REFERENCE_CSV)
+
+
+def test_grid_index_cell_edges():
+    edges = np.array([-6.12, -6.2, 106.85, 106.8, 0.0])
+    expected = [-612, -620, 10685, 10680, 0]
+    assert grid_index(edges).tolist() == expected
+    # nilai tepi yang tersimpan float32 tetap masuk sel yang sama
+    assert grid_index(edges.astype(np.float32)).tolist() == expected
+    # sedikit di dalam sel (jauh di atas galat float32) tetap dipotong ke arah nol
+    assert grid_index([-6.1199, 106.8499, -0.005, 0.005]).tolist() == [-611, 10684, 0, 0]
+    assert grid_index([-6.12, -6.149], cell_deg=0.05).tolist() == [-122, -122]
+
+
+def test_grid_index_matches_float64_baseline():
+    raw = pd.read_csv(REFERENCE_CSV)
+    for col in ("latitude_awal", "longitude_awal", "latitude_tujuan", "longitude_tujuan"):
+        values = raw[col].dropna().to_numpy()
+        expected = (values * 100).astype(int)
+        assert (grid_index(values) == expected).all()
+        assert (grid_index(values.astype(np.float32)) == expected).all()
+
+
+def test_cells_match_row_groupby(df):
+    rows = map_rows(df)
+    heat = HeatBins.from_frame(df)
+    for kind, (lat_col, lon_col) in KINDS.items():
+        keys = pd.DataFrame(
+            {
+                "grid_lat": grid_index(rows[lat_col]),
+                "grid_lon": grid_index(rows[lon_col]),
+                "weight": rows["jumlah_penumpang"].to_numpy(dtype=np.float64),
+            }
+        )
+        expected = keys.groupby(["grid_lat", "grid_lon"]).agg(weight=("weight", "sum"), n=("weight", "size"))
+        got = heat.cells(kind).set_index(["grid_lat", "grid_lon"])[["weight", "n"]]
+        pd.testing.assert_frame_equal(got.sort_index(), expected.sort_index(), check_dtype=False)
+        # centroid sel selalu berada di dalam selnya
+        cells = heat.cells(kind)
+        assert (grid_index(cells["lat"]) == cells["grid_lat"]).all()
+
+
+def test_query_matches_filtered_frame(df):
+    trayek = df["trayek"].value_counts().index[:3].tolist()
+    sub = df[(df["date"] >= "2021-03-01") & (df["date"] <= "2021-06-01") & df["trayek"].isin(trayek)]
+    got = HeatBins.from_frame(df).query("2021-03-01", "2021-06-01", trayek).cells("awal")
+    expected = HeatBins.from_frame(sub).cells("awal")
+    key = ["grid_lat", "grid_lon"]
+    pd.testing.assert_frame_equal(
+        got.sort_values(key, ignore_index=True), expected.sort_values(key, ignore_index=True), check_dtype=False
+    )
+
+
+def test_heat_points_weights_normalised(df):
+    heat = HeatBins.from_frame(df)
+    points = np.array(heat.heat_points("awal"))
+    assert points.shape == (len(heat.cells("awal")), 3)
+    assert points[:, 2].min() >= 0 and points[:, 2].max() == 1.0
+    cells = heat.cells("awal")
+    top = cells["weight"].idxmax()
+    assert points[top].tolist() == [round(cells["lat"][top], 6), round(cells["lon"][top], 6), 1.0]
+
+
+def test_heat_points_zero_weight_and_empty(df):
+    zero = df.assign(jumlah_penumpang=0)
+    points = np.array(HeatBins.from_frame(zero).heat_points("tujuan"))
+    assert (points[:, 2] == 1.0).all()
+    assert HeatBins.from_frame(df).query("2030-01-01", "2030-12-01").heat_points("awal") == []
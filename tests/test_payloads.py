@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import REFERENCE_CSV
+from transjakarta.analytics import DENSITY_BINS, MAX_POINTS, box_summary, scatter_payload, thin_sorted
+
+
+def test_box_summary_known_values():
+    box = box_summary([4, 1, 3, 100, 2, np.nan])
+    assert box["n"] == 5
+    assert (box["q1"], box["median"], box["q3"]) == (2.0, 3.0, 4.0)
+    assert box["mean"] == pytest.approx(22.0)
+    # pagar = titik data terjauh dalam 1,5 × IQR (bukan batas pagarnya sendiri)
+    assert (box["lowerfence"], box["upperfence"]) == (1.0, 4.0)
+    assert box["outliers"].tolist() == [100.0]
+    assert box["n_outliers"] == 1
+
+
+def test_box_summary_empty():
+    box = box_summary([np.nan, np.inf])
+    assert box["n"] == box["n_outliers"] == 0
+    assert np.isnan(box["median"]) and len(box["outliers"]) == 0
+
+
+def test_box_summary_matches_pandas_on_reference():
+    x = pd.read_csv(REFERENCE_CSV)["jumlah_penumpang"].astype(float)
+    box = box_summary(x)
+    q1, median, q3 = x.quantile([0.25, 0.5, 0.75])
+    assert (box["q1"], box["median"], box["q3"]) == pytest.approx((q1, median, q3))
+    inside = x.between(q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))
+    assert box["n_outliers"] == (~inside).sum()
+    assert (box["lowerfence"], box["upperfence"]) == (x[inside].min(), x[inside].max())
+
+
+def test_box_summary_thins_outliers():
+    rng = np.random.default_rng(0)
+    x = np.concatenate([rng.normal(size=2000), np.linspace(100, 200, 200)])
+    box = box_summary(x, max_points=50)
+    assert box["n_outliers"] >= 200
+    assert len(box["outliers"]) <= 50
+    assert np.all(np.diff(box["outliers"]) >= 0)
+    assert box["outliers"][-1] == 200.0
+    assert thin_sorted(np.arange(10), 20).tolist() == list(range(10))
+
+
+def test_scatter_points_below_limit():
+    x = np.arange(MAX_POINTS, dtype=np.float32)
+    y = np.arange(MAX_POINTS, dtype=np.int32)
+    pts = scatter_payload(x, y)
+    assert pts["mode"] == "points"
+    # dtype ringkas dipertahankan (ukuran payload biner Plotly)
+    assert pts["x"].dtype == np.float32 and pts["y"].dtype == np.int32
+    assert len(pts["x"]) == MAX_POINTS
+
+
+def test_scatter_density_above_limit():
+    rng = np.random.default_rng(1)
+    n = MAX_POINTS + 1
+    x, y = rng.uniform(0, 10, n), rng.uniform(100, 200, n)
+    pts = scatter_payload(x, y)
+    assert pts["mode"] == "density"
+    assert pts["n"] == n
+    assert pts["z"].shape == (DENSITY_BINS, DENSITY_BINS)
+    assert np.nansum(pts["z"]) == n
+    assert not (pts["z"] == 0).any()
+    assert x.min() < pts["x"][0] < pts["x"][-1] < x.max()
+    assert y.min() < pts["y"][0] < pts["y"][-1] < y.max()
+
+
+def test_scatter_density_orientation_and_fixed_size():
+    # semua titik tambahan di pojok x kecil / y besar: baris z = sel y, kolom = sel x
+    x = np.r_[np.zeros(MAX_POINTS), 10.0]
+    y = np.r_[np.full(MAX_POINTS, 200.0), 100.0]
+    pts = scatter_payload(x, y, bins=4)
+    assert pts["z"][-1, 0] == MAX_POINTS
+    assert pts["z"][0, -1] == 1
+    big = scatter_payload(np.r_[x, x], np.r_[y, y], bins=4)
+    assert big["z"].shape == pts["z"].shape and big["n"] == 2 * pts["n"]
@@ -0,0 +1,70 @@
+import json
+import time
+
+import pytest
+
+from transjakarta import profiling
+from transjakarta.memo import LRUCache
+from transjakarta.profiling import RerunTrace, activate, append_jsonl, parse_importtime, trace_stage, traced
+
+
+@pytest.fixture
+def trace():
+    trace = RerunTrace()
+    activate(trace)
+    yield trace
+    activate(None)
+
+
+@traced
+def build_something(x):
+    with trace_stage("inner"):
+        time.sleep(0.01)
+    return x * 2
+
+
+def test_traced_rerun_writes_json_record(trace, tmp_path):
+    cache = LRUCache(maxsize=4)
+    before = {"filter": cache.stats()}
+    trace.mark("load")
+    assert build_something(21) == 42
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("a", lambda: 1)
+    trace.payload("grafik", 2048.7)
+    trace.cache_delta(before, {"filter": cache.stats()})
+    trace.mark("render")
+
+    log = tmp_path / "rerun.jsonl"
+    append_jsonl(str(log), trace.to_json())
+    append_jsonl(str(log), trace.to_json())
+    lines = log.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    record = json.loads(lines[0])
+
+    assert set(record) == {"rerun_id", "timestamp", "total_s", "stages", "caches", "payloads"}
+    assert record["rerun_id"] == trace.rerun_id
+    names = [s["stage"] for s in record["stages"]]
+    # tahap bersarang tercatat saat bloknya selesai: dalam sebelum luar
+    assert names == ["load", "inner", "build_something", "render"]
+    seconds = {s["stage"]: s["seconds"] for s in record["stages"]}
+    assert seconds["build_something"] >= seconds["inner"] >= 0.01
+    # mark sesudah blok bersarang dihitung sejak blok selesai, bukan sejak mark sebelumnya
+    assert seconds["render"] < 0.01
+    assert record["total_s"] >= seconds["build_something"]
+    assert record["caches"] == {"filter": {"hits": 1, "misses": 1, "evictions": 0, "size": 1}}
+    assert record["payloads"] == [{"name": "grafik", "bytes": 2048}]
+
+
+def test_trace_stage_is_noop_without_active_trace():
+    activate(None)
+    assert profiling.active_trace() is None
+    assert build_something(1) == 2
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _io\n"
+        "import time:      5000 |     250000 | pandas\n"
+    )
+    assert parse_importtime(stderr) == {"_io": 0.00012, "pandas": 0.25}
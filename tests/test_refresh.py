@@ -0,0 +1,101 @@
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import REFERENCE_CSV
+from transjakarta import ingest, refresh
+from transjakarta.ingest import read_store
+from transjakarta.store import SCHEMA_VERSION
+
+
+@pytest.fixture
+def raw():
+    return pd.read_csv(REFERENCE_CSV)
+
+
+@pytest.fixture
+def source(tmp_path, raw):
+    src = tmp_path / "src"
+    src.mkdir()
+    raw[raw["month"] <= 9].to_csv(src / "a.csv", index=False)
+    raw[raw["month"] > 9].to_csv(src / "b.csv", index=False)
+    return src
+
+
+def labels(raw, months):
+    return sorted(f"{y}-{m:02d}" for y, m in raw[raw["month"].isin(months)][["year", "month"]].drop_duplicates().values)
+
+
+def test_initial_build(tmp_path, source, raw):
+    store = tmp_path / "store"
+    result = refresh.refresh_store(str(source), str(store))
+    assert result["changed"] == labels(raw, range(1, 13))
+    assert result["removed"] == []
+    assert len(read_store(str(store))) == len(raw)
+    cube = refresh.read_aggregates(str(store), "cube")
+    assert cube["jumlah_penumpang"].sum() == raw["jumlah_penumpang"].sum()
+
+
+def test_noop_refresh_hashes_nothing(tmp_path, source, monkeypatch):
+    store = tmp_path / "store"
+    first = refresh.refresh_store(str(source), str(store))
+
+    def no_hash(path):
+        raise AssertionError(f"berkas di-hash ulang: {path}")
+
+    monkeypatch.setattr(refresh, "file_digest", no_hash)
+    again = refresh.refresh_store(str(source), str(store))
+    assert again["changed"] == again["removed"] == []
+    assert again["version"] == first["version"]
+    assert again["refreshed_at"] == first["refreshed_at"]
+
+
+def test_one_changed_month(tmp_path, source, raw):
+    store = tmp_path / "store"
+    first = refresh.refresh_store(str(source), str(store))
+    b = raw[raw["month"] > 9].copy()
+    b.loc[b["month"] == 11, "jumlah_penumpang"] += 1
+    b.to_csv(source / "b.csv", index=False)
+
+    result = refresh.refresh_store(str(source), str(store))
+    assert result["changed"] == labels(raw, [11])
+    assert result["removed"] == []
+    assert result["version"] != first["version"]
+    cube = refresh.read_aggregates(str(store), "cube")
+    assert cube["jumlah_penumpang"].sum() == raw["jumlah_penumpang"].sum() + (b["month"] == 11).sum()
+
+
+def test_removed_file(tmp_path, source, raw):
+    store = tmp_path / "store"
+    refresh.refresh_store(str(source), str(store))
+    os.remove(source / "b.csv")
+
+    result = refresh.refresh_store(str(source), str(store))
+    assert result["changed"] == []
+    assert result["removed"] == labels(raw, [10, 11, 12])
+    assert len(read_store(str(store))) == (raw["month"] <= 9).sum()
+    for label in result["removed"]:
+        assert not os.path.exists(refresh.agg_path(str(store), "cube", label))
+
+
+def test_ingest_cli_store_is_kept_by_refresh(tmp_path, source, raw, monkeypatch, capsys):
+    store = tmp_path / "store"
+    ingest.main([str(source), "--store", str(store)])
+    assert "2 CSV" in capsys.readouterr().out
+    manifest = refresh.read_manifest(str(store))
+    assert manifest["schema_version"] == SCHEMA_VERSION
+    assert refresh.read_aggregates(str(store), "cube")["jumlah_penumpang"].sum() == raw["jumlah_penumpang"].sum()
+
+    monkeypatch.setattr(refresh, "_reset_store", lambda path: pytest.fail("store hasil ingest direset"))
+    again = refresh.refresh_store(str(source), str(store))
+    assert again["changed"] == again["removed"] == []
+    assert again["version"] == manifest["version"]
+
+
+def test_rebuild_reingests_everything(tmp_path, source, raw):
+    store = tmp_path / "store"
+    refresh.refresh_store(str(source), str(store))
+    result = refresh.refresh_store(str(source), str(store), rebuild=True)
+    assert result["changed"] == labels(raw, range(1, 13))
+    assert len(read_store(str(store))) == len(raw)
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import REFERENCE_CSV
+from transjakarta import refresh
+from transjakarta.ingest import read_store
+from transjakarta.registry import Registry
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    raw = pd.read_csv(REFERENCE_CSV)
+    src = tmp_path_factory.mktemp("src")
+    raw[raw["month"] <= 6].to_csv(src / "a.csv", index=False)
+    raw[raw["month"] > 6].to_csv(src / "b.csv", index=False)
+    store = tmp_path_factory.mktemp("store")
+    refresh.refresh_store(str(src), str(store))
+    return str(store)
+
+
+def names(registry, col, codes):
+    table = registry.routes["trayek"] if col == "trayek" else registry.stops["halte"]
+    return [table.iloc[c] if c >= 0 else None for c in codes]
+
+
+def test_round_trip_store_aggregates(store):
+    df = read_store(store)
+    registry = Registry.from_frame(df)
+    cube = refresh.read_aggregates(store, "cube")
+    encoded = registry.encode(cube)
+    for col in ("trayek", "halte_awal", "halte_tujuan"):
+        codes = encoded[col].cat.codes.to_numpy()
+        assert (codes >= 0).all()
+        assert names(registry, col, codes) == cube[col].astype(str).tolist()
+    # kode hasil encode = kode kategori frame untuk nama yang sama
+    assert encoded["trayek"].cat.categories.equals(df["trayek"].cat.categories)
+    assert encoded["halte_awal"].cat.categories.equals(df["halte_awal"].cat.categories)
+
+
+def test_frame_codes_are_ids(store):
+    df = read_store(store)
+    registry = Registry.from_frame(df)
+    assert registry.route_names == df["trayek"].cat.categories.astype(str).tolist()
+    codes = df["halte_tujuan"].cat.codes.to_numpy()
+    assert names(registry, "halte_tujuan", codes[:50]) == df["halte_tujuan"].astype(str).tolist()[:50]
+    assert np.isfinite(registry.stops[["lat", "lon"]].to_numpy()).all()
+
+
+def test_encode_rejects_unknown_names(store):
+    registry = Registry.from_frame(read_store(store))
+    stale = pd.DataFrame({"trayek": [registry.route_names[0], "Trayek Baru"], "jumlah_penumpang": [1, 2]})
+    with pytest.raises(ValueError, match="Trayek Baru"):
+        registry.encode(stale)
+
+
+def test_encode_keeps_missing_values(store):
+    registry = Registry.from_frame(read_store(store))
+    frame = pd.DataFrame({"trayek": [registry.route_names[0], None]})
+    assert registry.encode(frame)["trayek"].cat.codes.tolist() == [0, -1]
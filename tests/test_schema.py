@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import REFERENCE_CSV
+from transjakarta.ingest import iter_clean_chunks
+from transjakarta.schema import (
+    CATEGORY_COLS,
+    FLOAT32_COLS,
+    FLOAT32_TOLERANCE,
+    INT_DTYPES,
+    apply_schema,
+    category_mask,
+)
+
+
+def raw_frame(**overrides):
+    data = {
+        "jenis": ["BRT", "BRT", "Mikrotrans"],
+        "trayek": ["1", "2", "1"],
+        "halte_awal": ["A", "B", "C"],
+        "halte_tujuan": ["B", "D", "A"],
+        "year": [2021, 2021, 2022],
+        "month": [1, 7, 12],
+        "jumlah_penumpang": [10, 2_000_000, 0],
+        "latitude_awal": [-6.2, -6.21, -6.3],
+        "distance_km": [1.5, 2.25, 0.0],
+    }
+    data.update(overrides)
+    return pd.DataFrame(data)
+
+
+def test_target_dtypes():
+    out = apply_schema(raw_frame())
+    for col in ("jenis", "trayek", "halte_awal", "halte_tujuan"):
+        assert isinstance(out[col].dtype, pd.CategoricalDtype)
+    for col, dtype in INT_DTYPES.items():
+        assert out[col].dtype == dtype
+    assert out["latitude_awal"].dtype == np.float32
+    assert out["distance_km"].dtype == np.float32
+
+
+def test_values_preserved():
+    raw = raw_frame()
+    out = apply_schema(raw)
+    for col in ("jenis", "trayek", "halte_awal", "halte_tujuan"):
+        assert out[col].astype(str).tolist() == raw[col].tolist()
+    for col in INT_DTYPES:
+        assert out[col].astype(np.int64).tolist() == raw[col].tolist()
+    for col in ("latitude_awal", "distance_km"):
+        np.testing.assert_allclose(out[col].astype(np.float64), raw[col], rtol=0, atol=FLOAT32_TOLERANCE)
+
+
+def test_stop_columns_share_categories():
+    out = apply_schema(raw_frame())
+    assert out["halte_awal"].cat.categories.equals(out["halte_tujuan"].cat.categories)
+    assert list(out["halte_awal"].cat.categories) == ["A", "B", "C", "D"]
+    # kode sama = halte sama
+    assert out["halte_awal"].cat.codes[0] == out["halte_tujuan"].cat.codes[2]
+
+
+def test_int_overflow_keeps_dtype():
+    out = apply_schema(raw_frame(year=[2021, 40_000, 2022], jumlah_penumpang=[1, 2**31, 3]))
+    assert out["year"].dtype == np.int64
+    assert out["jumlah_penumpang"].dtype == np.int64
+    assert out["month"].dtype == "int8"
+
+
+def test_float32_tolerance_boundary():
+    # 123456.789 di float32 meleset ~4e-3: di atas toleransi, kolom tetap float64
+    out = apply_schema(raw_frame(distance_km=[123456.789, 1.0, 2.0], latitude_awal=[-6.2, np.nan, -6.3]))
+    assert out["distance_km"].dtype == np.float64
+    assert out["distance_km"][0] == 123456.789
+    # NaN tidak dihitung sebagai galat
+    assert out["latitude_awal"].dtype == np.float32
+    assert np.isnan(out["latitude_awal"][1])
+
+
+def test_idempotent():
+    once = apply_schema(raw_frame())
+    pd.testing.assert_frame_equal(apply_schema(once), once)
+
+
+def test_category_mask_matches_isin():
+    raw = raw_frame()
+    out = apply_schema(raw)
+    for wanted in (["1"], ["2", "tidak-ada"], []):
+        assert category_mask(out["trayek"], wanted).tolist() == raw["trayek"].isin(wanted).tolist()
+
+
+def test_reference_csv_within_tolerance():
+    clean = pd.concat(list(iter_clean_chunks(REFERENCE_CSV)), ignore_index=True)
+    out = apply_schema(clean)
+    for col in CATEGORY_COLS:
+        if col in out.columns:
+            assert isinstance(out[col].dtype, pd.CategoricalDtype)
+    for col in FLOAT32_COLS:
+        assert out[col].dtype == np.float32
+        np.testing.assert_allclose(
+            out[col].to_numpy(dtype=np.float64), clean[col].to_numpy(dtype=np.float64), rtol=0, atol=FLOAT32_TOLERANCE
+        )
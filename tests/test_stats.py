@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from transjakarta import stats
+
+
+@pytest.fixture
+def xy():
+    rng = np.random.default_rng(1)
+    x = rng.gamma(2.0, 5.0, 500)
+    y = np.rint(300 * x + rng.normal(0, 2000, 500)).clip(0)
+    # nilai seri agar peringkat rata-rata ikut teruji
+    x[::7] = x[0]
+    return x, y
+
+
+def test_pearson_matches_corrcoef(xy):
+    x, y = xy
+    assert stats.pearson(x, y) == pytest.approx(np.corrcoef(x, y)[0, 1], abs=1e-12)
+
+
+def test_pearson_constant_is_nan():
+    assert np.isnan(stats.pearson([1.0, 1.0, 1.0], [1.0, 2.0, 3.0]))
+
+
+def test_rankdata_average_ties():
+    np.testing.assert_array_equal(stats.rankdata([10, 20, 10, 30, 20, 10]), [2, 4.5, 2, 6, 4.5, 2])
+
+
+def test_against_scipy(xy):
+    sp = pytest.importorskip("scipy.stats")
+    x, y = xy
+    np.testing.assert_allclose(stats.rankdata(x), sp.rankdata(x))
+    assert stats.spearman(x, y) == pytest.approx(sp.spearmanr(x, y).statistic, abs=1e-12)
+    ref = sp.linregress(x, y)
+    slope, intercept, r2 = stats.linear_fit(x, y)
+    assert slope == pytest.approx(ref.slope, rel=1e-10)
+    assert intercept == pytest.approx(ref.intercept, rel=1e-10)
+    assert r2 == pytest.approx(ref.rvalue**2, rel=1e-10)
+
+
+def test_linear_fit_exact_line():
+    slope, intercept, r2 = stats.linear_fit([0, 1, 2, 3], [1, 3, 5, 7])
+    assert (slope, intercept, r2) == pytest.approx((2.0, 1.0, 1.0))
+
+
+def test_resampling_summary_deterministic(xy):
+    x, y = xy
+    a = stats.resampling_summary(x, y, n_resamples=200, time_budget_s=60, seed=3)
+    b = stats.resampling_summary(x, y, n_resamples=200, time_budget_s=60, seed=3)
+    assert a == b
+    assert a["n_bootstrap"] == a["n_permutation"] == 200
+    assert not a["truncated"]
+    r = a["r"]
+    assert r["estimate"] == pytest.approx(stats.pearson(x, y))
+    assert r["ci_low"] <= r["estimate"] <= r["ci_high"]
+    # hubungan kuat: tidak ada permutasi yang seekstrem data asli
+    assert r["p_value"] == pytest.approx(1 / 201)
+
+
+def test_resampling_summary_budget_truncates(xy):
+    x, y = xy
+    result = stats.resampling_summary(x, y, n_resamples=10**7, time_budget_s=0.0)
+    assert result["truncated"]
+    # batch pertama selalu selesai, baik bootstrap maupun permutasi, tapi tidak
+    # lebih besar dari anggaran elemen batch
+    for key in ("n_bootstrap", "n_permutation"):
+        assert 0 < result[key] <= stats.MAX_BATCH_ELEMENTS // len(x)
+
+
+def test_resampling_summary_subsamples_large_input():
+    rng = np.random.default_rng(2)
+    x = rng.normal(size=5000)
+    y = 2 * x + rng.normal(size=5000)
+    result = stats.resampling_summary(x, y, n_resamples=50, time_budget_s=60, max_rows=1000)
+    assert (result["n"], result["n_sample"]) == (5000, 1000)
+    assert result == stats.resampling_summary(x, y, n_resamples=50, time_budget_s=60, max_rows=1000)
+    assert result["r"]["ci_low"] <= stats.pearson(x, y) <= result["r"]["ci_high"]
+
+
+def test_batch_never_grows_with_data():
+    for n in (10, stats.MAX_SAMPLE_ROWS, 10 * stats.MAX_SAMPLE_ROWS):
+        rows = min(n, stats.MAX_SAMPLE_ROWS)
+        assert stats._batch_size(rows, 10**6) * rows <= stats.MAX_BATCH_ELEMENTS
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from transjakarta.timeindex import date_bounds, date_slice, sort_by_date
+
+
+@pytest.fixture
+def frame():
+    dates = pd.to_datetime(["2021-01-01", "2021-01-01", "2021-02-01", "2021-03-01", "2021-03-01", "2021-04-01"])
+    return pd.DataFrame({"date": dates, "v": np.arange(6)})
+
+
+def mask_filter(df, start, end):
+    return df[(df["date"] >= pd.Timestamp(start)) & (df["date"] <= pd.Timestamp(end))]
+
+
+@pytest.mark.parametrize(
+    "start,end",
+    [
+        ("2021-01-01", "2021-03-01"),  # kedua batas inklusif, termasuk duplikat
+        ("2021-01-15", "2021-02-15"),  # batas di antara tanggal data
+        ("2021-03-01", "2021-03-01"),  # satu tanggal
+        ("2020-01-01", "2022-01-01"),  # melampaui data di kedua sisi
+        ("2020-01-01", "2020-06-01"),  # seluruhnya sebelum data
+        ("2022-01-01", "2022-06-01"),  # seluruhnya sesudah data
+        ("2021-03-01", "2021-01-01"),  # start > end
+    ],
+)
+def test_date_slice_matches_mask(frame, start, end):
+    pd.testing.assert_frame_equal(date_slice(frame, start, end), mask_filter(frame, start, end))
+
+
+def test_inclusive_end_bound(frame):
+    assert date_slice(frame, "2021-02-01", "2021-03-01")["v"].tolist() == [2, 3, 4]
+
+
+def test_start_after_end_is_empty(frame):
+    assert date_bounds(frame["date"], "2021-04-01", "2021-01-01") == (5, 5)
+
+
+def test_open_bounds(frame):
+    assert date_bounds(frame["date"]) == (0, 6)
+    assert date_slice(frame, None, "2021-01-31")["v"].tolist() == [0, 1]
+    assert date_slice(frame, "2021-03-15", None)["v"].tolist() == [5]
+    assert date_bounds(np.array([], dtype="datetime64[ns]"), "2021-01-01", "2021-02-01") == (0, 0)
+
+
+def test_unsorted_input_is_rejected(frame):
+    shuffled = frame.iloc[[3, 0, 5, 1, 2, 4]]
+    with pytest.raises(ValueError, match="terurut"):
+        date_slice(shuffled, "2021-01-01", "2021-02-01")
+    fixed = sort_by_date(shuffled)
+    assert fixed["date"].is_monotonic_increasing
+    assert date_slice(fixed, "2021-01-01", "2021-02-01")["v"].tolist() == [0, 1, 2]
+
+
+def test_sort_by_date_is_noop_when_sorted(frame):
+    assert sort_by_date(frame) is frame
@@ -0,0 +1 @@
+"""Utilitas data & analitik untuk Dashboard TransJakarta."""
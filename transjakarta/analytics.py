@@ -0,0 +1,384 @@
+"""Inti analitik headless (tanpa Streamlit) dengan skema hasil yang stabil.
+
+Semua analitik dashboard tersedia sebagai fungsi murni di atas data bersih
+(frame, ``AggregateCube``, ``HeatBins``), sehingga bisa diprofilkan, dipakai
+di job batch, atau disajikan ke konsumen lain. Dashboard hanya memanggil
+fungsi-fungsi ini lalu menggambar hasilnya.
+
+Skema hasil (``RESULT_SCHEMA_VERSION``):
+
+- ``monthly_trend``   -> DataFrame ``date, jumlah_penumpang, rolling_3m``
+- ``top_routes``      -> DataFrame ``trayek, jumlah_penumpang, share`` (share dalam %)
+- ``top_halte``       -> DataFrame ``Halte, Frekuensi, Tipe`` (Tipe: Awal/Tujuan)
+- ``passenger_distribution`` -> dict ``n, mean, min, q1, median, q3, max``
+- ``box_summary``     -> dict ``n, mean, q1, median, q3, lowerfence, upperfence, outliers, n_outliers``
+- ``scatter_payload`` -> dict ``mode`` ("points": ``x, y``; "density": ``x, y, z, n``)
+- ``distance_correlation``   -> dict ``n, r, rho, slope, intercept, r2, resampling``
+- ``hotspot_grid``    -> DataFrame ``grid_lat, grid_lon, lat, lon, weight, n``
+- ``map_summary``     -> dict ``n_halte_awal, n_halte_tujuan, top_density, density_level``
+
+CLI (laporan JSON)::
+
+    python -m transjakarta.analytics df_final.csv --start 2021-03 --end 2021-05
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from transjakarta.cube import MEASURE, AggregateCube
+from transjakarta.geo import MAX_ROUTE_KM, bbox_mask, frame_distance_km
+from transjakarta.heatgrid import GRID_DEG, HeatBins
+from transjakarta.kpi import compute_kpis
+from transjakarta.schema import category_mask
+from transjakarta.stats import correlation_summary, resampling_summary
+from transjakarta.timeindex import date_slice
+
+RESULT_SCHEMA_VERSION = 1
+TOP_N = 10
+ROLLING_WINDOW = 3
+
+# anggaran titik per grafik yang dikirim ke browser; di atasnya scatter
+# diringkas menjadi kepadatan 2D (DENSITY_BINS × DENSITY_BINS sel)
+MAX_POINTS = 5000
+DENSITY_BINS = 60
+# panjang whisker box plot (× IQR), sama dengan bawaan Plotly
+WHISKER_IQR = 1.5
+# ambang kategori kepadatan hotspot (jumlah titik pada sel terpadat)
+DENSITY_LEVELS = [(800, "sangat tinggi"), (400, "tinggi"), (150, "moderat")]
+
+
+# --- Data -----------------------------------------------------------------------
+
+def load_frame(source: str) -> pd.DataFrame:
+    """Data bersih dari satu CSV (cache Parquet) atau dari store terpartisi
+    ``source`` (direktori/glob; store disegarkan lewat ``refresh_store``)."""
+    from transjakarta.ingest import default_store_dir, load_csv, read_store
+    from transjakarta.store import load_cached
+
+    if os.path.isfile(source):
+        return load_cached(source, load_csv)
+    return read_store(default_store_dir(source))
+
+
+def load_cube(source: str, df: pd.DataFrame, registry) -> AggregateCube:
+    """Kubus agregat: dibangun dari ``df`` untuk CSV, atau gabungan kubus per
+    partisi store yang dikodekan ulang dengan kamus ``registry``."""
+    from transjakarta.ingest import default_store_dir
+    from transjakarta.refresh import read_aggregates
+
+    if os.path.isfile(source):
+        return AggregateCube.from_frame(df)
+    return AggregateCube(registry.encode(read_aggregates(default_store_dir(source), "cube")))
+
+
+def load_heat_bins(source: str, df: pd.DataFrame, registry, cell_deg: float = GRID_DEG) -> HeatBins:
+    """Bin heatmap, dengan sumber seperti ``load_cube``."""
+    from transjakarta.ingest import default_store_dir
+    from transjakarta.refresh import read_aggregates
+
+    if os.path.isfile(source):
+        return HeatBins.from_frame(df, cell_deg=cell_deg)
+    return HeatBins(registry.encode(read_aggregates(default_store_dir(source), "heat")), cell_deg=cell_deg)
+
+
+def load_dataset(source: str, cell_deg: float = GRID_DEG) -> dict:
+    """Muat data bersih + struktur turunannya tanpa Streamlit.
+
+    Mengembalikan ``{"df", "registry", "cube", "heat", "summary"}``. ``source``
+    berupa satu CSV (cache Parquet) atau direktori/glob (store terpartisi yang
+    disegarkan inkremental).
+    """
+    from transjakarta.ingest import default_store_dir
+    from transjakarta.refresh import refresh_store
+    from transjakarta.registry import Registry
+    from transjakarta.summary import DatasetSummary
+
+    if not os.path.isfile(source):
+        refresh_store(source, default_store_dir(source), cell_deg=cell_deg)
+    df = load_frame(source)
+    registry = Registry.from_frame(df)
+    cube = load_cube(source, df, registry)
+    return {
+        "df": df,
+        "registry": registry,
+        "cube": cube,
+        "heat": load_heat_bins(source, df, registry, cell_deg),
+        "summary": DatasetSummary.from_frame(df, cube),
+    }
+
+
+def filter_data(df: pd.DataFrame, cube: AggregateCube, heat: HeatBins, start=None, end=None, trayek=None):
+    """``(baris, kubus, bin heatmap, kpi)`` untuk rentang [start, end] dan daftar trayek."""
+    rows = date_slice(df, start, end)
+    if trayek:
+        rows = rows[category_mask(rows["trayek"], trayek)]
+    cube_q = cube.query(start, end, trayek)
+    return rows, cube_q, heat.query(start, end, trayek), compute_kpis(cube_q, rows[MEASURE].to_numpy())
+
+
+# --- Tren & distribusi -------------------------------------------------------------
+
+def rolling_trend(monthly: pd.DataFrame, window: int = ROLLING_WINDOW) -> pd.DataFrame:
+    """Tambahkan rata-rata bergulir ``rolling_3m`` ke tabel bulanan (salinan)."""
+    trend = monthly[["date", MEASURE]].copy()
+    trend["rolling_3m"] = trend[MEASURE].rolling(window, min_periods=1).mean()
+    return trend
+
+
+def monthly_trend(cube: AggregateCube, window: int = ROLLING_WINDOW) -> pd.DataFrame:
+    return rolling_trend(cube.monthly(), window)
+
+
+def trend_growth(trend: pd.DataFrame) -> float | None:
+    """Perubahan (%) bulan terakhir terhadap bulan pertama; None bila < 2 bulan."""
+    if len(trend) < 2:
+        return None
+    first, last = trend[MEASURE].iloc[0], trend[MEASURE].iloc[-1]
+    return float((last - first) / max(1, first) * 100)
+
+
+def passenger_distribution(df: pd.DataFrame) -> dict:
+    values = df[MEASURE].to_numpy(dtype=np.float64)
+    if not len(values):
+        return {k: np.nan for k in ("n", "mean", "min", "q1", "median", "q3", "max")} | {"n": 0}
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    return {
+        "n": int(len(values)),
+        "mean": float(values.mean()),
+        "min": float(values.min()),
+        "q1": float(q1),
+        "median": float(median),
+        "q3": float(q3),
+        "max": float(values.max()),
+    }
+
+
+def thin_sorted(values: np.ndarray, max_points: int = MAX_POINTS) -> np.ndarray:
+    """Paling banyak ``max_points`` nilai berjarak rata dari array terurut
+    (nilai minimum & maksimum selalu ikut)."""
+    if len(values) <= max_points:
+        return values
+    return values[np.unique(np.linspace(0, len(values) - 1, max_points).round().astype(np.int64))]
+
+
+def box_summary(values, max_points: int = MAX_POINTS, whisker: float = WHISKER_IQR) -> dict:
+    """Statistik box plot dihitung di server: kuartil, pagar Tukey (titik data
+    terjauh dalam ``whisker`` × IQR), dan pencilan (dijarangkan ke ``max_points``)."""
+    x = np.asarray(values, dtype=np.float64)
+    x = x[np.isfinite(x)]
+    if not len(x):
+        return {k: np.nan for k in ("mean", "q1", "median", "q3", "lowerfence", "upperfence")} | {
+            "n": 0, "outliers": np.empty(0), "n_outliers": 0,
+        }
+    q1, median, q3 = np.quantile(x, [0.25, 0.5, 0.75])
+    low, high = q1 - whisker * (q3 - q1), q3 + whisker * (q3 - q1)
+    inside = (x >= low) & (x <= high)
+    outliers = np.sort(x[~inside])
+    return {
+        "n": int(len(x)),
+        "mean": float(x.mean()),
+        "q1": float(q1),
+        "median": float(median),
+        "q3": float(q3),
+        "lowerfence": float(x[inside].min()),
+        "upperfence": float(x[inside].max()),
+        "outliers": thin_sorted(outliers, max_points),
+        "n_outliers": int(len(outliers)),
+    }
+
+
+def scatter_payload(x, y, max_points: int = MAX_POINTS, bins: int = DENSITY_BINS) -> dict:
+    """Titik apa adanya bila jumlahnya ≤ ``max_points``; selain itu histogram
+    2D (pusat sel + jumlah titik, sel kosong NaN) agar ukuran figur tetap."""
+    # dtype asli (float32/int32 skema ringkas) dipertahankan: array numerik
+    # dikodekan biner oleh Plotly, jadi lebar dtype = ukuran payload
+    x, y = np.asarray(x), np.asarray(y)
+    if len(x) <= max_points:
+        return {"mode": "points", "x": x, "y": y}
+    counts, x_edges, y_edges = np.histogram2d(x.astype(np.float64), y.astype(np.float64), bins=bins)
+    z = counts.T  # baris = sel y
+    z[z == 0] = np.nan
+    return {
+        "mode": "density",
+        "x": (x_edges[:-1] + x_edges[1:]) / 2,
+        "y": (y_edges[:-1] + y_edges[1:]) / 2,
+        "z": z,
+        "n": int(len(x)),
+    }
+
+
+# --- Rute & halte ------------------------------------------------------------------
+
+def top_routes(cube: AggregateCube, n: int = TOP_N) -> pd.DataFrame:
+    """``n`` trayek teratas menurut penumpang dan pangsanya (%) terhadap total kubus."""
+    routes = cube.by_trayek().head(n).copy()
+    routes["share"] = routes[MEASURE] / max(cube.total(), 1) * 100
+    return routes
+
+
+def top_halte(cube: AggregateCube, n: int = TOP_N) -> pd.DataFrame:
+    """Gabungan ``n`` halte awal & tujuan tersibuk; tiap halte muncul sekali
+    dengan frekuensi (dan tipe) tertingginya."""
+    parts = []
+    for col, tipe in (("halte_awal", "Awal"), ("halte_tujuan", "Tujuan")):
+        vc = cube.halte_counts(col).head(n).reset_index()
+        vc.columns = ["Halte", "Frekuensi"]
+        vc["Tipe"] = tipe
+        parts.append(vc)
+    return (
+        pd.concat(parts)
+        .sort_values("Frekuensi", ascending=False)
+        .drop_duplicates(subset="Halte")
+        .head(n)
+    )
+
+
+# --- Korelasi ------------------------------------------------------------------------
+
+def correlation_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Pasangan ``distance_km``/``jumlah_penumpang`` numerik tanpa NaN/inf."""
+    cols = ["distance_km", MEASURE]
+    return df[cols].apply(pd.to_numeric, errors="coerce").replace([np.inf, -np.inf], np.nan).dropna()
+
+
+def distance_correlation(df: pd.DataFrame, n_resamples: int = 0, time_budget_s: float = 1.5,
+                         seed: int = 0) -> dict | None:
+    """Korelasi jarak rute vs penumpang; None bila data valid < 2 baris.
+
+    ``n_resamples`` > 0 menambahkan CI bootstrap & p-value permutasi di kunci
+    ``resampling`` (lihat ``stats.resampling_summary``).
+    """
+    clean = correlation_frame(df)
+    if len(clean) < 2:
+        return None
+    result = correlation_summary(clean["distance_km"], clean[MEASURE])
+    result["resampling"] = (
+        resampling_summary(clean["distance_km"], clean[MEASURE], n_resamples, time_budget_s=time_budget_s, seed=seed)
+        if n_resamples > 0
+        else None
+    )
+    return result
+
+
+def correlation_strength(r: float) -> str:
+    if abs(r) < 0.2:
+        return "hubungan sangat lemah"
+    if abs(r) < 0.4:
+        return "hubungan lemah"
+    if abs(r) < 0.6:
+        return "hubungan sedang"
+    return "hubungan kuat"
+
+
+# --- Spasial -------------------------------------------------------------------------
+
+def map_points(df: pd.DataFrame) -> pd.DataFrame:
+    """Baris dengan koordinat valid di Jabodetabek dan jarak rute ≤ ``MAX_ROUTE_KM``."""
+    geo_ok = df[df["geo_valid"]] if "geo_valid" in df.columns else df[bbox_mask(df)]
+    if geo_ok.empty:
+        return geo_ok
+    jarak = geo_ok["distance_km"] if "distance_km" in geo_ok.columns else frame_distance_km(geo_ok)
+    return geo_ok[np.asarray(jarak) <= MAX_ROUTE_KM]
+
+
+def hotspot_grid(heat: HeatBins, kind: str = "awal") -> pd.DataFrame:
+    """Sel grid (``heat.cell_deg``°) terurut dari yang terpadat."""
+    return heat.cells(kind).sort_values(["n", "weight"], ascending=False, ignore_index=True)
+
+
+def density_level(top_density: int) -> str:
+    for threshold, label in DENSITY_LEVELS:
+        if top_density > threshold:
+            return label
+    return "rendah"
+
+
+def map_summary(geo_ok: pd.DataFrame, heat: HeatBins) -> dict:
+    """Jumlah titik halte unik (nama + koordinat) dan kepadatan hotspot."""
+    n_awal = geo_ok[["halte_awal", "latitude_awal", "longitude_awal"]].dropna().drop_duplicates().shape[0]
+    n_tuju = geo_ok[["halte_tujuan", "latitude_tujuan", "longitude_tujuan"]].dropna().drop_duplicates().shape[0]
+    top_density = heat.top_count("awal")
+    return {
+        "n_halte_awal": int(n_awal),
+        "n_halte_tujuan": int(n_tuju),
+        "top_density": int(top_density),
+        "density_level": density_level(top_density),
+    }
+
+
+# --- Laporan ---------------------------------------------------------------------------
+
+def _jsonable(value):
+    """NaN/inf -> None dan skalar NumPy -> Python, agar keluaran JSON valid."""
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, (np.integer, np.bool_)):
+        return value.item()
+    if isinstance(value, (float, np.floating)):
+        return float(value) if np.isfinite(value) else None
+    return value
+
+
+def _records(frame: pd.DataFrame) -> list:
+    out = frame.copy()
+    for col in out.columns:
+        if pd.api.types.is_datetime64_any_dtype(out[col]):
+            out[col] = out[col].dt.strftime("%Y-%m-%d")
+        elif isinstance(out[col].dtype, pd.CategoricalDtype):
+            out[col] = out[col].astype(str)
+    return out.to_dict(orient="records")
+
+
+def report(dataset: dict, start=None, end=None, trayek=None, n_resamples: int = 0) -> dict:
+    """Seluruh analitik untuk satu status filter sebagai dict siap-JSON."""
+    rows, cube, heat, kpis = filter_data(dataset["df"], dataset["cube"], dataset["heat"], start, end, trayek)
+    geo_ok = map_points(rows)
+    kpi_out = {k: v for k, v in kpis.items() if k != "monthly"}
+    for k in ("peak_date", "low_date"):
+        kpi_out[k] = kpi_out[k].strftime("%Y-%m-%d") if kpi_out[k] is not None else None
+    return _jsonable({
+        "schema_version": RESULT_SCHEMA_VERSION,
+        "filter": {
+            "start": None if start is None else str(pd.Timestamp(start).date()),
+            "end": None if end is None else str(pd.Timestamp(end).date()),
+            "trayek": sorted(trayek or []),
+        },
+        "kpi": kpi_out,
+        "monthly_trend": _records(rolling_trend(kpis["monthly"])),
+        "distribution": passenger_distribution(rows),
+        "top_routes": _records(top_routes(cube)),
+        "top_halte": _records(top_halte(cube)),
+        "correlation": distance_correlation(rows, n_resamples=n_resamples),
+        "hotspots": _records(hotspot_grid(heat).head(TOP_N)),
+        "map": map_summary(geo_ok, heat) if not geo_ok.empty else None,
+    })
+
+
+def main(argv=None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Laporan analitik TransJakarta (JSON) tanpa Streamlit.")
+    parser.add_argument("source", help="berkas CSV, direktori, atau pola glob")
+    parser.add_argument("--start", help="tanggal awal (mis. 2021-03)")
+    parser.add_argument("--end", help="tanggal akhir (inklusif)")
+    parser.add_argument("--trayek", action="append", help="filter trayek (boleh berulang)")
+    parser.add_argument("--resamples", type=int, default=0, help="resampel bootstrap/permutasi korelasi")
+    parser.add_argument("--out", help="simpan ke berkas (default: stdout)")
+    args = parser.parse_args(argv)
+
+    result = report(load_dataset(args.source), args.start, args.end, args.trayek, args.resamples)
+    text = json.dumps(result, indent=2, ensure_ascii=False, allow_nan=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
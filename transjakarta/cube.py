@@ -0,0 +1,97 @@
+"""Kubus agregat (bulan × trayek × jenis × halte_awal × halte_tujuan).
+
+Dibangun sekali dari data bersih; seluruh filter sidebar (rentang tanggal +
+trayek) dan ringkasan turunannya (total, bulanan, per trayek, frekuensi halte)
+dijawab lewat roll-up di atas kubus, bukan di atas baris mentah.
+"""
+
+import numpy as np
+import pandas as pd
+
+from transjakarta.schema import category_mask
+from transjakarta.timeindex import date_slice, sort_by_date
+
+CUBE_DIMS = ["date", "trayek", "jenis", "halte_awal", "halte_tujuan"]
+MEASURE = "jumlah_penumpang"
+COUNT = "n_baris"
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """Jumlah penumpang & jumlah baris per kombinasi dimensi."""
+    dims = [c for c in CUBE_DIMS if c in df.columns]
+    if df.empty:
+        return pd.DataFrame(columns=dims + [MEASURE, COUNT])
+    # measure dijumlah dalam int64: kolom sumber bisa int32 (skema ringkas)
+    df = df.assign(**{MEASURE: df[MEASURE].astype(np.int64)})
+    cube = df.groupby(dims, as_index=False, observed=True, dropna=False).agg(
+        **{MEASURE: (MEASURE, "sum"), COUNT: (MEASURE, "size")}
+    )
+    return cube.sort_values("date", ignore_index=True)
+
+
+class AggregateCube:
+    def __init__(self, cube: pd.DataFrame):
+        # terurut menurut tanggal agar query rentang cukup pencarian biner
+        self.cube = sort_by_date(cube) if "date" in cube.columns else cube
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "AggregateCube":
+        return cls(build_cube(df))
+
+    def __len__(self):
+        return len(self.cube)
+
+    @property
+    def empty(self) -> bool:
+        return self.cube.empty
+
+    def query(self, start=None, end=None, trayek=None) -> "AggregateCube":
+        """Sub-kubus untuk rentang tanggal [start, end] dan daftar trayek."""
+        c = date_slice(self.cube, start, end)
+        if trayek:
+            c = c[category_mask(c["trayek"], trayek)]
+        return AggregateCube(c)
+
+    def total(self) -> int:
+        return int(self.cube[MEASURE].sum()) if not self.empty else 0
+
+    def nunique(self, col: str) -> int:
+        return int(self.cube[col].nunique()) if col in self.cube.columns else 0
+
+    def monthly(self) -> pd.DataFrame:
+        """Total penumpang per bulan, terurut naik (kolom: date, jumlah_penumpang)."""
+        if self.empty:
+            return pd.DataFrame(columns=["date", MEASURE])
+        return self.cube.groupby("date", as_index=False)[MEASURE].sum().sort_values("date", ignore_index=True)
+
+    def by_trayek(self) -> pd.DataFrame:
+        """Total penumpang per trayek, terurut turun (kolom: trayek, jumlah_penumpang);
+        nilai seri diurutkan menurut nama, seperti ``idxmax``/``nlargest`` di atas
+        ``groupby`` baris."""
+        if self.empty:
+            return pd.DataFrame(columns=["trayek", MEASURE])
+        totals = self.cube.groupby("trayek", as_index=False, observed=True)[MEASURE].sum()
+        order = np.lexsort((totals["trayek"].astype(str).to_numpy(), -totals[MEASURE].to_numpy()))
+        return totals.iloc[order].reset_index(drop=True)
+
+    def halte_counts(self, col: str) -> pd.Series:
+        """Frekuensi baris per halte (setara ``value_counts``), terurut turun;
+        nilai seri diurutkan alfabetis seperti ``Series.mode``."""
+        if self.empty or col not in self.cube.columns:
+            return pd.Series(dtype="int64", name=COUNT)
+        values = self.cube[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # kode kategori = stop_id: cukup bincount di atas array integer
+            codes = values.cat.codes.to_numpy()
+            ok = codes >= 0
+            weights = self.cube[COUNT].to_numpy(dtype=np.int64)[ok]
+            totals = np.bincount(codes[ok], weights=weights, minlength=len(values.cat.categories))
+            used = totals > 0
+            counts = pd.Series(
+                totals[used].astype(np.int64),
+                index=pd.Index(np.asarray(values.cat.categories)[used], name=col),
+                name=COUNT,
+            )
+            return counts.sort_index().sort_values(ascending=False, kind="stable")
+        counts = self.cube.groupby(col, observed=True)[COUNT].sum()
+        return counts.sort_index().sort_values(ascending=False, kind="stable")
@@ -0,0 +1,90 @@
+"""Ekspor data sesuai permintaan (CSV, CSV gzip, Parquet).
+
+Payload hanya dibuat saat tombol unduh benar-benar diklik. Data ditulis per
+potongan (``chunksize`` baris) langsung ke buffer biner, jadi tidak ada string
+CSV penuh di samping hasilnya. Hasil akhirnya tetap ``bytes`` di memori karena
+``st.download_button`` hanya menerima ``bytes``/``str`` dari callable dan
+membaca seluruh payload sekaligus.
+"""
+
+import gzip
+import io
+
+import pandas as pd
+
+# format -> (ekstensi berkas, MIME)
+EXPORT_FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "csv.gz": (".csv.gz", "application/gzip"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def _iter_chunks(df: pd.DataFrame, chunksize: int):
+    if df.empty:
+        yield df
+        return
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def _write_csv(df: pd.DataFrame, raw, chunksize: int):
+    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    for i, chunk in enumerate(_iter_chunks(df, chunksize)):
+        chunk.to_csv(text, index=False, header=(i == 0))
+    text.flush()
+    text.detach()
+
+
+def _write_parquet(df: pd.DataFrame, raw, chunksize: int):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in _iter_chunks(df, chunksize):
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(raw, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_export(df: pd.DataFrame, fh, fmt: str = "csv", chunksize: int = DEFAULT_CHUNKSIZE):
+    """Tulis ``df`` ke berkas biner ``fh`` dalam format ``fmt``."""
+    if fmt == "csv":
+        _write_csv(df, fh, chunksize)
+    elif fmt == "csv.gz":
+        with gzip.GzipFile(fileobj=fh, mode="wb", mtime=0) as gz:
+            _write_csv(df, gz, chunksize)
+    elif fmt == "parquet":
+        _write_parquet(df, fh, chunksize)
+    else:
+        raise ValueError(f"Format ekspor '{fmt}' tidak dikenal. Pilih salah satu: {', '.join(EXPORT_FORMATS)}")
+
+
+def export_payload(df: pd.DataFrame, fmt: str = "csv", chunksize: int = DEFAULT_CHUNKSIZE) -> bytes:
+    """Hasil ekspor ``df`` dalam format ``fmt``."""
+    buf = io.BytesIO()
+    write_export(df, buf, fmt, chunksize)
+    return buf.getvalue()
+
+
+def cached_export(cache, key, df: pd.DataFrame, fmt: str = "csv", chunksize: int = DEFAULT_CHUNKSIZE):
+    """Payload ekspor untuk ``key``; disimpan di ``cache`` (``LRUCache`` dengan
+    anggaran byte) bila ukurannya ≤ seperempat anggaran, selain itu dikembalikan
+    tanpa dicache."""
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    data = export_payload(df, fmt, chunksize)
+    if cache.maxbytes is None or len(data) <= cache.maxbytes // 4:
+        cache.put(key, data)
+    return data
@@ -0,0 +1,177 @@
+"""Perhitungan jarak geodesik berbasis array NumPy.
+
+Semua fungsi menerima skalar, list, ``np.ndarray`` maupun ``pd.Series`` dan
+mengembalikan ``np.ndarray`` float64 (km). Nilai NaN pada salah satu koordinat
+menghasilkan NaN hanya pada elemen tersebut. Modul ini juga memuat batas area
+Jabodetabek yang dipakai untuk validasi koordinat peta.
+"""
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# Elipsoid WGS-84 (untuk Vincenty)
+WGS84_A = 6378.137
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+
+
+def _as_radians(*arrays):
+    return [np.radians(np.asarray(a, dtype=np.float64)) for a in arrays]
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Jarak lingkaran besar (bola, R = 6371 km)."""
+    lat1, lon1, lat2, lon2 = _as_radians(lat1, lon1, lat2, lon2)
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def equirectangular_km(lat1, lon1, lat2, lon2):
+    """Aproksimasi proyeksi equirectangular; cepat dan akurat untuk jarak kota."""
+    lat1, lon1, lat2, lon2 = _as_radians(lat1, lon1, lat2, lon2)
+    x = (lon2 - lon1) * np.cos((lat1 + lat2) / 2)
+    y = lat2 - lat1
+    return EARTH_RADIUS_KM * np.hypot(x, y)
+
+
+def vincenty_km(lat1, lon1, lat2, lon2, max_iter: int = 200, tol: float = 1e-12):
+    """Jarak pada elipsoid WGS-84 (rumus invers Vincenty).
+
+    Elemen yang tidak konvergen (titik hampir antipodal) bernilai NaN.
+    """
+    lat1, lon1, lat2, lon2 = _as_radians(lat1, lon1, lat2, lon2)
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(lat1, lon1, lat2, lon2)
+    f = WGS84_F
+
+    L = lon2 - lon1
+    U1 = np.arctan((1 - f) * np.tan(lat1))
+    U2 = np.arctan((1 - f) * np.tan(lat2))
+    sinU1, cosU1 = np.sin(U1), np.cos(U1)
+    sinU2, cosU2 = np.sin(U2), np.cos(U2)
+
+    lam = L.copy()
+    converged = np.zeros(L.shape, dtype=bool)
+    sin_sigma = cos_sigma = sigma = cos2_alpha = cos_2sm = np.zeros(L.shape)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(max_iter):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.sqrt(
+                (cosU2 * sin_lam) ** 2 + (cosU1 * sinU2 - sinU1 * cosU2 * cos_lam) ** 2
+            )
+            cos_sigma = sinU1 * sinU2 + cosU1 * cosU2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            sin_alpha = np.where(sin_sigma == 0, 0.0, cosU1 * cosU2 * sin_lam / sin_sigma)
+            cos2_alpha = 1 - sin_alpha**2
+            # garis ekuator: cos2_alpha = 0
+            cos_2sm = np.where(cos2_alpha == 0, 0.0, cos_sigma - 2 * sinU1 * sinU2 / cos2_alpha)
+            C = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+            lam_prev = lam
+            lam = L + (1 - C) * f * sin_alpha * (
+                sigma + C * sin_sigma * (cos_2sm + C * cos_sigma * (-1 + 2 * cos_2sm**2))
+            )
+            converged = np.abs(lam - lam_prev) <= tol
+            if converged[~np.isnan(lam)].all():
+                break
+
+        u2 = cos2_alpha * (WGS84_A**2 - WGS84_B**2) / WGS84_B**2
+        A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+        B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+        delta_sigma = B * sin_sigma * (
+            cos_2sm
+            + B / 4 * (
+                cos_sigma * (-1 + 2 * cos_2sm**2)
+                - B / 6 * cos_2sm * (-3 + 4 * sin_sigma**2) * (-3 + 4 * cos_2sm**2)
+            )
+        )
+        dist = WGS84_B * A * (sigma - delta_sigma)
+
+    dist = np.where(sin_sigma == 0, 0.0, dist)
+    return np.where(converged, dist, np.nan)
+
+
+DISTANCE_METHODS = {
+    "haversine": haversine_km,
+    "equirectangular": equirectangular_km,
+    "vincenty": vincenty_km,
+}
+
+
+def distance_km(lat1, lon1, lat2, lon2, method: str = "haversine"):
+    """Dispatcher jarak; ``method`` salah satu kunci ``DISTANCE_METHODS``."""
+    try:
+        fn = DISTANCE_METHODS[method]
+    except KeyError:
+        raise ValueError(
+            f"Metode jarak '{method}' tidak dikenal. Pilih salah satu: {', '.join(DISTANCE_METHODS)}"
+        ) from None
+    return fn(lat1, lon1, lat2, lon2)
+
+
+def frame_distance_km(df, method: str = "haversine"):
+    """Jarak halte awal → tujuan untuk seluruh baris ``df`` sekaligus."""
+    return distance_km(
+        df["latitude_awal"].to_numpy(dtype=np.float64, na_value=np.nan),
+        df["longitude_awal"].to_numpy(dtype=np.float64, na_value=np.nan),
+        df["latitude_tujuan"].to_numpy(dtype=np.float64, na_value=np.nan),
+        df["longitude_tujuan"].to_numpy(dtype=np.float64, na_value=np.nan),
+        method=method,
+    )
+
+
+# Batas area Jabodetabek yang dianggap valid untuk peta
+LAT_MIN, LAT_MAX = -7.8, -5.5
+LON_MIN, LON_MAX = 106.3, 107.3
+MAX_ROUTE_KM = 60
+
+
+def in_bbox(lat, lon):
+    """Mask boolean: koordinat berada di dalam kotak Jabodetabek (NaN -> False)."""
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    return (lat >= LAT_MIN) & (lat <= LAT_MAX) & (lon >= LON_MIN) & (lon <= LON_MAX)
+
+
+def bbox_mask(df):
+    """Mask baris dengan koordinat awal & tujuan di dalam kotak Jabodetabek."""
+    return in_bbox(df["latitude_awal"], df["longitude_awal"]) & in_bbox(
+        df["latitude_tujuan"], df["longitude_tujuan"]
+    )
+
+
+def repair_coordinates(df):
+    """Perbaiki pasangan lat/lon yang tertukar dan tandai koordinat mustahil.
+
+    Untuk tiap titik (awal, tujuan): bila (lat, lon) di luar Jabodetabek tetapi
+    (lon, lat) di dalamnya, nilainya ditukar. Koordinat di luar rentang bumi
+    (|lat| > 90, |lon| > 180) diubah menjadi NaN. Kolom ``geo_valid`` bernilai
+    True bila kedua titik berada di Jabodetabek setelah perbaikan.
+
+    Mengembalikan ``(df, laporan)``; laporan berisi jumlah baris per kasus.
+    """
+    df = df.copy()
+    report = {}
+    for end in ("awal", "tujuan"):
+        lat_col, lon_col = f"latitude_{end}", f"longitude_{end}"
+        lat = df[lat_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        lon = df[lon_col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        swapped = ~in_bbox(lat, lon) & in_bbox(lon, lat)
+        lat, lon = np.where(swapped, lon, lat), np.where(swapped, lat, lon)
+
+        with np.errstate(invalid="ignore"):
+            impossible = (np.abs(lat) > 90) | (np.abs(lon) > 180)
+        lat[impossible] = np.nan
+        lon[impossible] = np.nan
+
+        df[lat_col] = lat
+        df[lon_col] = lon
+        report[f"swapped_{end}"] = int(swapped.sum())
+        report[f"impossible_{end}"] = int(impossible.sum())
+
+    df["geo_valid"] = bbox_mask(df)
+    report["invalid_rows"] = int((~df["geo_valid"]).sum())
+    return df, report
@@ -0,0 +1,115 @@
+"""Grid heatmap berbobot yang sudah di-bin per bulan.
+
+Titik halte awal/tujuan diagregasi ke sel grid ``cell_deg`` derajat (default
+0,01° seperti insight hotspot) dengan bobot ``jumlah_penumpang``. Bin disimpan
+per (bulan, trayek, jenis halte) sehingga filter tanggal/trayek hanya berupa
+penjumlahan; ke browser hanya dikirim centroid sel + bobotnya.
+"""
+
+import numpy as np
+import pandas as pd
+
+from transjakarta.geo import MAX_ROUTE_KM, bbox_mask
+from transjakarta.schema import FLOAT32_TOLERANCE, category_mask
+from transjakarta.timeindex import date_slice, sort_by_date
+
+GRID_DEG = 0.01
+KINDS = {
+    "awal": ("latitude_awal", "longitude_awal"),
+    "tujuan": ("latitude_tujuan", "longitude_tujuan"),
+}
+BIN_KEYS = ["date", "trayek", "kind", "grid_lat", "grid_lon"]
+
+
+def grid_index(values, cell_deg: float = GRID_DEG):
+    """Indeks sel (dipotong ke arah nol, seperti ``(lat * 100).astype(int)``).
+
+    Koordinat float32 (skema ringkas) meleset hingga ``FLOAT32_TOLERANCE`` dari
+    nilai desimalnya: -6.12 tersimpan sebagai -6.1199998, sehingga pemotongan
+    biasa menaruhnya di sel sebelah. Nilai dalam toleransi itu dari tepi sel
+    dianggap tepat di tepi sebelum dipotong.
+    """
+    x = np.asarray(values, dtype=np.float64) / cell_deg
+    edge = np.round(x)
+    x = np.where(np.abs(x - edge) <= FLOAT32_TOLERANCE / cell_deg, edge, x)
+    return np.trunc(x).astype(np.int64)
+
+
+def map_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Baris yang layak tampil di peta: koordinat valid & jarak rute wajar."""
+    ok = df[df["geo_valid"].to_numpy()] if "geo_valid" in df.columns else df[bbox_mask(df)]
+    if "distance_km" in ok.columns:
+        ok = ok[ok["distance_km"].to_numpy() <= MAX_ROUTE_KM]
+    return ok
+
+
+def build_heat_bins(df: pd.DataFrame, cell_deg: float = GRID_DEG) -> pd.DataFrame:
+    rows = map_rows(df)
+    weight = rows["jumlah_penumpang"].to_numpy(dtype=np.float64)
+    parts = []
+    for kind, (lat_col, lon_col) in KINDS.items():
+        lat = rows[lat_col].to_numpy(dtype=np.float64)
+        lon = rows[lon_col].to_numpy(dtype=np.float64)
+        parts.append(
+            pd.DataFrame(
+                {
+                    "date": rows["date"].to_numpy(),
+                    # ``.array`` mempertahankan kategori (kode = route_id)
+                    "trayek": rows["trayek"].array,
+                    "kind": kind,
+                    "grid_lat": grid_index(lat, cell_deg),
+                    "grid_lon": grid_index(lon, cell_deg),
+                    "lat_sum": lat,
+                    "lon_sum": lon,
+                    "weight": weight,
+                    "n": 1,
+                }
+            )
+        )
+    points = pd.concat(parts, ignore_index=True)
+    bins = points.groupby(BIN_KEYS, as_index=False, observed=True, sort=False).sum()
+    return sort_by_date(bins)
+
+
+class HeatBins:
+    def __init__(self, bins: pd.DataFrame, cell_deg: float = GRID_DEG):
+        # terurut menurut tanggal agar query rentang cukup pencarian biner
+        self.bins = sort_by_date(bins) if "date" in bins.columns else bins
+        self.cell_deg = cell_deg
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, cell_deg: float = GRID_DEG) -> "HeatBins":
+        return cls(build_heat_bins(df, cell_deg), cell_deg)
+
+    @property
+    def empty(self) -> bool:
+        return self.bins.empty
+
+    def query(self, start=None, end=None, trayek=None) -> "HeatBins":
+        b = date_slice(self.bins, start, end)
+        if trayek:
+            b = b[category_mask(b["trayek"], trayek)]
+        return HeatBins(b, self.cell_deg)
+
+    def cells(self, kind: str) -> pd.DataFrame:
+        """Roll-up per sel: centroid titik (lat, lon), bobot penumpang, jumlah titik."""
+        b = self.bins[self.bins["kind"] == kind]
+        g = b.groupby(["grid_lat", "grid_lon"], as_index=False)[["lat_sum", "lon_sum", "weight", "n"]].sum()
+        g["lat"] = g["lat_sum"] / g["n"]
+        g["lon"] = g["lon_sum"] / g["n"]
+        return g[["grid_lat", "grid_lon", "lat", "lon", "weight", "n"]]
+
+    def heat_points(self, kind: str) -> list:
+        """``[[lat, lon, bobot]]`` untuk ``folium.plugins.HeatMap``; bobot
+        dinormalisasi ke 0..1 (skala ``max`` default leaflet.heat)."""
+        c = self.cells(kind)
+        if c.empty:
+            return []
+        w = c["weight"].to_numpy(dtype=np.float64)
+        w = w / w.max() if w.max() > 0 else np.ones_like(w)
+        return np.column_stack([c["lat"].round(6), c["lon"].round(6), w.round(4)]).tolist()
+
+    def top_count(self, kind: str = "awal") -> int:
+        """Jumlah titik pada sel terpadat (dasar kategori kepadatan hotspot)."""
+        c = self.cells(kind)
+        return int(c["n"].max()) if not c.empty else 0
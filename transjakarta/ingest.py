@@ -0,0 +1,212 @@
+"""Ingest CSV ridership (satu berkas, direktori, atau glob) secara streaming.
+
+Setiap berkas dibaca per potongan (``chunksize`` baris) dengan dtype kolom
+teks yang eksplisit, lalu tiap potongan melewati tahap pembersihan yang sama
+(``clean_chunk``). Hasilnya ditulis ke store Parquet yang dipartisi per
+tahun/bulan::
+
+    <store>/year=2021/month=07/<id-berkas>-00000.parquet
+
+sehingga memori puncak hanya sebesar satu potongan, berapa pun jumlah tahun
+yang dimuat.
+"""
+
+import glob
+import hashlib
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from transjakarta.geo import frame_distance_km, repair_coordinates
+from transjakarta.schema import apply_schema
+from transjakarta.store import cache_dir_for, write_parquet_atomic
+from transjakarta.timeindex import sort_by_date
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNKSIZE = 250_000
+
+TEXT_COLS = ["jenis", "kode_trayek", "trayek", "halte_awal", "halte_tujuan"]
+GEO_COLS = ["latitude_awal", "longitude_awal", "latitude_tujuan", "longitude_tujuan"]
+
+# kolom numerik sengaja tidak diberi dtype saat parsing: nilai kotor dikoersi
+# menjadi NaN di ``clean_chunk`` alih-alih menggagalkan seluruh berkas
+CSV_DTYPES = {c: "string" for c in TEXT_COLS}
+
+
+def clean_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """Tahap pembersihan: koersi penumpang, kolom ``date`` dari year/month,
+    koersi & QA koordinat, lalu jarak rute."""
+    df["jumlah_penumpang"] = pd.to_numeric(df["jumlah_penumpang"], errors="coerce").fillna(0).astype(int)
+
+    if "date" not in df.columns:
+        if {"year", "month"}.issubset(df.columns):
+            df["date"] = pd.to_datetime(
+                dict(
+                    year=pd.to_numeric(df["year"], errors="coerce").fillna(0).astype(int),
+                    month=pd.to_numeric(df["month"], errors="coerce").fillna(1).astype(int),
+                    day=1,
+                ),
+                errors="coerce",
+            )
+
+    for c in GEO_COLS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+
+    # QA koordinat: tukar lat/lon yang terbalik, tandai yang tidak valid (geo_valid)
+    if set(GEO_COLS).issubset(df.columns):
+        df, geo_report = repair_coordinates(df)
+        # perbaikan mengubah data sumber: catat di INFO bila ada baris yang tersentuh
+        changed = any(geo_report[k] for k in geo_report if k != "invalid_rows")
+        logger.log(logging.INFO if changed else logging.DEBUG, "QA koordinat: %s", geo_report)
+
+    if "distance_km" not in df.columns and set(GEO_COLS).issubset(df.columns):
+        df["distance_km"] = frame_distance_km(df)
+
+    if "date" not in df.columns:
+        raise ValueError("Kolom 'date' / ('year','month') tidak ditemukan di dataset.")
+
+    df = df.dropna(subset=["date"])
+    df["date"] = pd.to_datetime(df["date"])
+    return df
+
+
+def resolve_sources(source: str) -> list:
+    """Daftar berkas CSV dari path berkas, direktori, atau pola glob."""
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, "**", "*.csv"), recursive=True)
+    elif glob.has_magic(source):
+        paths = glob.glob(source, recursive=True)
+    else:
+        if not os.path.exists(source):
+            raise FileNotFoundError(source)
+        paths = [source]
+    if not paths:
+        raise FileNotFoundError(f"Tidak ada berkas CSV untuk '{source}'.")
+    return sorted(paths)
+
+
+def iter_clean_chunks(path: str, chunksize: int = DEFAULT_CHUNKSIZE):
+    """Potongan ``DataFrame`` bersih dari satu berkas CSV."""
+    reader = pd.read_csv(path, dtype=CSV_DTYPES, chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            yield clean_chunk(chunk)
+
+
+def load_csv(path: str, chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
+    """Satu berkas CSV, dibersihkan per potongan lalu digabung (skema ringkas,
+    terurut menurut tanggal)."""
+    df = pd.concat(list(iter_clean_chunks(path, chunksize)), ignore_index=True)
+    return apply_schema(sort_by_date(df))
+
+
+def default_store_dir(source: str) -> str:
+    """Direktori store untuk ``source`` di dalam direktori cache."""
+    tag = hashlib.sha1(os.path.abspath(source).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cache_dir_for(source), f"store-{tag}")
+
+
+def source_id(path: str) -> str:
+    """Prefiks nama berkas partisi: nama berkas + hash path (unik per sumber)."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    tag = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:8]
+    return f"{stem}-{tag}"
+
+
+def remove_source_parts(store_dir: str, path: str) -> int:
+    """Hapus berkas partisi lama milik satu sumber; kembalikan jumlahnya."""
+    old = glob.glob(os.path.join(store_dir, "year=*", "month=*", f"{glob.escape(source_id(path))}-*.parquet"))
+    for f in old:
+        os.remove(f)
+    return len(old)
+
+
+def partition_dir(store_dir: str, year: int, month: int) -> str:
+    return os.path.join(store_dir, f"year={year:04d}", f"month={month:02d}")
+
+
+def split_partitions(df: pd.DataFrame):
+    """``((year, month), potongan)`` untuk tiap bulan yang ada di ``df``."""
+    dates = df["date"]
+    keys = dates.dt.year.to_numpy() * 100 + dates.dt.month.to_numpy()
+    for key in np.unique(keys):
+        yield (int(key // 100), int(key % 100)), df[keys == key]
+
+
+def ingest(source: str, store_dir: str, chunksize: int = DEFAULT_CHUNKSIZE) -> dict:
+    """Bersihkan seluruh berkas ``source`` ke store Parquet terpartisi.
+
+    Hanya berkas partisi yang ditulis (tanpa manifest & agregat); store yang
+    dibaca dashboard dibangun lewat ``transjakarta.refresh.refresh_store``.
+    Mengembalikan ``{path_csv: [berkas parquet yang ditulis]}``.
+    """
+    written = {}
+    for path in resolve_sources(source):
+        written[path] = ingest_file(path, store_dir, chunksize)
+    return written
+
+
+def ingest_file(path: str, store_dir: str, chunksize: int = DEFAULT_CHUNKSIZE) -> list:
+    """Bersihkan satu berkas ke store, menggantikan partisi lamanya."""
+    remove_source_parts(store_dir, path)
+    sid = source_id(path)
+    files = []
+    for i, chunk in enumerate(iter_clean_chunks(path, chunksize)):
+        for (year, month), part in split_partitions(chunk):
+            target = os.path.join(partition_dir(store_dir, year, month), f"{sid}-{i:05d}.parquet")
+            write_parquet_atomic(part, target)
+            files.append(target)
+    logger.info("Ingest %s: %d berkas partisi", path, len(files))
+    return files
+
+
+def store_files(store_dir: str, years=None) -> list:
+    """Berkas Parquet di store, opsional dibatasi pada tahun tertentu."""
+    files = sorted(glob.glob(os.path.join(store_dir, "year=*", "month=*", "*.parquet")))
+    if years is not None:
+        wanted = {f"year={int(y):04d}" for y in years}
+        files = [f for f in files if os.path.basename(os.path.dirname(os.path.dirname(f))) in wanted]
+    return files
+
+
+def read_store(store_dir: str, years=None, columns=None) -> pd.DataFrame:
+    """Gabungkan partisi store menjadi satu ``DataFrame`` terurut tanggal.
+
+    Skema ringkas diterapkan setelah penggabungan agar kategori semua partisi
+    menjadi satu.
+    """
+    files = store_files(store_dir, years)
+    if not files:
+        return pd.DataFrame()
+    df = pd.concat([pd.read_parquet(f, columns=columns) for f in files], ignore_index=True)
+    return apply_schema(sort_by_date(df))
+
+
+def main(argv=None):
+    import argparse
+
+    from transjakarta.heatgrid import GRID_DEG
+    from transjakarta.refresh import refresh_store
+
+    parser = argparse.ArgumentParser(
+        description="Ingest penuh CSV TransJakarta ke store Parquet terpartisi (lihat juga transjakarta.refresh)."
+    )
+    parser.add_argument("source", help="berkas CSV, direktori, atau pola glob")
+    parser.add_argument("--store", help="direktori store (default: di dalam direktori cache, yang dibaca dashboard)")
+    parser.add_argument("--cell-deg", type=float, default=GRID_DEG)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    store_dir = args.store or default_store_dir(args.source)
+    # lewat refresh_store agar manifest & agregat ikut ditulis: refresh berikutnya
+    # (dashboard / cron) melanjutkan store ini alih-alih membangunnya ulang
+    result = refresh_store(args.source, store_dir, args.cell_deg, args.chunksize, rebuild=True)
+    print(f"{len(result['changed'])} partisi dari {len(result['sources'])} CSV -> {store_dir}")
+
+if __name__ == "__main__":
+    main()
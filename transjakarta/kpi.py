@@ -0,0 +1,64 @@
+"""Mesin KPI: seluruh angka sidebar + grid KPI dalam satu agregasi.
+
+Satu ``groupby`` bulanan di atas kubus (terfilter) menghasilkan total, bulan
+puncak/terendah, dan pemulihan; jumlah trayek/halte unik dihitung dari kode
+kategori (``bincount``) dan median dari array penumpang. Tabel ``monthly``
+yang sama dipakai ulang oleh grafik tren.
+"""
+
+import numpy as np
+import pandas as pd
+
+from transjakarta.cube import MEASURE, AggregateCube
+
+
+def _count_unique(values: pd.Series) -> int:
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        codes = codes[codes >= 0]
+        if not len(codes):
+            return 0
+        return int(np.count_nonzero(np.bincount(codes, minlength=len(values.cat.categories))))
+    return int(values.nunique())
+
+
+def compute_kpis(cube: AggregateCube, passengers=None) -> dict:
+    """KPI untuk ``cube``; ``passengers`` = array penumpang per baris (median).
+
+    Kunci: ``total``, ``n_trayek``, ``n_halte``, ``monthly`` (date,
+    jumlah_penumpang), ``peak_date``/``peak_value``, ``low_date``/``low_value``,
+    ``recovery_pct`` (lembah → puncak), ``median``.
+    """
+    c = cube.cube
+    kpis = {
+        "total": 0,
+        "n_trayek": 0,
+        "n_halte": 0,
+        "monthly": pd.DataFrame(columns=["date", MEASURE]),
+        "peak_date": None,
+        "peak_value": 0,
+        "low_date": None,
+        "low_value": 0,
+        "recovery_pct": np.nan,
+        "median": 0,
+    }
+    if cube.empty:
+        return kpis
+
+    monthly = c.groupby("date", as_index=False, sort=True)[MEASURE].sum()
+    values = monthly[MEASURE].to_numpy()
+    hi, lo = int(values.argmax()), int(values.argmin())
+    kpis.update(
+        total=int(values.sum()),
+        n_trayek=_count_unique(c["trayek"]) if "trayek" in c.columns else 0,
+        n_halte=sum(_count_unique(c[col]) for col in ("halte_awal", "halte_tujuan") if col in c.columns),
+        monthly=monthly,
+        peak_date=monthly["date"].iloc[hi],
+        peak_value=int(values[hi]),
+        low_date=monthly["date"].iloc[lo],
+        low_value=int(values[lo]),
+        recovery_pct=(values[hi] - values[lo]) / values[lo] * 100.0 if values[lo] > 0 else np.nan,
+    )
+    if passengers is not None and len(passengers):
+        kpis["median"] = float(np.median(np.asarray(passengers, dtype=np.float64)))
+    return kpis
@@ -0,0 +1,53 @@
+"""Pembangun layer Folium secara batch.
+
+Alih-alih satu objek ``folium.CircleMarker``/``PolyLine`` per baris (masing-
+masing menambah JS + HTML sendiri), titik dikirim sebagai satu array data ke
+``FastMarkerCluster`` dan lintasan sebagai satu multi-polyline.
+"""
+
+import numpy as np
+import pandas as pd
+import folium
+from folium.plugins import FastMarkerCluster
+
+_CIRCLE_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: %(radius)s,
+        color: "%(color)s",
+        fill: true,
+        fillOpacity: %(fill_opacity)s
+    });
+    marker.bindTooltip(row[2]);
+    return marker;
+}
+"""
+
+
+def tooltip_series(label: str, halte: pd.Series, trayek: pd.Series) -> pd.Series:
+    """Teks tooltip ``"<label>: <halte> | Trayek: <trayek>"`` untuk semua baris."""
+    halte = halte.astype("object").fillna("-").astype(str)
+    trayek = trayek.astype("object").fillna("-").astype(str)
+    return label + ": " + halte + " | Trayek: " + trayek
+
+
+def circle_cluster_layer(lat, lon, tooltips, name: str, color: str,
+                         radius: int = 3, fill_opacity: float = 0.85) -> FastMarkerCluster:
+    """Satu ``FastMarkerCluster`` berisi circle marker untuk seluruh titik."""
+    lat = np.asarray(lat, dtype=np.float64).round(6)
+    lon = np.asarray(lon, dtype=np.float64).round(6)
+    data = list(zip(lat.tolist(), lon.tolist(), list(tooltips)))
+    callback = _CIRCLE_CALLBACK % {"radius": radius, "color": color, "fill_opacity": fill_opacity}
+    return FastMarkerCluster(data, callback=callback, name=name)
+
+
+def segment_layer(lat1, lon1, lat2, lon2, **style) -> folium.PolyLine:
+    """Satu multi-polyline untuk semua segmen awal → tujuan."""
+    coords = np.stack(
+        [
+            np.column_stack([lat1, lon1]),
+            np.column_stack([lat2, lon2]),
+        ],
+        axis=1,
+    ).astype(np.float64).round(6)
+    return folium.PolyLine(coords.tolist(), **style)
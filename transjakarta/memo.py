@@ -0,0 +1,135 @@
+"""Memoisasi per status filter.
+
+``filter_key`` menormalkan status sidebar (rentang tanggal + trayek) menjadi
+tuple kanonik yang bisa di-hash; ``LRUCache`` adalah cache terbatas (jumlah
+entri dan, opsional, total byte) yang aman dipakai bersama oleh beberapa sesi
+Streamlit (thread).
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def filter_key(start, end, trayek=None) -> tuple:
+    """Kunci kanonik: urutan pilihan trayek tidak memengaruhi kunci."""
+    return (
+        pd.Timestamp(start).isoformat() if start is not None else None,
+        pd.Timestamp(end).isoformat() if end is not None else None,
+        tuple(sorted(trayek)) if trayek else (),
+    )
+
+
+def payload_nbytes(value) -> int:
+    """Ukuran payload untuk anggaran byte: bytes/str dihitung, lainnya 0."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return 0
+
+
+def object_nbytes(value, _seen=None) -> int:
+    """Perkiraan ukuran nilai ter-cache: frame/array pandas & numpy, figur
+    Plotly (data trace), bytes/str, serta isi dict/list/tuple dan atribut objek."""
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(index=True, deep=False)
+        return int(usage.sum()) if isinstance(value, pd.DataFrame) else int(usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray, memoryview, str)):
+        return payload_nbytes(value)
+    if isinstance(value, (int, float, np.generic)):
+        return 8
+    if isinstance(value, dict):
+        return sum(object_nbytes(v, seen) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(object_nbytes(v, seen) for v in value)
+    if hasattr(value, "to_plotly_json"):
+        return object_nbytes(value.to_plotly_json(), seen)
+    if hasattr(value, "__dict__"):
+        return object_nbytes(vars(value), seen)
+    return 0
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 32, maxbytes: int | None = None, sizeof=payload_nbytes):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = self.sizeof(value) if self.maxbytes is not None else 0
+        if self.maxbytes is not None and size > self.maxbytes:
+            return  # lebih besar dari seluruh anggaran: jangan dicache
+        with self._lock:
+            if key in self._data:
+                self.nbytes -= self._sizes.pop(key)
+            self._data[key] = value
+            self._sizes[key] = size
+            self.nbytes += size
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize or (
+                self.maxbytes is not None and self.nbytes > self.maxbytes
+            ):
+                old_key, _ = self._data.popitem(last=False)
+                self.nbytes -= self._sizes.pop(old_key)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Nilai ter-cache untuk ``key``; bila belum ada, ``compute()`` dipanggil
+        (di luar lock, sehingga sesi lain tidak ikut menunggu)."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "nbytes": self.nbytes,
+            "maxbytes": self.maxbytes,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,206 @@
+"""Profil cold-start dashboard.
+
+``cold_import_times`` mengukur waktu impor tiap dependensi berat di
+interpreter baru (``python -X importtime``), sehingga angkanya tidak
+terpengaruh modul yang sudah termuat dan bisa dibandingkan antar rilis::
+
+    python -m transjakarta.profiling
+    python -m transjakarta.profiling --json startup.json
+
+``StageTimer`` mencatat durasi tahap-tahap satu eksekusi skrip (impor, muat
+data, filter, render KPI pertama) untuk mode ``TJ_PROFILE_STARTUP=1``.
+``RerunTrace`` memperluasnya untuk instrumentasi per rerun (``TJ_INSTRUMENT``):
+tahap bersarang lewat ``stage``/``traced``, hit cache, dan ukuran payload,
+diekspor sebagai satu record JSON per rerun.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+# dependensi yang dimuat dashboard; plotly & folium hanya saat grafik/peta dibangun
+HEAVY_MODULES = [
+    "numpy",
+    "pandas",
+    "pyarrow",
+    "streamlit",
+    "plotly.graph_objects",
+    "plotly.express",
+    "folium",
+    "folium.plugins",
+]
+
+
+def parse_importtime(stderr: str) -> dict:
+    """``{modul: detik kumulatif}`` dari keluaran ``-X importtime``."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        try:
+            times[name.strip()] = int(cumulative) / 1e6
+        except ValueError:  # baris header
+            continue
+    return times
+
+
+def cold_import_times(modules=None, python: str = sys.executable) -> dict:
+    """Waktu impor (detik) tiap modul, masing-masing di interpreter baru."""
+    result = {}
+    for module in modules or HEAVY_MODULES:
+        proc = subprocess.run(
+            [python, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            logger.warning("Gagal mengimpor %s: %s", module, proc.stderr.strip().splitlines()[-1:])
+            result[module] = None
+            continue
+        result[module] = parse_importtime(proc.stderr).get(module)
+    return result
+
+
+def loaded_modules(modules=None) -> dict:
+    """Apakah tiap modul berat sudah termuat di proses ini (cek lazy import)."""
+    return {m: m in sys.modules for m in modules or HEAVY_MODULES}
+
+
+class StageTimer:
+    """Durasi per tahap sejak ``start`` (detik, ``time.perf_counter``)."""
+
+    def __init__(self, start: float | None = None):
+        self.start = time.perf_counter() if start is None else start
+        self._last = self.start
+        self.stages = []
+
+    def mark(self, stage: str) -> float:
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self.stages.append((stage, elapsed))
+        self._last = now
+        return elapsed
+
+    @property
+    def total(self) -> float:
+        return self._last - self.start
+
+    def as_dict(self) -> dict:
+        return {"stages": dict(self.stages), "total": self.total}
+
+
+# trace rerun yang sedang aktif di thread/konteks skrip ini (None = nonaktif)
+_ACTIVE_TRACE = contextvars.ContextVar("rerun_trace", default=None)
+
+
+class RerunTrace(StageTimer):
+    """``StageTimer`` satu rerun + hit cache dan ukuran payload (byte)."""
+
+    def __init__(self, start: float | None = None):
+        super().__init__(start)
+        self.rerun_id = uuid.uuid4().hex[:12]
+        self.timestamp = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        self.caches = {}
+        self.payloads = []
+
+    @contextmanager
+    def stage(self, name: str):
+        """Durasi blok ``with`` sebagai tahap ``name`` (boleh bersarang di antara
+        ``mark``; ``mark`` berikutnya dihitung sejak blok selesai)."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self.stages.append((name, now - t0))
+            self._last = max(self._last, now)
+
+    def payload(self, name: str, nbytes: int):
+        self.payloads.append((name, int(nbytes)))
+
+    def cache_delta(self, before: dict, after: dict):
+        """Selisih ``LRUCache.stats()`` per cache antara awal & akhir rerun."""
+        for name, stats in after.items():
+            old = before.get(name, {})
+            self.caches[name] = {k: stats[k] - old.get(k, 0) for k in ("hits", "misses", "evictions")}
+            self.caches[name]["size"] = stats["size"]
+
+    def as_dict(self) -> dict:
+        return {
+            "rerun_id": self.rerun_id,
+            "timestamp": self.timestamp,
+            "total_s": self.total,
+            "stages": [{"stage": name, "seconds": sec} for name, sec in self.stages],
+            "caches": self.caches,
+            "payloads": [{"name": name, "bytes": nbytes} for name, nbytes in self.payloads],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.as_dict(), ensure_ascii=False)
+
+
+def activate(trace: RerunTrace | None):
+    """Jadikan ``trace`` trace aktif untuk sisa eksekusi skrip ini."""
+    _ACTIVE_TRACE.set(trace)
+
+
+def active_trace() -> RerunTrace | None:
+    return _ACTIVE_TRACE.get()
+
+
+@contextmanager
+def trace_stage(name: str):
+    """``RerunTrace.stage`` pada trace aktif; tanpa biaya bila nonaktif."""
+    trace = _ACTIVE_TRACE.get()
+    if trace is None:
+        yield
+        return
+    with trace.stage(name):
+        yield
+
+
+def traced(fn):
+    """Dekorator: catat durasi tiap panggilan ``fn`` sebagai tahap bernama fungsi."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with trace_stage(fn.__name__):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def append_jsonl(path: str, record: str):
+    """Tambahkan satu record JSON (satu baris) ke berkas log terstruktur."""
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(record + "\n")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Waktu impor cold-start dependensi dashboard.")
+    parser.add_argument("modules", nargs="*", help="modul yang diukur (default: HEAVY_MODULES)")
+    parser.add_argument("--json", help="simpan hasil sebagai JSON di path ini")
+    args = parser.parse_args(argv)
+
+    times = cold_import_times(args.modules or None)
+    width = max(len(m) for m in times)
+    for module, seconds in times.items():
+        shown = "gagal" if seconds is None else f"{seconds * 1e3:8.1f} ms"
+        print(f"{module:<{width}}  {shown}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"python": sys.version.split()[0], "import_s": times}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
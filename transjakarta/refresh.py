@@ -0,0 +1,230 @@
+"""Refresh inkremental store terpartisi (tahun/bulan).
+
+``refresh_store`` membandingkan setiap berkas sumber dengan manifest
+(ukuran + mtime, lalu hash isi bila perlu) dan hanya meng-ingest ulang berkas
+yang baru/berubah. Berkas partisi diperlakukan sama: hash isinya disimpan di
+manifest dan hanya dihitung ulang bila ukuran/mtime berubah, sehingga
+pemeriksaan tanpa perubahan cukup ``stat`` per berkas. Setiap partisi (tahun,
+bulan) punya fingerprint; kubus agregat dan bin heatmap hanya dibangun ulang
+untuk partisi yang fingerprint-nya berubah, lalu digabung dengan agregat
+partisi lain yang sudah ada::
+
+    <store>/_manifest.json
+    <store>/_agg/cube/2021-07.parquet
+    <store>/_agg/heat/2021-07.parquet
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+
+import pandas as pd
+
+from transjakarta.cube import build_cube
+from transjakarta.heatgrid import GRID_DEG, build_heat_bins
+from transjakarta.ingest import (
+    DEFAULT_CHUNKSIZE,
+    ingest_file,
+    remove_source_parts,
+    resolve_sources,
+    store_files,
+)
+from transjakarta.store import SCHEMA_VERSION, file_digest, write_parquet_atomic
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "_manifest.json"
+AGG_DIRNAME = "_agg"
+AGG_BUILDERS = {
+    "cube": lambda df, cell_deg: build_cube(df),
+    "heat": lambda df, cell_deg: build_heat_bins(df, cell_deg),
+}
+
+
+def read_manifest(store_dir: str) -> dict:
+    try:
+        with open(os.path.join(store_dir, MANIFEST_NAME), encoding="utf-8") as fh:
+            return json.load(fh)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_manifest(store_dir: str, manifest: dict):
+    os.makedirs(store_dir, exist_ok=True)
+    target = os.path.join(store_dir, MANIFEST_NAME)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(tmp, target)
+
+
+def partition_label(path: str) -> str:
+    """``.../year=2021/month=07/x.parquet`` -> ``"2021-07"``."""
+    month_dir = os.path.dirname(path)
+    year = os.path.basename(os.path.dirname(month_dir)).split("=", 1)[1]
+    month = os.path.basename(month_dir).split("=", 1)[1]
+    return f"{year}-{month}"
+
+
+def store_file_entries(store_dir: str, previous: dict | None = None) -> dict:
+    """``{path relatif: {"size", "mtime_ns", "digest"}}`` untuk berkas partisi.
+
+    Hash isi dari ``previous`` dipakai ulang bila ukuran & mtime berkas sama;
+    hanya berkas baru/tertulis ulang yang di-hash.
+    """
+    previous = previous or {}
+    entries = {}
+    for f in store_files(store_dir):
+        rel = os.path.relpath(f, store_dir)
+        stat = os.stat(f)
+        old = previous.get(rel)
+        if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+            entries[rel] = old
+        else:
+            entries[rel] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": file_digest(f)}
+    return entries
+
+
+def partition_fingerprints(store_dir: str, entries: dict | None = None) -> dict:
+    """Fingerprint per partisi: hash dari (nama berkas, hash isi) berkas-berkasnya.
+
+    Berbasis isi berkas partisi, bukan berkas sumber: bila satu CSV tahunan
+    berubah di satu bulan saja, hanya bulan itu yang dianggap berubah.
+    ``entries`` = hasil ``store_file_entries`` (dihitung bila tidak diberikan).
+    """
+    if entries is None:
+        entries = store_file_entries(store_dir)
+    parts = {}
+    for rel, entry in entries.items():
+        path = os.path.join(store_dir, rel)
+        parts.setdefault(partition_label(path), []).append(f"{os.path.basename(path)}:{entry['digest']}")
+    return {
+        label: hashlib.sha1("\n".join(sorted(items)).encode("utf-8")).hexdigest()
+        for label, items in sorted(parts.items())
+    }
+
+
+def agg_path(store_dir: str, kind: str, label: str) -> str:
+    return os.path.join(store_dir, AGG_DIRNAME, kind, f"{label}.parquet")
+
+
+def read_partition(store_dir: str, label: str) -> pd.DataFrame:
+    year, month = label.split("-")
+    files = sorted(glob.glob(os.path.join(store_dir, f"year={year}", f"month={month}", "*.parquet")))
+    return pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+
+
+def rebuild_aggregates(store_dir: str, label: str, cell_deg: float = GRID_DEG):
+    df = read_partition(store_dir, label)
+    for kind, build in AGG_BUILDERS.items():
+        write_parquet_atomic(build(df, cell_deg), agg_path(store_dir, kind, label))
+
+
+def remove_aggregates(store_dir: str, label: str):
+    for kind in AGG_BUILDERS:
+        path = agg_path(store_dir, kind, label)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def read_aggregates(store_dir: str, kind: str) -> pd.DataFrame:
+    """Gabungan agregat semua partisi (``kind``: "cube" atau "heat")."""
+    files = sorted(glob.glob(os.path.join(store_dir, AGG_DIRNAME, kind, "*.parquet")))
+    if not files:
+        return pd.DataFrame()
+    return pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+
+
+def _reset_store(store_dir: str):
+    for name in os.listdir(store_dir) if os.path.isdir(store_dir) else []:
+        path = os.path.join(store_dir, name)
+        if name.startswith("year=") or name == AGG_DIRNAME:
+            shutil.rmtree(path)
+
+
+def refresh_store(source: str, store_dir: str, cell_deg: float = GRID_DEG,
+                  chunksize: int = DEFAULT_CHUNKSIZE, rebuild: bool = False) -> dict:
+    """Sinkronkan store dengan ``source``; hanya bagian yang berubah diproses
+    (``rebuild=True``: kosongkan store lalu ingest ulang semuanya).
+
+    Mengembalikan manifest terbaru ditambah kunci ``changed``/``removed``
+    (label partisi yang diproses ulang / dihapus pada panggilan ini).
+    """
+    manifest = {} if rebuild else read_manifest(store_dir)
+    if manifest.get("schema_version") != SCHEMA_VERSION or manifest.get("cell_deg") != cell_deg:
+        if manifest:
+            logger.info("Skema/konfigurasi store berubah: bangun ulang %s", store_dir)
+        _reset_store(store_dir)
+        manifest = {}
+
+    sources = manifest.get("sources", {})
+    paths = {os.path.abspath(p): p for p in resolve_sources(source)}
+
+    for gone in sorted(set(sources) - set(paths)):
+        remove_source_parts(store_dir, gone)
+        del sources[gone]
+
+    for key, path in sorted(paths.items()):
+        stat = os.stat(path)
+        entry = sources.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            continue
+        digest = file_digest(path)
+        if not entry or entry["digest"] != digest:
+            ingest_file(path, store_dir, chunksize)
+        sources[key] = {"digest": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    files = store_file_entries(store_dir, manifest.get("files"))
+    fingerprints = partition_fingerprints(store_dir, files)
+    previous = manifest.get("partitions", {})
+    changed = [label for label, fp in fingerprints.items() if previous.get(label) != fp]
+    removed = [label for label in previous if label not in fingerprints]
+
+    for label in changed:
+        rebuild_aggregates(store_dir, label, cell_deg)
+    for label in removed:
+        remove_aggregates(store_dir, label)
+
+    if changed or removed or "refreshed_at" not in manifest:
+        manifest["refreshed_at"] = datetime.now().isoformat(timespec="seconds")
+    manifest.update(
+        schema_version=SCHEMA_VERSION,
+        cell_deg=cell_deg,
+        sources=sources,
+        files=files,
+        partitions=fingerprints,
+        version=hashlib.sha1(json.dumps(fingerprints, sort_keys=True).encode("utf-8")).hexdigest()[:16],
+    )
+    write_manifest(store_dir, manifest)
+    if changed or removed:
+        logger.info("Refresh %s: %d partisi diproses ulang, %d dihapus", store_dir, len(changed), len(removed))
+    return dict(manifest, changed=changed, removed=removed)
+
+
+def main(argv=None):
+    import argparse
+
+    from transjakarta.ingest import default_store_dir
+
+    parser = argparse.ArgumentParser(description="Refresh inkremental store TransJakarta.")
+    parser.add_argument("source", help="berkas CSV, direktori, atau pola glob")
+    parser.add_argument("--store", help="direktori store (default: di dalam direktori cache)")
+    parser.add_argument("--cell-deg", type=float, default=GRID_DEG)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    store_dir = args.store or default_store_dir(args.source)
+    result = refresh_store(args.source, store_dir, args.cell_deg, args.chunksize)
+    print(
+        f"{len(result['changed'])} partisi diproses ulang, {len(result['removed'])} dihapus; "
+        f"versi {result['version']} (diperbarui {result['refreshed_at']})"
+    )
+
+
+if __name__ == "__main__":
+    main()
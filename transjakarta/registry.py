@@ -0,0 +1,105 @@
+"""Registri trayek & halte dengan ID integer padat.
+
+Dibangun sekali saat data dimuat dari kamus kategori frame (lihat
+``transjakarta.schema``): ``route_id`` adalah kode kategori kolom ``trayek``
+dan ``stop_id`` kode kategori bersama ``halte_awal``/``halte_tujuan``. Filter,
+join, dan peringkat cukup bekerja pada array kode integer tersebut.
+"""
+
+import numpy as np
+import pandas as pd
+
+from transjakarta.schema import STOP_COLS, apply_schema
+
+STOP_COORDS = {
+    "halte_awal": ("latitude_awal", "longitude_awal"),
+    "halte_tujuan": ("latitude_tujuan", "longitude_tujuan"),
+}
+
+
+def _first_by_code(codes: np.ndarray, values: pd.Series, n: int) -> np.ndarray:
+    """Nilai pertama ``values`` untuk tiap kode 0..n-1 (``None`` bila tidak ada)."""
+    out = np.full(n, None, dtype=object)
+    ok = codes >= 0
+    uniq, first = np.unique(codes[ok], return_index=True)
+    out[uniq] = values.to_numpy(dtype=object)[ok][first]
+    return out
+
+
+class Registry:
+    def __init__(self, routes: pd.DataFrame, stops: pd.DataFrame):
+        # routes: index route_id, kolom trayek/kode_trayek/jenis
+        # stops: index stop_id, kolom halte/lat/lon
+        self.routes = routes
+        self.stops = stops
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "Registry":
+        df = apply_schema(df) if not isinstance(df["trayek"].dtype, pd.CategoricalDtype) else df
+
+        names = df["trayek"].cat.categories
+        codes = df["trayek"].cat.codes.to_numpy()
+        routes = pd.DataFrame({"trayek": names.astype(str)}, index=pd.RangeIndex(len(names), name="route_id"))
+        for col in ("kode_trayek", "jenis"):
+            if col in df.columns:
+                routes[col] = _first_by_code(codes, df[col].astype(object), len(names))
+
+        stop_cols = [c for c in STOP_COLS if c in df.columns]
+        halte = df[stop_cols[0]].cat.categories if stop_cols else pd.Index([])
+        stops = pd.DataFrame({"halte": halte.astype(str)}, index=pd.RangeIndex(len(halte), name="stop_id"))
+
+        # koordinat halte = median seluruh kemunculan valid (awal maupun tujuan)
+        parts = []
+        valid = df["geo_valid"].to_numpy() if "geo_valid" in df.columns else np.ones(len(df), dtype=bool)
+        for col in stop_cols:
+            lat_col, lon_col = STOP_COORDS[col]
+            if {lat_col, lon_col}.issubset(df.columns):
+                parts.append(
+                    pd.DataFrame(
+                        {
+                            "stop_id": df[col].cat.codes.to_numpy()[valid],
+                            "lat": df[lat_col].to_numpy(dtype=np.float64)[valid],
+                            "lon": df[lon_col].to_numpy(dtype=np.float64)[valid],
+                        }
+                    )
+                )
+        if parts:
+            pts = pd.concat(parts, ignore_index=True)
+            coords = pts[pts["stop_id"] >= 0].groupby("stop_id")[["lat", "lon"]].median()
+            stops = stops.join(coords)
+        else:
+            stops["lat"] = stops["lon"] = np.nan
+        return cls(routes, stops)
+
+    @property
+    def route_names(self) -> list:
+        """Nama trayek terurut (urutan = ``route_id``)."""
+        return self.routes["trayek"].tolist()
+
+    def encode(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Salinan ``df`` dengan kolom trayek/halte memakai kamus registri,
+        sehingga kodenya sama dengan ``route_id``/``stop_id``.
+
+        Nama yang tidak ada di registri berarti ``df`` tidak berasal dari data
+        yang sama (mis. agregat basi); alih-alih menjadi NaN diam-diam (dan
+        penumpangnya hilang dari roll-up) ``ValueError`` dinaikkan.
+        """
+        df = df.copy()
+        if "trayek" in df.columns:
+            df["trayek"] = _encode_column(df["trayek"], self.routes["trayek"])
+        for col in STOP_COLS:
+            if col in df.columns:
+                df[col] = _encode_column(df[col], self.stops["halte"])
+        return df
+
+
+def _encode_column(values: pd.Series, names: pd.Series) -> pd.Categorical:
+    codes = pd.Index(names).get_indexer(values.to_numpy(dtype=object))
+    unknown = (codes < 0) & values.notna().to_numpy()
+    if unknown.any():
+        sample = sorted(pd.unique(values[unknown].astype(str)))
+        raise ValueError(
+            f"{int(unknown.sum())} baris kolom {values.name} memakai {len(sample)} nama yang tidak ada "
+            f"di registri (mis. {sample[:5]}); bangun ulang agregat atau registri dari data yang sama."
+        )
+    return pd.Categorical.from_codes(codes, categories=names)
@@ -0,0 +1,129 @@
+"""Skema dtype ringkas untuk frame data di memori.
+
+Kolom nama (trayek, halte, jenis) disimpan sebagai ``category`` sehingga
+``groupby``/``isin``/``value_counts`` bekerja di atas kode integer, bukan hash
+string. Kolom bilangan bulat diturunkan ke lebar terkecil yang muat, dan
+koordinat/jarak disimpan float32 setelah presisinya diverifikasi::
+
+    python -m transjakarta.schema df_final.csv
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_COLS = ["jenis", "kode_trayek", "trayek", "halte_awal", "halte_tujuan"]
+# halte awal & tujuan berbagi satu kamus kategori: kode yang sama = halte yang sama
+STOP_COLS = ["halte_awal", "halte_tujuan"]
+INT_DTYPES = {"year": "int16", "month": "int8", "jumlah_penumpang": "int32"}
+FLOAT32_COLS = ["latitude_awal", "longitude_awal", "latitude_tujuan", "longitude_tujuan", "distance_km"]
+
+# galat maksimum float32 yang diterima (derajat / km): ~1 m di permukaan bumi
+FLOAT32_TOLERANCE = 1e-5
+
+
+def _fits_int(values: pd.Series, dtype: str) -> bool:
+    info = np.iinfo(dtype)
+    return values.empty or (values.min() >= info.min and values.max() <= info.max)
+
+
+def _float32_error(values: pd.Series) -> float:
+    """Galat absolut maksimum bila ``values`` disimpan sebagai float32."""
+    x = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    with np.errstate(invalid="ignore"):
+        err = np.abs(x.astype(np.float32).astype(np.float64) - x)
+    return float(np.nanmax(err)) if np.isfinite(err).any() else 0.0
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Konversi ``df`` ke skema ringkas; kolom yang tidak ada diabaikan.
+
+    Kolom bilangan bulat yang nilainya tidak muat, dan kolom float yang galat
+    float32-nya melebihi ``FLOAT32_TOLERANCE``, dibiarkan apa adanya.
+    """
+    df = df.copy()
+    for col in CATEGORY_COLS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+        elif col in df.columns:
+            # gabungan beberapa potongan bisa membawa kategori yang tak terpakai
+            df[col] = df[col].cat.remove_unused_categories()
+    stop_cols = [c for c in STOP_COLS if c in df.columns]
+    if len(stop_cols) > 1:
+        stops = pd.Index(sorted(set().union(*(df[c].cat.categories for c in stop_cols))))
+        for col in stop_cols:
+            df[col] = df[col].cat.set_categories(stops)
+
+    for col, dtype in INT_DTYPES.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        if _fits_int(df[col], dtype):
+            df[col] = df[col].astype(dtype)
+        else:
+            logger.warning("Kolom %s tidak muat di %s; tetap %s", col, dtype, df[col].dtype)
+
+    for col in FLOAT32_COLS:
+        if col not in df.columns or df[col].dtype == np.float32:
+            continue
+        err = _float32_error(df[col])
+        if err <= FLOAT32_TOLERANCE:
+            df[col] = df[col].astype(np.float32)
+        else:
+            logger.warning("Galat float32 kolom %s = %.2g > %.0e; tetap float64", col, err, FLOAT32_TOLERANCE)
+    return df
+
+
+def category_mask(values: pd.Series, wanted) -> np.ndarray:
+    """Mask ``values.isin(wanted)``; untuk kolom ``category`` dicocokkan lewat
+    kode integer tanpa membandingkan string per baris."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        ids = values.cat.categories.get_indexer(list(wanted))
+        return np.isin(values.cat.codes.to_numpy(), ids[ids >= 0])
+    return values.isin(list(wanted)).to_numpy()
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """Byte per baris tiap kolom sebelum/sesudah ``apply_schema`` (+ baris TOTAL)."""
+    n_before, n_after = max(len(before), 1), max(len(after), 1)
+    mem_before = before.memory_usage(deep=True, index=False)
+    mem_after = after.memory_usage(deep=True, index=False)
+    report = pd.DataFrame(
+        {
+            "dtype_sebelum": before.dtypes.astype(str),
+            "dtype_sesudah": after.dtypes.reindex(before.columns).astype(str),
+            "byte_per_baris_sebelum": mem_before / n_before,
+            "byte_per_baris_sesudah": mem_after.reindex(before.columns) / n_after,
+        }
+    )
+    report.loc["TOTAL"] = ["", "", mem_before.sum() / n_before, mem_after.sum() / n_after]
+    report["rasio"] = report["byte_per_baris_sebelum"] / report["byte_per_baris_sesudah"]
+    return report.round(2)
+
+
+def main(argv=None):
+    import argparse
+
+    from transjakarta.ingest import iter_clean_chunks, resolve_sources
+
+    parser = argparse.ArgumentParser(description="Laporan memori skema ringkas TransJakarta.")
+    parser.add_argument("source", help="berkas CSV, direktori, atau pola glob")
+    args = parser.parse_args(argv)
+
+    raw = pd.concat(
+        [chunk for path in resolve_sources(args.source) for chunk in iter_clean_chunks(path)],
+        ignore_index=True,
+    )
+    report = memory_report(raw, apply_schema(raw))
+    print(report.to_string())
+    total = report.loc["TOTAL"]
+    print(
+        f"\n{len(raw):,} baris: {total['byte_per_baris_sebelum']:.0f} -> "
+        f"{total['byte_per_baris_sesudah']:.0f} byte/baris ({total['rasio']:.1f}x lebih kecil)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Statistik ringan berbasis NumPy untuk grafik korelasi.
+
+Pengganti ``scipy.stats.pearsonr``/``spearmanr`` dan trendline OLS statsmodels
+(``px.scatter(trendline="ols")``): semuanya rumus tertutup yang tervektorisasi,
+tanpa impor pustaka berat di jalur render. Ketidakpastian (interval
+kepercayaan bootstrap & p-value permutasi) dihitung per batch matriks NumPy
+dengan batas jumlah resampel dan waktu.
+"""
+
+import time
+
+import numpy as np
+
+
+def _as_float(x) -> np.ndarray:
+    return np.asarray(x, dtype=np.float64)
+
+
+def pearson(x, y) -> float:
+    """Koefisien korelasi Pearson; NaN bila salah satu variabel konstan."""
+    x, y = _as_float(x), _as_float(y)
+    dx, dy = x - x.mean(), y - y.mean()
+    denom = np.sqrt(np.dot(dx, dx) * np.dot(dy, dy))
+    if denom == 0:
+        return float("nan")
+    return float(np.clip(np.dot(dx, dy) / denom, -1.0, 1.0))
+
+
+def rankdata(x) -> np.ndarray:
+    """Peringkat 1..n dengan nilai seri diberi rata-rata peringkat
+    (setara ``scipy.stats.rankdata(method="average")``)."""
+    x = _as_float(x)
+    order = np.argsort(x, kind="mergesort")
+    sorted_x = x[order]
+    # awal tiap kelompok nilai sama pada urutan terurut
+    starts = np.flatnonzero(np.r_[True, sorted_x[1:] != sorted_x[:-1]])
+    ends = np.r_[starts[1:], len(x)]
+    avg = (starts + ends + 1) / 2.0
+    ranks = np.empty(len(x), dtype=np.float64)
+    ranks[order] = np.repeat(avg, ends - starts)
+    return ranks
+
+
+def spearman(x, y) -> float:
+    """Korelasi peringkat Spearman = Pearson atas peringkat."""
+    return pearson(rankdata(x), rankdata(y))
+
+
+def linear_fit(x, y) -> tuple:
+    """Regresi kuadrat terkecil ``y = slope * x + intercept``; ``(slope, intercept, r2)``."""
+    x, y = _as_float(x), _as_float(y)
+    dx, dy = x - x.mean(), y - y.mean()
+    sxx = np.dot(dx, dx)
+    if sxx == 0:
+        return float("nan"), float(y.mean()), float("nan")
+    slope = np.dot(dx, dy) / sxx
+    intercept = y.mean() - slope * x.mean()
+    syy = np.dot(dy, dy)
+    r2 = np.dot(dx, dy) ** 2 / (sxx * syy) if syy > 0 else float("nan")
+    return float(slope), float(intercept), float(r2)
+
+
+def correlation_summary(x, y) -> dict:
+    """``{"n", "r", "rho", "slope", "intercept", "r2"}`` untuk pasangan ``x``/``y``
+    yang sudah bersih (tanpa NaN)."""
+    slope, intercept, r2 = linear_fit(x, y)
+    return {
+        "n": int(len(x)),
+        "r": pearson(x, y),
+        "rho": spearman(x, y),
+        "slope": slope,
+        "intercept": intercept,
+        "r2": r2,
+    }
+
+
+# --- Bootstrap & uji permutasi -------------------------------------------------
+
+DEFAULT_RESAMPLES = 2000
+DEFAULT_TIME_BUDGET_S = 1.5
+# batas elemen matriks indeks per batch (baris resampel × n); satu batch memakai
+# beberapa matriks sebesar ini (indeks, x/y teresampel, peringkat), ±40 B/elemen
+MAX_BATCH_ELEMENTS = 500_000
+# di atas jumlah baris ini resampling memakai subsampel acak berukuran tetap,
+# sehingga satu batch (dan memorinya) tidak tumbuh bersama data
+MAX_SAMPLE_ROWS = 50_000
+STATISTICS = ("r", "rho", "slope")
+
+
+def _pearson_rows(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Pearson per baris untuk matriks ``(batch, n)``."""
+    dx = x - x.mean(axis=1, keepdims=True)
+    dy = y - y.mean(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.einsum("ij,ij->i", dx, dy) / np.sqrt(
+            np.einsum("ij,ij->i", dx, dx) * np.einsum("ij,ij->i", dy, dy)
+        )
+
+
+def _slope_rows(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    dx = x - x.mean(axis=1, keepdims=True)
+    dy = y - y.mean(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.einsum("ij,ij->i", dx, dy) / np.einsum("ij,ij->i", dx, dx)
+
+
+def _resample_ranks(codes: np.ndarray, n_unique: int, idx: np.ndarray) -> np.ndarray:
+    """Peringkat rata-rata tiap elemen resampel ``idx`` (batch, n) tanpa sort ulang.
+
+    ``codes`` = indeks nilai unik terurut untuk tiap observasi. Peringkat nilai
+    unik k di satu resampel = jumlah elemen < k + (jumlah elemen = k + 1) / 2.
+    """
+    batch = idx.shape[0]
+    sampled = codes[idx]
+    flat = sampled + (np.arange(batch) * n_unique)[:, None]
+    counts = np.bincount(flat.ravel(), minlength=batch * n_unique).reshape(batch, n_unique)
+    below = np.cumsum(counts, axis=1) - counts
+    rank_u = below + (counts + 1) / 2.0
+    return np.take_along_axis(rank_u, sampled, axis=1)
+
+
+def _batch_size(n: int, n_resamples: int) -> int:
+    return max(1, min(n_resamples, MAX_BATCH_ELEMENTS // max(n, 1)))
+
+
+def resampling_summary(x, y, n_resamples: int = DEFAULT_RESAMPLES, ci: float = 0.95,
+                       time_budget_s: float = DEFAULT_TIME_BUDGET_S, seed: int = 0,
+                       max_rows: int = MAX_SAMPLE_ROWS) -> dict:
+    """Interval kepercayaan bootstrap (persentil) dan p-value uji permutasi
+    dua sisi untuk r, ρ, dan slope.
+
+    Bila data lebih dari ``max_rows`` baris, seluruh perhitungan (termasuk
+    ``estimate``) memakai subsampel acak ``max_rows`` baris tanpa pengembalian
+    (``n_sample`` < ``n``). Resampel dihitung per batch sebagai matriks NumPy
+    berukuran ≤ ``MAX_BATCH_ELEMENTS``, jadi batch pertama (yang selalu
+    dihitung) juga terbatas. Bootstrap mendapat separuh ``time_budget_s``,
+    permutasi sisanya (termasuk waktu bootstrap yang tidak terpakai); bila
+    anggaran habis sebelum ``n_resamples`` tercapai, hasil memakai resampel
+    yang sudah selesai (``truncated`` = True). ``seed`` tetap agar hasil dapat
+    diulang.
+
+    Mengembalikan ``{"n", "n_sample", "n_bootstrap", "n_permutation", "ci",
+    "truncated", "r"/"rho"/"slope": {"estimate", "ci_low", "ci_high", "p_value"}}``.
+    """
+    x, y = _as_float(x), _as_float(y)
+    n_total = len(x)
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    if n_total > max_rows:
+        keep = rng.choice(n_total, size=max_rows, replace=False)
+        x, y = x[keep], y[keep]
+    n = len(x)
+    batch = _batch_size(n, n_resamples)
+
+    ux, codes_x = np.unique(x, return_inverse=True)
+    uy, codes_y = np.unique(y, return_inverse=True)
+    rank_x, rank_y = rankdata(x), rankdata(y)
+    observed = {"r": pearson(x, y), "rho": pearson(rank_x, rank_y), "slope": linear_fit(x, y)[0]}
+
+    # bootstrap: pasangan (x, y) diambil ulang dengan pengembalian
+    boot = {k: [] for k in STATISTICS}
+    done = 0
+    deadline = start + time_budget_s / 2
+    while done < n_resamples and (done == 0 or time.perf_counter() < deadline):
+        b = min(batch, n_resamples - done)
+        idx = rng.integers(0, n, size=(b, n))
+        xs, ys = x[idx], y[idx]
+        boot["r"].append(_pearson_rows(xs, ys))
+        boot["slope"].append(_slope_rows(xs, ys))
+        boot["rho"].append(
+            _pearson_rows(_resample_ranks(codes_x, len(ux), idx), _resample_ranks(codes_y, len(uy), idx))
+        )
+        done += b
+    n_boot = done
+
+    # permutasi: y diacak terhadap x (H0: tidak ada hubungan)
+    extreme = {k: 0 for k in STATISTICS}
+    done = 0
+    deadline = start + time_budget_s
+    while done < n_resamples and (done == 0 or time.perf_counter() < deadline):
+        b = min(batch, n_resamples - done)
+        perm = rng.permuted(np.tile(np.arange(n), (b, 1)), axis=1)
+        xs = np.broadcast_to(x, (b, n))
+        stats = {
+            "r": _pearson_rows(xs, y[perm]),
+            "slope": _slope_rows(xs, y[perm]),
+            "rho": _pearson_rows(np.broadcast_to(rank_x, (b, n)), rank_y[perm]),
+        }
+        for k in STATISTICS:
+            extreme[k] += int(np.count_nonzero(np.abs(stats[k]) >= abs(observed[k]) - 1e-12))
+        done += b
+    n_perm = done
+
+    alpha = (1 - ci) / 2
+    result = {
+        "n": n_total,
+        "n_sample": n,
+        "n_bootstrap": n_boot,
+        "n_permutation": n_perm,
+        "ci": ci,
+        "truncated": n_boot < n_resamples or n_perm < n_resamples,
+    }
+    for k in STATISTICS:
+        samples = np.concatenate(boot[k])
+        samples = samples[np.isfinite(samples)]
+        low, high = np.quantile(samples, [alpha, 1 - alpha]) if len(samples) else (np.nan, np.nan)
+        result[k] = {
+            "estimate": observed[k],
+            "ci_low": float(low),
+            "ci_high": float(high),
+            "p_value": (extreme[k] + 1) / (n_perm + 1) if np.isfinite(observed[k]) else float("nan"),
+        }
+    return result
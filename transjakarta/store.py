@@ -0,0 +1,98 @@
+"""Cache kolumnar (Parquet) untuk dataset yang sudah dibersihkan.
+
+Berkas cache diberi kunci hash isi berkas sumber + ``SCHEMA_VERSION``, sehingga
+proses/replika baru cukup membaca Parquet alih-alih mengulang parsing CSV dan
+seluruh tahap pembersihan. Naikkan ``SCHEMA_VERSION`` setiap kali logika
+pembersihan atau dtype hasilnya berubah.
+"""
+
+import glob
+import hashlib
+import logging
+import os
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# naikkan bila arti isi cache berubah (mis. 5: kamus kategori halte bersama;
+# 6: sel heatmap tidak lagi bergeser karena galat float32)
+SCHEMA_VERSION = 6
+CACHE_DIR_ENV = "TJ_CACHE_DIR"
+DEFAULT_CACHE_DIRNAME = ".tj_cache"
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 isi berkas, dibaca per blok agar memori tetap kecil."""
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_dir_for(source: str, cache_dir: str | None = None) -> str:
+    if cache_dir:
+        return cache_dir
+    env_dir = os.environ.get(CACHE_DIR_ENV)
+    if env_dir:
+        return env_dir
+    return os.path.join(os.path.dirname(os.path.abspath(source)), DEFAULT_CACHE_DIRNAME)
+
+
+def cache_path(source: str, digest: str, cache_dir: str | None = None) -> str:
+    stem = os.path.splitext(os.path.basename(source))[0]
+    name = f"{stem}-{digest[:16]}-v{SCHEMA_VERSION}.parquet"
+    return os.path.join(cache_dir_for(source, cache_dir), name)
+
+
+def _prune_stale(source: str, keep: str, cache_dir: str | None = None):
+    stem = os.path.splitext(os.path.basename(source))[0]
+    pattern = os.path.join(cache_dir_for(source, cache_dir), f"{stem}-*-v*.parquet")
+    for path in glob.glob(pattern):
+        if os.path.abspath(path) != os.path.abspath(keep):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def write_parquet_atomic(df: pd.DataFrame, target: str):
+    """Tulis ke berkas sementara lalu ``os.replace`` agar pembaca lain tidak
+    pernah melihat berkas setengah jadi."""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load_cached(source: str, build, cache_dir: str | None = None) -> pd.DataFrame:
+    """Kembalikan hasil ``build(source)``, memakai cache Parquet bila ada.
+
+    ``FileNotFoundError`` dari berkas sumber diteruskan ke pemanggil. Kegagalan
+    baca/tulis cache (mis. pyarrow tidak terpasang, direktori read-only) hanya
+    dicatat di log dan dataset dibangun ulang dari sumber.
+    """
+    digest = file_digest(source)
+    target = cache_path(source, digest, cache_dir)
+
+    if os.path.exists(target):
+        try:
+            return pd.read_parquet(target)
+        except Exception as exc:  # cache rusak / pyarrow hilang
+            logger.warning("Gagal membaca cache %s: %s", target, exc)
+
+    df = build(source)
+
+    if not df.empty:
+        try:
+            write_parquet_atomic(df, target)
+            _prune_stale(source, target, cache_dir)
+        except Exception as exc:
+            logger.warning("Gagal menulis cache %s: %s", target, exc)
+
+    return df
@@ -0,0 +1,78 @@
+"""Ringkasan tingkat dataset (tanpa filter), dihitung sekali per versi data.
+
+Baseline global — trayek & halte teratas, total bulanan, kuantil distribusi
+penumpang, rentang tanggal — hanya berubah bila datanya berubah, jadi cukup
+dihitung saat data dimuat lalu dibaca oleh tabel KPI dan insight.
+"""
+
+import numpy as np
+import pandas as pd
+
+from transjakarta.cube import MEASURE, AggregateCube
+from transjakarta.kpi import compute_kpis
+
+TOP_N = 10
+QUANTILES = (0.0, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0)
+
+
+class DatasetSummary:
+    def __init__(self, n_rows: int, date_min, date_max, kpis: dict,
+                 top_routes: pd.DataFrame, top_halte: dict, quantiles: pd.Series):
+        self.n_rows = n_rows
+        self.date_min = date_min
+        self.date_max = date_max
+        # KPI tanpa filter (lihat ``compute_kpis``): total, bulanan, puncak, dst.
+        self.kpis = kpis
+        self.top_routes = top_routes
+        self.top_halte = top_halte
+        self.quantiles = quantiles
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, cube: AggregateCube, top_n: int = TOP_N) -> "DatasetSummary":
+        routes = cube.by_trayek().head(top_n)
+        values = df[MEASURE].to_numpy(dtype=np.float64)
+        kpis = compute_kpis(cube, values)
+        routes["share"] = routes[MEASURE] / max(kpis["total"], 1) * 100
+        quantiles = (
+            pd.Series(np.quantile(values, QUANTILES), index=list(QUANTILES), name=MEASURE)
+            if len(values)
+            else pd.Series(np.nan, index=list(QUANTILES), name=MEASURE)
+        )
+        return cls(
+            n_rows=len(df),
+            date_min=df["date"].min() if len(df) else None,
+            date_max=df["date"].max() if len(df) else None,
+            kpis=kpis,
+            top_routes=routes,
+            top_halte={col: cube.halte_counts(col).head(top_n) for col in ("halte_awal", "halte_tujuan")},
+            quantiles=quantiles,
+        )
+
+    @property
+    def periode(self) -> str:
+        """Label periode, mis. ``"2021"`` atau ``"2019–2023"``."""
+        if self.date_min is None:
+            return "-"
+        if self.date_min.year == self.date_max.year:
+            return f"{self.date_min.year}"
+        return f"{self.date_min.year}–{self.date_max.year}"
+
+    @property
+    def total(self) -> int:
+        return self.kpis["total"]
+
+    @property
+    def monthly(self) -> pd.DataFrame:
+        return self.kpis["monthly"]
+
+    @property
+    def median(self) -> float:
+        return float(self.quantiles.loc[0.5])
+
+    @property
+    def top_route(self) -> str:
+        return self.top_routes["trayek"].iloc[0] if not self.top_routes.empty else "-"
+
+    def top_stop(self, col: str = "halte_awal") -> str:
+        counts = self.top_halte.get(col)
+        return counts.index[0] if counts is not None and not counts.empty else "-"
@@ -0,0 +1,284 @@
+"""Generator data sintetis TransJakarta untuk uji skala.
+
+``SyntheticModel.from_frame`` mempelajari distribusi dari data asli yang sudah
+dibersihkan:
+
+- templat rute: kombinasi (jenis, kode_trayek, trayek, halte_awal,
+  halte_tujuan) beserta bobot kemunculannya, sehingga komposisi rute per
+  ``jenis`` (Mikrotrans / BRT / Angkutan Umum Integrasi) terjaga;
+- penumpang per rute: peluang nol + log-normal (μ, σ) atas nilai positif,
+  dengan cadangan per ``jenis`` untuk rute yang datanya sedikit;
+- pola musiman: selisih rata-rata log penumpang tiap bulan terhadap μ rute;
+- koordinat halte: median koordinat valid (``Registry``).
+
+``generate`` menghasilkan potongan frame berskema sama dengan CSV sumber,
+terurut menurut bulan, sepenuhnya tervektorisasi. Hasilnya deterministik untuk
+``seed`` yang sama, berapa pun ``chunksize``-nya: tiap blok ``SEED_BLOCK`` baris
+punya RNG sendiri, dan potongan hanya mengelompokkan blok-blok itu::
+
+    python -m transjakarta.synth df_final.csv --rows 100000000 --years 5 --out sintetis.csv
+    python -m transjakarta.synth df_final.csv --rows 10000000 --format csv-dir --out data_sintetis/
+    python -m transjakarta.synth df_final.csv --rows 10000000 --format store --out data_store/
+
+``csv`` dan ``csv-dir`` (satu CSV per bulan) bisa langsung dipakai dashboard
+lewat ``TJ_DATA_SOURCE``. ``store`` hanya untuk benchmark/``read_store``:
+dashboard membangun store-nya sendiri dari CSV sumber (dengan manifest
+``refresh_store``), jadi direktori ini tidak bisa dipakai sebagai sumber.
+"""
+
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from transjakarta.ingest import clean_chunk, partition_dir, split_partitions
+from transjakarta.registry import Registry
+from transjakarta.schema import apply_schema
+from transjakarta.store import write_parquet_atomic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNKSIZE = 1_000_000
+# baris per aliran RNG; tetap, agar hasil tidak bergantung pada ``chunksize``
+SEED_BLOCK = 65_536
+ROUTE_KEYS = ["jenis", "kode_trayek", "trayek", "halte_awal", "halte_tujuan"]
+# σ log-normal minimum agar rute dengan satu observasi tetap bervariasi
+MIN_SIGMA = 0.05
+MAX_PASSENGERS = np.iinfo(np.int32).max
+
+
+def _lognormal_params(values: pd.Series) -> tuple:
+    """``(p_nol, μ, σ, n_positif)`` dari sekumpulan jumlah penumpang."""
+    x = values.to_numpy(dtype=np.float64)
+    pos = np.log(x[x > 0])
+    p_zero = float(np.mean(x <= 0)) if len(x) else 0.0
+    mu = float(pos.mean()) if len(pos) else np.nan
+    sigma = float(pos.std(ddof=1)) if len(pos) > 1 else np.nan
+    return p_zero, mu, sigma, len(pos)
+
+
+class SyntheticModel:
+    def __init__(self, routes: pd.DataFrame, stops: pd.DataFrame, season: np.ndarray, first_year: int):
+        # routes: satu baris per templat rute (kolom ROUTE_KEYS + weight,
+        # p_zero, mu, sigma, stop_awal, stop_tujuan); stops: halte/lat/lon
+        self.routes = routes
+        self.stops = stops
+        self.season = season
+        self.first_year = first_year
+        # koordinat float32 registri dibulatkan ke 5 desimal (≈ 1 m, batas galat float32
+        # skema) agar CSV tidak memuat ekor pembulatan seperti 106.900002
+        self._coords = {
+            axis: np.round(stops[col].to_numpy(dtype=np.float64), 5)
+            for axis, col in (("latitude", "lat"), ("longitude", "lon"))
+        }
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "SyntheticModel":
+        df = apply_schema(df)
+        registry = Registry.from_frame(df)
+        keys = [c for c in ROUTE_KEYS if c in df.columns]
+        grouped = df.groupby(keys, observed=True, sort=True, dropna=False)["jumlah_penumpang"]
+        routes = grouped.size().rename("weight").reset_index()
+        params = grouped.apply(_lognormal_params)
+        routes[["p_zero", "mu", "sigma", "n_pos"]] = pd.DataFrame(params.tolist(), index=routes.index)
+
+        # rute dengan < 2 nilai positif memakai parameter gabungan jenisnya
+        by_jenis = df.groupby("jenis", observed=True)["jumlah_penumpang"].apply(_lognormal_params)
+        pooled = pd.DataFrame(by_jenis.tolist(), index=by_jenis.index, columns=["p_zero", "mu", "sigma", "n_pos"])
+        fallback = pooled.reindex(routes["jenis"].astype(object)).reset_index(drop=True)
+        overall = _lognormal_params(df["jumlah_penumpang"])
+        for i, col in ((1, "mu"), (2, "sigma")):
+            routes[col] = routes[col].fillna(fallback[col]).fillna(overall[i])
+        routes["sigma"] = routes["sigma"].clip(lower=MIN_SIGMA)
+
+        stop_index = pd.Index(registry.stops["halte"])
+        routes["stop_awal"] = stop_index.get_indexer(routes["halte_awal"].astype(str))
+        routes["stop_tujuan"] = stop_index.get_indexer(routes["halte_tujuan"].astype(str))
+
+        # musiman: rata-rata residu log penumpang (terhadap μ rute) per bulan 1..12
+        pos = df[df["jumlah_penumpang"] > 0]
+        mu_row = pos.merge(routes[keys + ["mu"]], on=keys, how="left")["mu"].to_numpy()
+        resid = pd.Series(np.log(pos["jumlah_penumpang"].to_numpy(dtype=np.float64)) - mu_row)
+        season = resid.groupby(pos["date"].dt.month.to_numpy()).mean().reindex(range(1, 13)).fillna(0.0)
+
+        first_year = int(df["date"].dt.year.min()) if len(df) else 2021
+        return cls(routes.drop(columns="n_pos"), registry.stops, season.to_numpy(), first_year)
+
+    @property
+    def jenis_share(self) -> pd.Series:
+        """Pangsa baris per ``jenis`` yang dipertahankan generator."""
+        share = self.routes.groupby("jenis", observed=True)["weight"].sum()
+        return share / share.sum()
+
+    def _chunk(self, start: int, stop: int, n_rows: int, n_months: int, start_year: int,
+               rng: np.random.Generator) -> pd.DataFrame:
+        routes = self.routes
+        size = stop - start
+        # baris dibagi rata ke tiap bulan, berurutan
+        month_idx = (np.arange(start, stop, dtype=np.int64) * n_months) // n_rows
+        p = routes["weight"].to_numpy(dtype=np.float64)
+        t = rng.choice(len(routes), size=size, p=p / p.sum())
+
+        month = (month_idx % 12 + 1).astype(np.int64)
+        log_p = (
+            routes["mu"].to_numpy()[t]
+            + self.season[month - 1]
+            + routes["sigma"].to_numpy()[t] * rng.standard_normal(size)
+        )
+        passengers = np.minimum(np.rint(np.exp(log_p)), MAX_PASSENGERS).astype(np.int64)
+        passengers[rng.random(size) < routes["p_zero"].to_numpy()[t]] = 0
+
+        frame = {
+            "year": (start_year + month_idx // 12).astype(np.int64),
+            "month": month,
+        }
+        for col in ("jenis", "kode_trayek", "trayek"):
+            values = routes[col]
+            frame[col] = pd.Categorical.from_codes(values.cat.codes.to_numpy()[t], values.cat.categories)
+        frame["jumlah_penumpang"] = passengers
+        halte = pd.Index(self.stops["halte"])
+        ids = {end: routes[f"stop_{end}"].to_numpy()[t] for end in ("awal", "tujuan")}
+        for end in ids:
+            frame[f"halte_{end}"] = pd.Categorical.from_codes(ids[end], halte)
+        for end in ids:
+            for axis, coord in self._coords.items():
+                frame[f"{axis}_{end}"] = np.where(ids[end] >= 0, coord[ids[end]], np.nan)
+        return pd.DataFrame(frame)
+
+    def generate(self, n_rows: int, years: int = 3, start_year: int | None = None, seed: int = 0,
+                 chunksize: int = DEFAULT_CHUNKSIZE):
+        """Iterator potongan frame mentah (skema CSV sumber) berjumlah ``n_rows``
+        baris, tersebar rata pada ``years`` tahun mulai ``start_year``."""
+        start_year = self.first_year if start_year is None else start_year
+        n_months = years * 12
+        pending, n_pending = [], 0
+        for i, start in enumerate(range(0, n_rows, SEED_BLOCK)):
+            rng = np.random.default_rng([seed, i])
+            block = self._chunk(start, min(start + SEED_BLOCK, n_rows), n_rows, n_months, start_year, rng)
+            pending.append(block)
+            n_pending += len(block)
+            if n_pending < chunksize:
+                continue
+            rows = pd.concat(pending, ignore_index=True)
+            for at in range(0, n_pending - chunksize + 1, chunksize):
+                yield rows.iloc[at:at + chunksize].reset_index(drop=True)
+            rest = rows.iloc[n_pending - n_pending % chunksize:]
+            pending, n_pending = ([rest] if len(rest) else []), len(rest)
+        if pending:
+            yield pd.concat(pending, ignore_index=True)
+
+    def frame(self, n_rows: int, **kwargs) -> pd.DataFrame:
+        """Seluruh hasil ``generate`` sebagai satu frame mentah."""
+        return pd.concat(list(self.generate(n_rows, **kwargs)), ignore_index=True)
+
+
+def write_csv(chunks, path: str) -> int:
+    """Tulis potongan ke satu CSV (writer pyarrow, streaming); kembalikan jumlah baris."""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    n = 0
+    writer = None
+    tmp = f"{path}.tmp-{os.getpid()}"
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pacsv.CSVWriter(tmp, table.schema)
+            writer.write_table(table)
+            n += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is not None:
+        os.replace(tmp, path)
+    return n
+
+
+def write_csv_dir(chunks, out_dir: str) -> int:
+    """Tulis potongan (terurut bulan) sebagai satu CSV per bulan
+    ``<out_dir>/YYYY-MM.csv``; kembalikan jumlah baris."""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    os.makedirs(out_dir, exist_ok=True)
+    n = 0
+    current = writer = tmp = None
+
+    def close():
+        if writer is not None:
+            writer.close()
+            os.replace(tmp, os.path.join(out_dir, f"{current}.csv"))
+
+    try:
+        for chunk in chunks:
+            for (year, month), part in chunk.groupby(["year", "month"], sort=True):
+                label = f"{year}-{month:02d}"
+                table = pa.Table.from_pandas(part, preserve_index=False)
+                if label != current:
+                    close()
+                    current, tmp = label, os.path.join(out_dir, f".{label}.csv.tmp-{os.getpid()}")
+                    writer = pacsv.CSVWriter(tmp, table.schema)
+                writer.write_table(table)
+            n += len(chunk)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            os.remove(tmp)
+        raise
+    close()
+    return n
+
+
+def write_store(chunks, store_dir: str, prefix: str = "synthetic") -> int:
+    """Bersihkan tiap potongan seperti ingest lalu tulis ke store Parquet
+    terpartisi (dibaca ``read_store``, untuk benchmark; tanpa manifest sehingga
+    bukan sumber ``TJ_DATA_SOURCE``); kembalikan jumlah baris."""
+    n = 0
+    for i, chunk in enumerate(chunks):
+        clean = apply_schema(clean_chunk(chunk))
+        for (year, month), part in split_partitions(clean):
+            write_parquet_atomic(part, os.path.join(partition_dir(store_dir, year, month), f"{prefix}-{i:05d}.parquet"))
+        n += len(clean)
+    return n
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    from transjakarta.ingest import load_csv
+
+    parser = argparse.ArgumentParser(description="Bangkitkan data TransJakarta sintetis dari distribusi CSV asli.")
+    parser.add_argument("source", help="CSV acuan (mis. df_final.csv)")
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--start-year", type=int, help="tahun pertama (default: tahun pertama data acuan)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--format", choices=["csv", "csv-dir", "store"], default="csv",
+                        help="csv: satu berkas; csv-dir: satu CSV per bulan; store: Parquet terpartisi (benchmark)")
+    parser.add_argument("--out", required=True, help="berkas CSV atau direktori (csv-dir/store)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    model = SyntheticModel.from_frame(load_csv(args.source))
+    logger.info(
+        "%d templat rute, %d halte; pangsa jenis: %s",
+        len(model.routes), len(model.stops), model.jenis_share.round(3).to_dict(),
+    )
+    chunks = model.generate(args.rows, args.years, args.start_year, args.seed, args.chunksize)
+    t0 = time.perf_counter()
+    if args.format == "csv":
+        n = write_csv(chunks, args.out)
+    elif args.format == "csv-dir":
+        n = write_csv_dir(chunks, args.out)
+    else:
+        n = write_store(chunks, args.out, f"synthetic-{args.seed}")
+    elapsed = time.perf_counter() - t0
+    print(f"{n:,} baris -> {args.out} ({elapsed:.1f} s, {n / max(elapsed, 1e-9):,.0f} baris/s)")
+
+
+if __name__ == "__main__":
+    main()
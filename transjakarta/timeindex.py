@@ -0,0 +1,56 @@
+"""Pemotongan rentang tanggal lewat pencarian biner.
+
+Frame data, kubus agregat, dan store selalu terurut menurut ``date`` (lihat
+``load_csv``/``read_store``/``build_cube``), sehingga rentang [start, end]
+cukup dicari dengan ``searchsorted`` (O(log n)) lalu diambil sebagai irisan
+``iloc`` yang tidak menyalin data, alih-alih dua pemindaian mask boolean
+penuh ditambah salinan pada setiap rerun.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def sort_by_date(df: pd.DataFrame, col: str = "date") -> pd.DataFrame:
+    """``df`` terurut stabil menurut ``col`` (tanpa salinan bila sudah terurut)."""
+    if df.empty or df[col].is_monotonic_increasing:
+        return df
+    return df.sort_values(col, kind="stable", ignore_index=True)
+
+
+# jumlah titik sampel untuk memeriksa prasyarat urutan tanpa pemindaian penuh
+ORDER_CHECK_POINTS = 1024
+
+
+def _check_sorted(values: np.ndarray):
+    """``ValueError`` bila sampel berjarak rata dari ``values`` tidak terurut naik.
+
+    Pemeriksaan penuh (O(n)) akan menghapus keuntungan pencarian biner, jadi
+    hanya ±``ORDER_CHECK_POINTS`` titik yang diperiksa; untuk array sekecil itu
+    pemeriksaannya lengkap.
+    """
+    sample = values[:: max(1, len(values) // ORDER_CHECK_POINTS)]
+    if (sample[1:] < sample[:-1]).any() or values[-1] < sample[-1]:
+        raise ValueError("Tanggal harus terurut naik untuk pencarian biner; urutkan dengan sort_by_date.")
+
+
+def date_bounds(dates, start=None, end=None) -> tuple:
+    """Posisi ``(i, j)`` sehingga ``dates[i:j]`` berada di [start, end] (kedua
+    batas inklusif; start > end menghasilkan rentang kosong).
+
+    ``dates`` harus terurut naik (``ValueError`` bila pemeriksaan sampel gagal);
+    ``None`` berarti tanpa batas.
+    """
+    values = np.asarray(dates)
+    if len(values) == 0:
+        return 0, 0
+    _check_sorted(values)
+    i = 0 if start is None else int(np.searchsorted(values, np.datetime64(pd.Timestamp(start)), side="left"))
+    j = len(values) if end is None else int(np.searchsorted(values, np.datetime64(pd.Timestamp(end)), side="right"))
+    return i, max(i, j)
+
+
+def date_slice(df: pd.DataFrame, start=None, end=None, col: str = "date") -> pd.DataFrame:
+    """Baris ``df`` (terurut menurut ``col``) dengan tanggal di [start, end]."""
+    i, j = date_bounds(df[col].to_numpy(), start, end)
+    return df.iloc[i:j]